@@ -0,0 +1,176 @@
+"""
+Module: benchmarks
+
+Micro-benchmarks for the model hot paths: loading the word list for each word
+size (from the text file's compiled cache, and straight from the cache),
+building a model once the word list is loaded, scoring a single guess, finding letter positions, batch scoring,
+pattern search, and playing whole games headless. Each case reports ops/sec
+and p50/p99 latency.
+
+Results are written as JSON. Given a baseline (a previous results file), the
+run fails when any case's ops/sec dropped by more than the threshold:
+
+    python benchmarks.py --save-baseline bench_baseline.json
+    python benchmarks.py --baseline bench_baseline.json --threshold 0.2
+"""
+
+import argparse
+import itertools
+import json
+import random
+import sys
+import time
+from typing import Callable, Optional
+
+from guess_log import NullGuessLog
+from knowledge import KnowledgeState, letter_index
+from lexicon import CACHE_SUFFIX, Lexicon, cache_is_fresh, compile_lexicon, shared_lexicon
+from models import WordyModel
+from multi_board import MultiWordyModel
+from scoring import encode_words, score_packed
+from session import GameRules, GameSession
+from word_search import search
+
+
+WORD_LIST_FILE = 'long_wordlist.txt'
+
+
+def measure(case: Callable[[], object], min_time: float = 0.5,
+            min_runs: int = 5) -> dict:
+    """ Calls <case> repeatedly (for at least <min_time> seconds and
+    <min_runs> calls) and summarizes the per-call latencies.
+
+    Returns:
+        (dict) runs, ops_per_sec, and p50_us / p99_us latency.
+    """
+    latencies = []
+    clock = time.perf_counter_ns
+    stop = time.perf_counter() + min_time
+
+    while len(latencies) < min_runs or time.perf_counter() < stop:
+        start = clock()
+        case()
+        latencies.append(clock() - start)
+
+    latencies.sort()
+    total = sum(latencies)
+
+    def percentile(p: float) -> float:
+        return latencies[min(len(latencies) - 1, int(p * len(latencies)))] / 1000
+
+    return {'runs': len(latencies),
+            'ops_per_sec': len(latencies) * 1e9 / total if total else float('inf'),
+            'p50_us': percentile(0.50),
+            'p99_us': percentile(0.99)}
+
+
+def build_cases(word_sizes: list[int], seed: int = 120) -> dict[str, Callable[[], object]]:
+    """ Returns the benchmark cases, by name. """
+    rng = random.Random(seed)
+    guess_log = NullGuessLog()
+    lexicon = shared_lexicon(WORD_LIST_FILE)
+    cases = {}
+
+    # load cases measure the cache, not a rebuild of it
+    cache_filename = WORD_LIST_FILE + CACHE_SUFFIX
+    if not cache_is_fresh(WORD_LIST_FILE, cache_filename):
+        compile_lexicon(WORD_LIST_FILE, cache_filename)
+
+    for size in word_sizes:
+        # freshness check + memory mapping the compiled cache, every time
+        cases[f'lexicon_load[{size}]'] = \
+            lambda size=size: len(Lexicon.load(WORD_LIST_FILE).words(size))
+        cases[f'lexicon_from_cache[{size}]'] = \
+            lambda size=size: len(Lexicon.from_cache(cache_filename).words(size))
+        # the word list is already shared in this process (shared_lexicon),
+        # so this is a warm construction: no loading
+        cases[f'model_init_warm[{size}]'] = \
+            lambda size=size: WordyModel(size, WORD_LIST_FILE, guess_log=guess_log)
+
+    model = WordyModel(5, WORD_LIST_FILE, preselected_word='crane', guess_log=guess_log)
+    guesses = rng.sample(list(model.word_list), 256)
+    guess_iter = itertools.cycle(guesses)
+    cases['check_guess[5]'] = lambda: model.check_guess(next(guess_iter))
+    cases['check_guess_packed[5]'] = lambda: model.check_guess_packed(next(guess_iter))
+    cases['letter_positions[5]'] = lambda: model.letter_positions('sassy')
+
+    boards = MultiWordyModel(5, WORD_LIST_FILE, 16, guess_log=guess_log)
+    cases['multi_board_check_guess[5, 16 boards]'] = \
+        lambda: boards.check_guess_codes(next(guess_iter))
+
+    letters = encode_words(model.word_list)
+    block = letters[:256]
+    cases['score_packed[5, 256 x all]'] = lambda: score_packed(block, letters)
+
+    rules = GameRules(lexicon, 5, 6, guess_log)
+    index = letter_index(lexicon, 5)
+    answers = itertools.cycle(rng.sample(list(rules.words), 1000))
+
+    def play_game() -> None:
+        # guess the first word that is still possible until the game ends
+        session = GameSession(rules, next(answers))
+        knowledge = KnowledgeState(index)
+        while not session.is_over:
+            guess = index.words[(knowledge.survivors & -knowledge.survivors).bit_length() - 1]
+            knowledge.update(guess, session.guess(guess)[1])
+
+    cases['full_game[5]'] = play_game
+    cases['word_search[8]'] = lambda: search(lexicon, '?e??????', exclude='a')
+    return cases
+
+
+def compare(results: dict, baseline: dict, threshold: float) -> list[str]:
+    """ Returns a description of each case whose ops/sec fell by more than
+    <threshold> (a fraction) relative to <baseline>. Cases missing from
+    either side are ignored. """
+    regressions = []
+    for name, result in results.items():
+        if name not in baseline:
+            continue
+        before = baseline[name]['ops_per_sec']
+        after = result['ops_per_sec']
+        if after < before * (1 - threshold):
+            regressions.append(f"{name}: {after:,.0f} ops/s vs baseline "
+                               f"{before:,.0f} ({after / before - 1:+.0%})")
+    return regressions
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the Wordy model.")
+    parser.add_argument('--sizes', type=int, nargs='+', default=[4, 5, 6, 7, 8],
+                        help="word sizes to benchmark loading for")
+    parser.add_argument('--min-time', type=float, default=0.5,
+                        help="seconds to spend on each case")
+    parser.add_argument('--filter', default='', help="only run cases containing this")
+    parser.add_argument('--output', default='bench_results.json')
+    parser.add_argument('--baseline', help="results file to compare against")
+    parser.add_argument('--threshold', type=float, default=0.25,
+                        help="allowed fractional drop in ops/sec")
+    parser.add_argument('--save-baseline', help="also write the results here")
+    args = parser.parse_args(argv)
+
+    results = {}
+    for name, case in build_cases(args.sizes).items():
+        if args.filter in name:
+            results[name] = measure(case, args.min_time)
+            r = results[name]
+            print(f"{name:32} {r['ops_per_sec']:>14,.0f} ops/s"
+                  f"  p50 {r['p50_us']:>10.1f} us  p99 {r['p99_us']:>10.1f} us")
+
+    for filename in filter(None, [args.output, args.save_baseline]):
+        with open(filename, 'w') as f:
+            json.dump(results, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline, 'r') as f:
+            regressions = compare(results, json.load(f), args.threshold)
+        for regression in regressions:
+            print(f"REGRESSION {regression}")
+        if regressions:
+            return 1
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,11 @@
+import pytest
+
+from guess_log import NullGuessLog, set_default_guess_log
+
+
+@pytest.fixture(autouse=True)
+def no_guess_log():
+    """ Keeps tests from appending to the real guess_log.csv. """
+    previous = set_default_guess_log(NullGuessLog())
+    yield
+    set_default_guess_log(previous)
@@ -0,0 +1,282 @@
+"""
+Module: dawg
+
+The words of a lexicon as a minimized DAWG (a trie whose identical subtrees
+are shared), stored in a few flat arrays instead of one string per word.
+
+Each node also records which word lengths can still be reached from it, so
+"can this prefix still become a valid word of N letters?" takes one step per
+letter of the prefix. The controller uses it to flag a guess that can no
+longer become a word while it is being typed.
+
+Building the graph takes a moment, so the graph of a word list file is saved
+next to it (<word list>.dawg) and loaded from there while the word list is
+unchanged.
+"""
+
+import struct
+import weakref
+from array import array
+from typing import Iterable, Iterator, Optional
+
+from lexicon import Lexicon, atomic_write, source_key
+
+
+# Layout of a saved DAWG (native byte order):
+#   header: magic, source size, source mtime (ns), node count, edge count,
+#           typecode of the remaining masks
+#   then the first_edge, targets, labels and remaining arrays, back to back
+DAWG_SUFFIX = '.dawg'
+_MAGIC = b'WORDYDG1'
+_HEADER = struct.Struct('<8sQQIIc')
+
+
+class Dawg:
+    """ A minimized directed acyclic word graph.
+
+    Node i's outgoing edges are edges first_edge[i] to first_edge[i + 1] - 1,
+    sorted by label. Bit k of remaining[i] is set when a word ends exactly k
+    letters below node i (so bit 0 means a word ends at node i). Node 0 is the
+    root.
+    """
+
+    # instance variables
+    first_edge: array  # node -> index of its first edge (one extra entry at the end)
+    labels: bytes  # edge -> its letter
+    targets: array  # edge -> the node it leads to
+    remaining: array  # node -> bit mask of the word lengths that end below it
+
+    def __init__(self, words: Iterable[str]) -> None:
+        """ Builds the DAWG of <words> (in any order, duplicates allowed).
+
+        Raises:
+            ValueError: When a word is not ASCII.
+        """
+        root = _build(sorted(set(words)))
+        self._freeze(root)
+
+    def _freeze(self, root: list) -> None:
+        """ Numbers the nodes built by _build and flattens them into arrays. """
+        order: list[list] = []  # nodes in the order they are numbered
+        numbers: dict[int, int] = {id(root): 0}
+        stack = [root]
+        while stack:
+            node = stack.pop()
+            order.append(node)
+            for _, child in sorted(node[1].items(), reverse=True):
+                if id(child) not in numbers:
+                    numbers[id(child)] = len(numbers)
+                    stack.append(child)
+
+        # number the nodes in the order they were first reached
+        order.sort(key=lambda node: numbers[id(node)])
+
+        # the masks need one bit per letter of the longest word
+        masks = [node[2] for node in order]
+        self.first_edge = array('I', [0])
+        self.targets = array('I')
+        self.remaining = array('I' if root[2] < 1 << 32 else 'Q', masks)
+        labels = bytearray()
+
+        for node in order:
+            for letter, child in sorted(node[1].items()):
+                labels.append(ord(letter))
+                self.targets.append(numbers[id(child)])
+            self.first_edge.append(len(labels))
+        self.labels = bytes(labels)
+
+    def save(self, filename: str, key: tuple[int, int] = (0, 0)) -> None:
+        """ Writes the graph to <filename> (atomically), recording the
+        (size, mtime) of the word list it was built from (see
+        lexicon.source_key). """
+        with atomic_write(filename) as f:
+            f.write(_HEADER.pack(_MAGIC, key[0], key[1],
+                                 self.node_count, self.edge_count,
+                                 self.remaining.typecode.encode('ascii')))
+            self.first_edge.tofile(f)
+            self.targets.tofile(f)
+            f.write(self.labels)
+            self.remaining.tofile(f)
+
+    @classmethod
+    def load(cls, filename: str,
+             key: Optional[tuple[int, int]] = None) -> Optional["Dawg"]:
+        """ Reads a graph written by save, or returns None if the file is
+        not one (or, given <key>, was built from another version of the word
+        list). """
+        try:
+            with open(filename, 'rb') as f:
+                header = f.read(_HEADER.size)
+                if len(header) < _HEADER.size:
+                    return None
+                magic, size, mtime_ns, nodes, edges, typecode = _HEADER.unpack(header)
+                if magic != _MAGIC or (key is not None and (size, mtime_ns) != key):
+                    return None
+
+                dawg = cls.__new__(cls)
+                dawg.first_edge = array('I')
+                dawg.first_edge.fromfile(f, nodes + 1)
+                dawg.targets = array('I')
+                dawg.targets.fromfile(f, edges)
+                dawg.labels = f.read(edges)
+                dawg.remaining = array(typecode.decode('ascii'))
+                dawg.remaining.fromfile(f, nodes)
+                return dawg
+        except (OSError, EOFError, ValueError):
+            return None
+
+    @property
+    def node_count(self) -> int:
+        return len(self.remaining)
+
+    @property
+    def edge_count(self) -> int:
+        return len(self.labels)
+
+    @property
+    def nbytes(self) -> int:
+        """ The size of the arrays holding the graph, in bytes. """
+        return (len(self.labels) + self.first_edge.itemsize * len(self.first_edge)
+                + self.targets.itemsize * len(self.targets)
+                + self.remaining.itemsize * len(self.remaining))
+
+    def _walk(self, prefix: str) -> int:
+        """ Returns the node reached by following <prefix> from the root, or
+        -1 if no word starts with <prefix>. """
+        node = 0
+        first_edge, labels, targets = self.first_edge, self.labels, self.targets
+        for letter in prefix.encode('ascii', 'replace'):
+            edge = labels.find(letter, first_edge[node], first_edge[node + 1])
+            if edge < 0:
+                return -1
+            node = targets[edge]
+        return node
+
+    def can_complete(self, prefix: str, length: int) -> bool:
+        """ Returns whether some word of <length> letters starts with <prefix>,
+        in O(len(prefix)).
+
+        Parameters:
+            prefix: (str) The letters typed so far.
+            length: (int) The length the finished word must have.
+        """
+        if len(prefix) > length:
+            return False
+        node = self._walk(prefix)
+        return node >= 0 and (self.remaining[node] >> (length - len(prefix))) & 1 == 1
+
+    def __contains__(self, word: object) -> bool:
+        return isinstance(word, str) and self.can_complete(word, len(word))
+
+    def completions(self, prefix: str, length: int) -> Iterator[str]:
+        """ Yields the words of <length> letters that start with <prefix>, in
+        alphabetical order. Only branches that can reach that length are
+        explored. """
+        node = self._walk(prefix) if len(prefix) <= length else -1
+        if node < 0:
+            return
+
+        stack = [(node, prefix)]
+        while stack:
+            node, word = stack.pop()
+            needed = length - len(word)
+            if needed == 0:
+                yield word
+                continue
+
+            start, end = self.first_edge[node], self.first_edge[node + 1]
+            for edge in range(end - 1, start - 1, -1):
+                child = self.targets[edge]
+                if (self.remaining[child] >> (needed - 1)) & 1:
+                    stack.append((child, word + chr(self.labels[edge])))
+
+
+def _build(words: list[str]) -> list:
+    """ Builds the minimized DAWG of <words> (sorted, without duplicates)
+    incrementally: after each word, the part of the previous word that it
+    does not share is minimized by merging nodes equivalent to ones already
+    seen.
+
+    Returns:
+        (list) The root, as a node: [is final, {letter: node}, remaining
+        lengths mask (see Dawg)].
+    """
+    root: list = [False, {}, 0]
+    register: dict[tuple, list] = {}
+    unchecked: list[tuple[list, str, list]] = []  # (parent, letter, child) not yet merged
+    previous = ''
+
+    def finish(node: list) -> None:
+        # every child is finished (and merged) before its parent
+        mask = 1 if node[0] else 0
+        for child in node[1].values():
+            mask |= child[2] << 1
+        node[2] = mask
+
+    def minimize(down_to: int) -> None:
+        while len(unchecked) > down_to:
+            parent, letter, child = unchecked.pop()
+            finish(child)
+            key = (child[0], tuple((c, id(n)) for c, n in sorted(child[1].items())))
+            twin = register.get(key)
+            if twin is None:
+                register[key] = child
+            else:
+                parent[1][letter] = twin
+
+    for word in words:
+        if not word.isascii():
+            raise ValueError(f"{word!r} is not an ASCII word")
+
+        common = 0
+        for a, b in zip(word, previous):
+            if a != b:
+                break
+            common += 1
+
+        minimize(common)
+        node = unchecked[-1][2] if unchecked else root
+        for letter in word[common:]:
+            child: list = [False, {}, 0]
+            node[1][letter] = child
+            unchecked.append((node, letter, child))
+            node = child
+        node[0] = True
+        previous = word
+
+    minimize(0)
+    finish(root)
+    return root
+
+
+_dawgs: "weakref.WeakKeyDictionary[Lexicon, Dawg]" = weakref.WeakKeyDictionary()
+
+
+def lexicon_dawg(lexicon: Lexicon) -> Dawg:
+    """ Returns the DAWG of every word in <lexicon>. The first time it is
+    asked for, it is loaded from the file saved next to the lexicon's word
+    list if that is up to date, and built (and saved) otherwise. """
+    dawg = _dawgs.get(lexicon)
+    if dawg is not None:
+        return dawg
+
+    key = None
+    if lexicon.source is not None:
+        try:
+            key = source_key(lexicon.source)
+        except OSError:
+            pass
+
+    if key is not None:
+        dawg = Dawg.load(lexicon.source + DAWG_SUFFIX, key)
+
+    if dawg is None:
+        dawg = Dawg(word for size in lexicon.sizes() for word in lexicon.words(size))
+        if key is not None:
+            try:
+                dawg.save(lexicon.source + DAWG_SUFFIX, key)
+            except OSError:
+                pass  # read-only directory: build it again next time
+
+    _dawgs[lexicon] = dawg
+    return dawg
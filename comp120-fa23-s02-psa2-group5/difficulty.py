@@ -0,0 +1,249 @@
+"""
+Module: difficulty
+
+Scores how hard each word would be as an answer, and draws answers weighted
+by those scores in O(1).
+
+A word's difficulty (0 = easiest, 1 = hardest in its length bucket) mixes
+two ranks:
+
+- commonness: how usual its letters are in their positions, so words like
+  "crane" rank as easier than ones like "whiff";
+- ambiguity: the mean size of its feedback class over a few strong opening
+  guesses, so words that many others answer the same way (the "_ight"
+  families) rank as harder.
+
+Scoring needs numpy and takes a fraction of a second for a whole word list,
+so the scores are stored next to the compiled lexicon (<word list>.difficulty)
+and reloaded while the word list is unchanged:
+
+    python difficulty.py long_wordlist.txt
+
+Each difficulty setting turns the scores into weights (see CURVES), and an
+AliasSampler draws bucket indexes with those weights in constant time.
+"""
+
+import math
+import random
+import struct
+import sys
+import weakref
+from array import array
+from typing import Optional, Sequence
+
+from lexicon import Lexicon, atomic_write, shared_lexicon, source_key
+
+
+# Layout of a saved difficulty file (native byte order for the scores):
+#   header:  magic, source size, source mtime (ns), bucket count
+#   buckets: (word length, word count) per bucket
+#   then the float32 difficulty of every word, bucket by bucket, in lexicon order
+DIFFICULTY_SUFFIX = '.difficulty'
+_MAGIC = b'WORDYDF1'
+_HEADER = struct.Struct('<8sQQI')
+_BUCKET = struct.Struct('<II')
+
+# difficulty setting -> k, where a word of difficulty d gets weight exp(k * d)
+CURVES = {'uniform': 0.0, 'easy': -6.0, 'normal': -3.0, 'hard': 4.0}
+
+# opening guesses used to measure how ambiguous each answer is
+_PROBES = 16
+
+
+class AliasSampler:
+    """ Draws indexes 0..n-1 with probability proportional to their weights
+    in O(1) per draw (Vose's alias method): pick a column uniformly, then
+    keep it or take its alias. """
+
+    # instance variables
+    probability: array  # column -> chance of keeping it
+    alias: array  # column -> the index drawn otherwise
+
+    def __init__(self, weights: Sequence[float]) -> None:
+        """
+        Raises:
+            ValueError: When there are no weights, or none is positive.
+        """
+        n = len(weights)
+        total = math.fsum(weights)
+        if n == 0 or total <= 0:
+            raise ValueError("need at least one positive weight")
+
+        scaled = [weight * n / total for weight in weights]
+        self.probability = array('d', [1.0]) * n
+        self.alias = array('I', range(n))
+        small = [i for i, p in enumerate(scaled) if p < 1.0]
+        large = [i for i, p in enumerate(scaled) if p >= 1.0]
+
+        while small and large:
+            less, more = small.pop(), large.pop()
+            self.probability[less] = scaled[less]
+            self.alias[less] = more
+            scaled[more] -= 1.0 - scaled[less]
+            (small if scaled[more] < 1.0 else large).append(more)
+        # whatever is left holds (up to rounding) exactly one column's worth
+
+    def __len__(self) -> int:
+        return len(self.alias)
+
+    def sample(self, rng: Optional[random.Random] = None) -> int:
+        """ Returns a random index, drawn with the sampler's weights (using
+        <rng>, or the random module's generator). """
+        draw = random.random if rng is None else rng.random
+        column = int(draw() * len(self.alias))
+        return column if draw() < self.probability[column] else self.alias[column]
+
+
+def score_words(words: Sequence[str]) -> array:
+    """ Returns the difficulty (0 to 1) of each of <words> (all the same
+    length) as an answer, relative to the others. """
+    import numpy as np # only needed to (re)compute the scores
+    from scoring import encode_words, score_packed
+
+    n = len(words)
+    if n < 2:
+        return array('f', [0.5]) * n
+
+    letters = encode_words(list(words))
+    size = letters.shape[1]
+
+    # commonness: mean log frequency of each letter at its position
+    frequency = np.stack([np.bincount(letters[:, i], minlength=256) / n
+                          for i in range(size)])
+    commonness = np.log(frequency[np.arange(size), letters]).mean(axis=1)
+
+    # ambiguity: mean log size of the word's feedback class, over the most
+    # common-lettered words as opening guesses
+    probes = letters[np.argsort(-commonness, kind='stable')[:_PROBES]]
+    ambiguity = np.zeros(n)
+    for codes in score_packed(probes, letters):
+        _, inverse, counts = np.unique(codes, return_inverse=True, return_counts=True)
+        ambiguity += np.log2(counts[inverse])
+
+    def ranks(values: "np.ndarray") -> "np.ndarray":
+        # 0 for the smallest value, 1 for the largest
+        return np.argsort(np.argsort(values, kind='stable'), kind='stable') / (n - 1)
+
+    difficulty = (ranks(-commonness) + ranks(ambiguity)) / 2
+    return array('f', difficulty.astype(np.float32).tobytes())
+
+
+def save_scores(filename: str, scores: dict[int, array],
+                key: tuple[int, int] = (0, 0)) -> None:
+    """ Writes the scores of every bucket to <filename> (atomically),
+    recording the (size, mtime) of the word list they were computed from
+    (see lexicon.source_key). """
+    with atomic_write(filename) as f:
+        f.write(_HEADER.pack(_MAGIC, key[0], key[1], len(scores)))
+        for size in sorted(scores):
+            f.write(_BUCKET.pack(size, len(scores[size])))
+        for size in sorted(scores):
+            scores[size].tofile(f)
+
+
+def load_scores(filename: str,
+                key: Optional[tuple[int, int]] = None) -> Optional[dict[int, array]]:
+    """ Reads the scores written by save_scores, or returns None if the file
+    is not a difficulty file (or, given <key>, was computed from another
+    version of the word list). """
+    try:
+        with open(filename, 'rb') as f:
+            header = f.read(_HEADER.size)
+            if len(header) < _HEADER.size:
+                return None
+            magic, size, mtime_ns, bucket_count = _HEADER.unpack(header)
+            if magic != _MAGIC or (key is not None and (size, mtime_ns) != key):
+                return None
+
+            buckets = [_BUCKET.unpack(f.read(_BUCKET.size)) for _ in range(bucket_count)]
+            scores = {}
+            for word_size, count in buckets:
+                scores[word_size] = array('f')
+                scores[word_size].fromfile(f, count)
+            return scores
+    except (OSError, EOFError, struct.error):
+        return None
+
+
+_scores: "weakref.WeakKeyDictionary[Lexicon, dict[int, array]]" = weakref.WeakKeyDictionary()
+
+
+def word_difficulty(lexicon: Lexicon) -> dict[int, array]:
+    """ Returns word length -> the difficulty of each word of that length
+    (in lexicon order). The first time it is asked for, it is loaded from
+    the file saved next to the lexicon's word list if that is up to date,
+    and computed (and saved) otherwise. """
+    scores = _scores.get(lexicon)
+    if scores is not None:
+        return scores
+
+    key = None
+    if lexicon.source is not None:
+        try:
+            key = source_key(lexicon.source)
+        except OSError:
+            pass
+
+    if key is not None:
+        scores = load_scores(lexicon.source + DIFFICULTY_SUFFIX, key)
+
+    if scores is None:
+        scores = {size: score_words(lexicon.words(size)) for size in lexicon.sizes()}
+        if key is not None:
+            try:
+                save_scores(lexicon.source + DIFFICULTY_SUFFIX, scores, key)
+            except OSError:
+                pass  # read-only directory: compute them again next time
+
+    _scores[lexicon] = scores
+    return scores
+
+
+def weights(scores: Sequence[float], difficulty: str) -> list[float]:
+    """ Returns the weight of each word given its score, for one of the
+    difficulty settings in CURVES.
+
+    Raises:
+        ValueError: When <difficulty> is not one of CURVES.
+    """
+    if difficulty not in CURVES:
+        raise ValueError(f"unknown difficulty {difficulty!r}")
+    k = CURVES[difficulty]
+    return [math.exp(k * score) for score in scores]
+
+
+_samplers: "weakref.WeakKeyDictionary[Lexicon, dict[tuple[int, str], AliasSampler]]" = \
+    weakref.WeakKeyDictionary()
+
+
+def answer_sampler(lexicon: Lexicon, word_size: int,
+                   difficulty: str) -> Optional[AliasSampler]:
+    """ Returns the sampler that draws answers (indexes into
+    lexicon.words(word_size)) for the given difficulty setting, built the
+    first time it is asked for. Returns None for 'uniform', where a plain
+    random.choice does the same job.
+
+    Raises:
+        ValueError: When <difficulty> is not one of CURVES, or there are no
+            words of <word_size>.
+    """
+    if difficulty not in CURVES:
+        raise ValueError(f"unknown difficulty {difficulty!r}")
+    if difficulty == 'uniform':
+        return None
+
+    samplers = _samplers.setdefault(lexicon, {})
+    key = (word_size, difficulty)
+    if key not in samplers:
+        scores = word_difficulty(lexicon).get(word_size, ())
+        samplers[key] = AliasSampler(weights(scores, difficulty))
+    return samplers[key]
+
+
+if __name__ == "__main__":
+    for name in sys.argv[1:] or ['long_wordlist.txt']:
+        lexicon = shared_lexicon(name)
+        save_scores(name + DIFFICULTY_SUFFIX,
+                    {size: score_words(lexicon.words(size)) for size in lexicon.sizes()},
+                    source_key(name))
+        print(f"scored {name} -> {name + DIFFICULTY_SUFFIX}")
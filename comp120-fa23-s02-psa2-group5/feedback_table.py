@@ -0,0 +1,203 @@
+"""
+Module: feedback_table
+
+A precomputed table of the packed feedback code (see
+models.pack_letter_states) of every (guess, answer) pair of words of one
+length, stored on disk as a .npy array and memory mapped on use.
+
+Tables are named after the word list and a digest of the bucket they were
+built from, so editing the word list makes the next open rebuild the table:
+
+    python feedback_table.py long_wordlist.txt 5 6
+
+The solver reads it wherever it scores guesses in bulk: the hints of the
+game (wordy) and the entropy strategy of simulate open the table with
+open_table, building it the first time. Scoring one guess against one
+answer is already cheap, so WordyModel.check_guess (and the server) only
+read a table when given one with use_feedback_table.
+"""
+
+import glob
+import multiprocessing
+import os
+import sys
+from typing import Optional, Sequence
+
+import numpy as np
+
+from lexicon import Lexicon
+from scoring import encode_words, packed_dtype, score_packed
+
+
+# number of guess rows each worker scores (and writes) at a time
+_ROWS_PER_TASK = 512
+
+# set in each worker process by _init_worker
+_worker_letters: Optional[np.ndarray] = None
+_worker_filename: Optional[str] = None
+
+
+class FeedbackTable:
+    """ The feedback codes of every guess against every answer in one length
+    bucket of a lexicon. Rows are guesses and columns are answers, both in
+    bucket order. """
+
+    # instance variables
+    word_size: int  # length of the words in the table
+    words: Sequence[str]  # the bucket the table was built from
+    codes: np.ndarray  # (len(words), len(words)) memory mapped codes
+    _index: Optional[dict[str, int]]  # word -> row/column, built lazily
+
+    def __init__(self, words: Sequence[str], codes: np.ndarray) -> None:
+        self.word_size = len(words[0])
+        self.words = words
+        self.codes = codes
+        self._index = None
+
+    @classmethod
+    def open(cls, lexicon: Lexicon, word_size: int, filename: Optional[str] = None,
+             processes: Optional[int] = None) -> "FeedbackTable":
+        """ Opens the table for the <word_size> bucket of <lexicon>, building
+        it first if it does not exist for the current contents of the bucket.
+
+        Parameters:
+            lexicon: (Lexicon) The lexicon to build the table from.
+            word_size: (int) The length of the words in the table.
+            filename: (str) Where to keep the table (defaults to a name
+                derived from lexicon.source, with the bucket digest in it).
+            processes: (int) Worker processes used to build the table
+                (defaults to the number of CPUs).
+
+        Raises:
+            ValueError: When the lexicon has no words of that length, or no
+                filename is given for a lexicon that wasn't loaded from a file.
+        """
+        words = lexicon.words(word_size)
+        if len(words) == 0:
+            raise ValueError(f"no words of length {word_size} in the lexicon")
+
+        if filename is None:
+            filename = table_filename(lexicon, word_size)
+
+        if not os.path.exists(filename):
+            build_table(words, filename, processes)
+            _remove_stale_tables(filename)
+
+        codes = np.load(filename, mmap_mode='r')
+        if codes.shape != (len(words), len(words)):
+            raise ValueError(f"{filename} does not match the word list")
+
+        return cls(words, codes)
+
+    def index(self, word: str) -> int:
+        """ Returns the row (and column) of <word> in the table.
+
+        Raises:
+            KeyError: When <word> is not in the table.
+        """
+        if self._index is None:
+            self._index = {word: i for i, word in enumerate(self.words)}
+        return self._index[word]
+
+    def lookup(self, guess: str, answer: str) -> int:
+        """ Returns the packed feedback code of <guess> against <answer>. """
+        return int(self.codes[self.index(guess), self.index(answer)])
+
+
+def open_table(lexicon: Lexicon, word_size: int,
+               processes: Optional[int] = None) -> Optional[FeedbackTable]:
+    """ Opens the default table for the <word_size> bucket of <lexicon>
+    (building it if needed, see FeedbackTable.open), or returns None when it
+    can't be kept: the lexicon wasn't loaded from a file, or the table can't
+    be written next to it. Callers then score on the fly. """
+    if lexicon.source is None:
+        return None
+    try:
+        return FeedbackTable.open(lexicon, word_size, processes=processes)
+    except OSError:
+        return None
+
+
+def table_filename(lexicon: Lexicon, word_size: int) -> str:
+    """ Returns the default file name of the table for the <word_size>
+    bucket of <lexicon>. """
+    if lexicon.source is None:
+        raise ValueError("a filename is needed for a lexicon without a source")
+    return f'{lexicon.source}.feedback{word_size}-{lexicon.fingerprint(word_size)[:16]}.npy'
+
+
+def _remove_stale_tables(filename: str) -> None:
+    """ Removes tables for older versions of the same bucket as <filename>.
+    Tables still being built (by this or another process) are left alone. """
+    prefix = filename.rsplit('-', 1)[0]
+    for old in glob.glob(glob.escape(prefix) + '-*.npy'):
+        if old != filename and '.tmp.' not in old:
+            try:
+                os.remove(old)
+            except OSError:
+                pass
+
+
+def _init_worker(letters: np.ndarray, filename: str) -> None:
+    global _worker_letters, _worker_filename
+    _worker_letters = letters
+    _worker_filename = filename
+
+
+def _fill_rows(start: int) -> None:
+    """ Scores guess rows [start, start + _ROWS_PER_TASK) and writes them
+    straight into the table file. """
+    codes = np.load(_worker_filename, mmap_mode='r+')
+    stop = start + _ROWS_PER_TASK
+    codes[start:stop] = score_packed(_worker_letters[start:stop], _worker_letters)
+    codes.flush()
+
+
+def build_table(words: Sequence[str], filename: str,
+                processes: Optional[int] = None) -> None:
+    """ Builds the feedback table for <words> (all the same length) and
+    writes it to <filename>, sharing the rows out between worker processes.
+    The file only appears once it is complete.
+
+    Parameters:
+        words: (Sequence[str]) The words to use as both guesses and answers.
+        filename: (str) Name of the .npy file to write.
+        processes: (int) Number of worker processes (defaults to the number
+            of CPUs; 1 builds in this process).
+    """
+    letters = encode_words(words)
+    temp_filename = f'{filename}.{os.getpid()}.tmp.npy'
+
+    codes = np.lib.format.open_memmap(temp_filename, mode='w+',
+                                      dtype=packed_dtype(letters.shape[1]),
+                                      shape=(len(words), len(words)))
+    del codes  # workers map the file themselves
+
+    starts = range(0, len(words), _ROWS_PER_TASK)
+    processes = min(processes or os.cpu_count() or 1, len(starts))
+
+    try:
+        if processes == 1:
+            _init_worker(letters, temp_filename)
+            for start in starts:
+                _fill_rows(start)
+        else:
+            with multiprocessing.Pool(processes, _init_worker,
+                                      (letters, temp_filename)) as pool:
+                pool.map(_fill_rows, starts)
+
+        os.replace(temp_filename, filename)
+    finally:
+        if os.path.exists(temp_filename):
+            os.remove(temp_filename)
+
+
+if __name__ == "__main__":
+    source = sys.argv[1] if len(sys.argv) > 1 else 'long_wordlist.txt'
+    sizes = [int(size) for size in sys.argv[2:]] or [5]
+
+    lexicon = Lexicon.load(source)
+    for size in sizes:
+        table = FeedbackTable.open(lexicon, size)
+        print(f"{size} letters: {len(table.words)} x {len(table.words)} "
+              f"{table.codes.dtype} -> {table_filename(lexicon, size)}")
@@ -1,24 +1,27 @@
 """
 Simple Tkinter app to test that GuessesFrame is working correctly.
 
+Run with "canvas" as an argument to test CanvasGuessesFrame instead.
+
 Author: Dr. Sat Garcia (sat@sandiego.edu)
 """
 
-import json
+import sys
 import tkinter as tk
-from views import GuessesFrame
+from dataclasses import replace
+from views import CanvasGuessesFrame, GuessesFrame
 from models import LetterState
+from settings import load_settings
 
 def main():
-    with open("settings.json", 'r') as settings_file:
-        settings = json.load(settings_file)
-
-    settings['word_size'] = 3
-    settings['num_guesses'] = 4
+    settings = replace(load_settings(), word_size=3, num_guesses=4)
 
     app = tk.Tk()
 
-    gf = GuessesFrame(app, settings)
+    if sys.argv[1:] == ['canvas']:
+        gf = CanvasGuessesFrame(app, settings)
+    else:
+        gf = GuessesFrame(app, settings)
 
     # set first guess to win
     gf.set_letter("W",0,0)
@@ -4,14 +4,20 @@ Simple Tkinter app to test that GuessLetter is working correctly.
 Author: Dr. Sat Garcia (sat@sandiego.edu)
 """
 
-import json
 import tkinter as tk
+from dataclasses import replace
 from views import GuessLetter
 from models import LetterState
+from settings import load_settings
+
+
+def with_font_size(settings, size):
+    """ Returns a copy of the settings with a different letter font size. """
+    guesses = replace(settings.ui.guesses, letter_font_size=size)
+    return replace(settings, ui=replace(settings.ui, guesses=guesses))
 
 def main():
-    with open("settings.json", 'r') as settings_file:
-        settings = json.load(settings_file)
+    settings = load_settings()
 
     app = tk.Tk()
 
@@ -19,12 +25,12 @@ def main():
     l1.set_letter('S')
     l1.set_status(LetterState.CORRECT)
 
-    settings['ui']['guesses']['letter_font_size'] = 20
+    settings = with_font_size(settings, 20)
     l2 = GuessLetter(app, 0, 1, settings)
     l2.set_letter('A')
     l2.set_status(LetterState.INCORRECT)
 
-    settings['ui']['guesses']['letter_font_size'] = 35
+    settings = with_font_size(settings, 35)
     l3 = GuessLetter(app, 1, 0, settings)
     l3.set_letter('T')
     l3.set_status(LetterState.MISPLACED)
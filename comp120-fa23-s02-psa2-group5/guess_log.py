@@ -0,0 +1,219 @@
+"""
+Module: guess_log
+
+Sinks for the "answer, guess" lines that WordyModel records for every guess.
+
+BufferedGuessLog hands lines to a background thread through a bounded queue;
+the thread appends them to the file in batches, so a guess never waits on the
+file system. NullGuessLog discards everything (for tests and benchmarks).
+
+Given a max_bytes, the log is rotated once it grows past that size: the file
+becomes guess_log.csv.1.gz (compressed), older segments move up one number
+and the oldest ones beyond backup_count are deleted. log_segments lists the
+segments of a log, oldest first, for reading it back (see log_stats).
+"""
+
+import atexit
+import os
+import queue
+import re
+import threading
+import time
+from typing import Optional
+
+
+# joins the answers of a multi-board game (see multi_board) in the answer column
+ANSWER_SEPARATOR = '+'
+
+
+class GuessLog:
+    """ Where guesses are recorded. This base class discards everything. """
+
+    def write(self, answer: str, guess: str) -> None:
+        """ Records that <guess> was made in a game whose answer is <answer>. """
+
+    def flush(self) -> None:
+        """ Waits until everything written so far has been stored. """
+
+    def close(self) -> None:
+        """ Flushes and releases the sink; later writes are discarded. """
+
+
+class NullGuessLog(GuessLog):
+    """ A guess log that records nothing. """
+
+
+class BufferedGuessLog(GuessLog):
+    """ Appends guesses to a CSV file from a background writer thread.
+
+    Lines are written in one call per batch, once <max_batch> lines are
+    waiting or <flush_interval> seconds after the oldest of them arrived,
+    whichever comes first. When <max_queue> lines are waiting, write blocks
+    until the writer catches up rather than dropping lines.
+
+    When <max_bytes> is given, the file is rotated (by the writer thread)
+    after a batch takes it to that size or more.
+    """
+
+    # instance variables
+    filename: str  # the file lines are appended to
+    max_batch: int  # lines that trigger a write
+    flush_interval: float  # seconds a line may wait before being written
+    max_bytes: Optional[int]  # size at which the file is rotated (None: never)
+    backup_count: int  # rotated segments to keep
+    compress: bool  # whether rotated segments are gzipped
+    _queue: queue.Queue  # lines (and control requests) for the writer
+    _thread: threading.Thread  # the writer
+    _closed: bool  # whether close has been called
+
+    _STOP = object()
+
+    def __init__(self, filename: str = 'guess_log.csv', max_batch: int = 256,
+                 flush_interval: float = 1.0, max_queue: int = 10000,
+                 max_bytes: Optional[int] = None, backup_count: int = 5,
+                 compress: bool = True) -> None:
+        self.filename = filename
+        self.max_batch = max_batch
+        self.flush_interval = flush_interval
+        self.max_bytes = max_bytes
+        self.backup_count = backup_count
+        self.compress = compress
+        self._queue = queue.Queue(maxsize=max_queue)
+        self._closed = False
+
+        self._thread = threading.Thread(target=self._run, name='guess-log-writer',
+                                        daemon=True)
+        self._thread.start()
+
+    def write(self, answer: str, guess: str) -> None:
+        if not self._closed:
+            self._queue.put(f'{answer}, {guess}\n')
+
+    def flush(self) -> None:
+        if not self._closed:
+            done = threading.Event()
+            self._queue.put(done)
+            done.wait()
+
+    def close(self) -> None:
+        if not self._closed:
+            self._closed = True
+            self._queue.put(self._STOP)
+            self._thread.join()
+
+    def _write_lines(self, lines: list[str]) -> None:
+        """ Appends <lines> to the file in one write. """
+        if lines:
+            with open(self.filename, 'a') as f:
+                f.write(''.join(lines))
+                size = f.tell()
+            lines.clear()
+
+            if self.max_bytes is not None and size >= self.max_bytes:
+                self._rotate()
+
+    def _rotate(self) -> None:
+        """ Moves the file to segment 1 (compressing it), shifting the older
+        segments up one number and dropping those beyond backup_count. """
+        suffix = '.gz' if self.compress else ''
+
+        if self.backup_count <= 0:
+            os.remove(self.filename)
+            return
+
+        for number in range(self.backup_count - 1, 0, -1):
+            segment = f'{self.filename}.{number}{suffix}'
+            if os.path.exists(segment):
+                os.replace(segment, f'{self.filename}.{number + 1}{suffix}')
+
+        segment = f'{self.filename}.1'
+        os.replace(self.filename, segment)
+        if self.compress:
+            import gzip # only needed once the log is rotated
+            import shutil
+            with open(segment, 'rb') as source, gzip.open(segment + '.gz', 'wb') as target:
+                shutil.copyfileobj(source, target)
+            os.remove(segment)
+
+    def _run(self) -> None:
+        """ The writer thread: batches lines until a size or time threshold,
+        a flush request or the stop request. """
+        lines: list[str] = []
+        deadline = None
+
+        while True:
+            timeout = None if deadline is None else max(0.0, deadline - time.monotonic())
+            try:
+                item = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                item = None
+
+            if isinstance(item, str):
+                lines.append(item)
+                if deadline is None:
+                    deadline = time.monotonic() + self.flush_interval
+                if len(lines) < self.max_batch:
+                    continue
+
+            try:
+                self._write_lines(lines)
+            except OSError:
+                lines.clear()  # nowhere to log to; don't let the backlog grow
+            deadline = None
+
+            if isinstance(item, threading.Event):
+                item.set()
+            elif item is self._STOP:
+                return
+
+
+def log_segments(filename: str = 'guess_log.csv') -> list[str]:
+    """ Returns the files holding the log written to <filename>: its rotated
+    segments (compressed or not), oldest first, then the file itself.
+
+    Parameters:
+        filename: (str) Name of the (current) log file.
+    """
+    directory, base = os.path.split(os.path.abspath(filename))
+    pattern = re.compile(re.escape(base) + r'\.(\d+)(\.gz)?$')
+
+    numbered = []
+    for name in os.listdir(directory):
+        match = pattern.match(name)
+        if match:
+            numbered.append((int(match.group(1)), os.path.join(directory, name)))
+
+    segments = [path for _, path in sorted(numbered, reverse=True)]
+    if os.path.exists(filename):
+        segments.append(os.path.abspath(filename))
+    return segments
+
+
+# rotation of the process-wide guess log, unless settings.json says otherwise
+DEFAULT_MAX_BYTES = 10 * 1024 * 1024
+DEFAULT_BACKUP_COUNT = 5
+
+_default_guess_log: Optional[GuessLog] = None
+
+
+def default_guess_log(max_bytes: Optional[int] = DEFAULT_MAX_BYTES,
+                      backup_count: int = DEFAULT_BACKUP_COUNT) -> GuessLog:
+    """ Returns the process-wide guess log (guess_log.csv in the working
+    directory), starting it the first time it is needed. It is rotated
+    once it reaches <max_bytes> (None: never), keeping <backup_count>
+    compressed segments; both only apply when the log is started. It is
+    flushed and closed when the interpreter exits. """
+    global _default_guess_log
+    if _default_guess_log is None:
+        _default_guess_log = BufferedGuessLog(max_bytes=max_bytes,
+                                              backup_count=backup_count)
+        atexit.register(_default_guess_log.close)
+    return _default_guess_log
+
+
+def set_default_guess_log(guess_log: Optional[GuessLog]) -> Optional[GuessLog]:
+    """ Replaces the process-wide guess log, returning the previous one
+    (which is not closed). None means start a new one when next needed. """
+    global _default_guess_log
+    previous, _default_guess_log = _default_guess_log, guess_log
+    return previous
@@ -0,0 +1,194 @@
+"""
+Module: knowledge
+
+Tracks what a player has learned about the answer over a game, and which
+words are still possible, without rescanning the word list after each guess.
+
+Sets of words are Python ints used as bitsets: bit i is set when word i of
+the length bucket (in lexicon order) is in the set.
+"""
+
+import weakref
+from typing import Sequence
+
+from lexicon import Lexicon
+from models import LetterState
+
+
+def _bitset(indexes: Sequence[int], size: int) -> int:
+    """ Returns the bitset (over <size> words) with the given bits set. """
+    bitmap = bytearray((size + 7) // 8)
+    for i in indexes:
+        bitmap[i >> 3] |= 1 << (i & 7)
+    return int.from_bytes(bitmap, 'little')
+
+
+def bits_to_indexes(bits: int) -> list[int]:
+    """ Returns the positions of the set bits of <bits>, in increasing order. """
+    indexes = []
+    digits = bin(bits)[:1:-1]  # least significant bit first
+    i = digits.find('1')
+    while i != -1:
+        indexes.append(i)
+        i = digits.find('1', i + 1)
+    return indexes
+
+
+class LetterIndex:
+    """ Posting bitsets for one length bucket of a lexicon: which words have
+    a given letter at a given position, and which have at least k copies of
+    a given letter. """
+
+    # instance variables
+    word_size: int  # length of the words in the bucket
+    words: Sequence[str]  # the bucket, in lexicon order
+    all_words: int  # bitset of every word in the bucket
+    alphabet: str  # every letter used in the bucket, sorted
+    letter_bits: dict[str, int]  # letter -> its bit in a letter mask
+    position_bits: list[dict[str, int]]  # position -> letter -> words
+    count_bits: dict[str, list[int]]  # letter -> [k] -> words with > k copies
+
+    def __init__(self, words: Sequence[str], word_size: int) -> None:
+        """ Builds the postings of <words> (all of length <word_size>). """
+        self.word_size = word_size
+        self.words = words
+        self.all_words = (1 << len(words)) - 1
+
+        positions: list[dict[str, list[int]]] = [{} for _ in range(word_size)]
+        counts: dict[str, list[list[int]]] = {}
+
+        for i, word in enumerate(words):
+            seen: dict[str, int] = {}
+            for position, letter in enumerate(word):
+                positions[position].setdefault(letter, []).append(i)
+                copies = seen[letter] = seen.get(letter, 0) + 1
+                by_count = counts.setdefault(letter, [])
+                if len(by_count) < copies:
+                    by_count.append([])
+                by_count[copies - 1].append(i)
+
+        self.alphabet = ''.join(sorted(counts))
+        self.letter_bits = {letter: 1 << i for i, letter in enumerate(self.alphabet)}
+        self.position_bits = [{letter: _bitset(indexes, len(words))
+                               for letter, indexes in position.items()}
+                              for position in positions]
+        self.count_bits = {letter: [_bitset(indexes, len(words)) for indexes in by_count]
+                           for letter, by_count in counts.items()}
+
+    def at_position(self, position: int, letter: str) -> int:
+        """ Returns the words that have <letter> at <position>. """
+        return self.position_bits[position].get(letter, 0)
+
+    def with_at_least(self, letter: str, copies: int) -> int:
+        """ Returns the words that contain at least <copies> of <letter>. """
+        if copies <= 0:
+            return self.all_words
+
+        by_count = self.count_bits.get(letter, ())
+        return by_count[copies - 1] if copies <= len(by_count) else 0
+
+    def select(self, bits: int) -> list[str]:
+        """ Returns the words in the bitset <bits>, in lexicon order. """
+        return [self.words[i] for i in bits_to_indexes(bits)]
+
+
+_letter_indexes: "weakref.WeakKeyDictionary[Lexicon, dict[int, LetterIndex]]" = \
+    weakref.WeakKeyDictionary()
+
+
+def letter_index(lexicon: Lexicon, word_size: int) -> LetterIndex:
+    """ Returns the LetterIndex of the <word_size> bucket of <lexicon>,
+    building it the first time it is asked for. """
+    indexes = _letter_indexes.setdefault(lexicon, {})
+    if word_size not in indexes:
+        indexes[word_size] = LetterIndex(lexicon.words(word_size), word_size)
+    return indexes[word_size]
+
+
+class KnowledgeState:
+    """ Everything the feedback of a game's guesses says about the answer:
+    the letters still allowed at each position, the fewest and most copies
+    of each letter, and the bitset of words that satisfy all of it.
+
+    Each update only intersects the surviving set with the postings of the
+    constraints that actually changed.
+    """
+
+    # instance variables
+    index: LetterIndex  # postings of the bucket being guessed from
+    allowed: list[int]  # position -> mask of letters (see index.letter_bits)
+    min_counts: dict[str, int]  # letter -> copies the answer has at least
+    max_counts: dict[str, int]  # letter -> copies the answer has at most
+    survivors: int  # bitset of the words that are still possible
+
+    def __init__(self, index: LetterIndex) -> None:
+        self.index = index
+        every_letter = (1 << len(index.alphabet)) - 1
+        self.allowed = [every_letter] * index.word_size
+        self.min_counts = {}
+        self.max_counts = {}
+        self.survivors = index.all_words
+
+    def update(self, guess: str, letter_states: Sequence[LetterState]) -> None:
+        """ Folds the result of one guess (as returned by check_guess) into
+        what is known, narrowing the surviving words.
+
+        Parameters:
+            guess: (str) The guess that was checked.
+            letter_states: (Sequence[LetterState]) The state of each letter.
+        """
+        index = self.index
+        survivors = self.survivors
+        marked: dict[str, int] = {}  # letter -> copies shown as present
+        capped: set[str] = set()  # letters shown INCORRECT somewhere
+
+        for position, (letter, state) in enumerate(zip(guess, letter_states)):
+            letter_bit = index.letter_bits.get(letter, 0)
+            before = self.allowed[position]
+
+            if state == LetterState.CORRECT:
+                marked[letter] = marked.get(letter, 0) + 1
+                after = before & letter_bit
+                if after != before:
+                    survivors &= index.at_position(position, letter)
+            else:
+                if state == LetterState.MISPLACED:
+                    marked[letter] = marked.get(letter, 0) + 1
+                else:
+                    capped.add(letter)
+                after = before & ~letter_bit
+                if after != before:
+                    survivors &= ~index.at_position(position, letter)
+
+            self.allowed[position] = after
+
+        for letter in marked.keys() | capped:
+            copies = marked.get(letter, 0)
+
+            if copies > self.min_counts.get(letter, 0):
+                self.min_counts[letter] = copies
+                survivors &= index.with_at_least(letter, copies)
+
+            if letter in capped and copies < self.max_counts.get(letter, index.word_size):
+                self.max_counts[letter] = copies
+                survivors &= ~index.with_at_least(letter, copies + 1)
+
+        self.survivors = survivors
+
+    def count(self) -> int:
+        """ Returns the number of words that are still possible. """
+        return self.survivors.bit_count()
+
+    def indexes(self) -> list[int]:
+        """ Returns the bucket indexes of the words that are still possible. """
+        return bits_to_indexes(self.survivors)
+
+    def words(self) -> list[str]:
+        """ Returns the words that are still possible, in lexicon order. """
+        return self.index.select(self.survivors)
+
+    def allowed_letters(self, position: int) -> str:
+        """ Returns the letters that may still be at <position>. """
+        mask = self.allowed[position]
+        return ''.join(letter for letter, bit in self.index.letter_bits.items()
+                       if mask & bit)
@@ -0,0 +1,350 @@
+"""
+Module: lexicon
+
+An index of the valid words in a word list file, bucketed by word length so
+that validating a guess never has to scan the word list.
+
+A word list can also be compiled into a binary cache file that is memory
+mapped on load, so creating a model does not have to parse the text file:
+
+    python lexicon.py long_wordlist.txt
+
+shared_lexicon() keeps one lexicon per word list file for the whole process,
+so models (and games) of every word size borrow the same buckets.
+"""
+
+import mmap
+import os
+import struct
+import sys
+import threading
+from collections.abc import Sequence
+from contextlib import contextmanager
+from typing import IO, Iterable, Iterator, Optional, Union
+
+
+# Layout of a compiled lexicon (all integers little-endian):
+#   header:  magic, source size, source mtime (ns), bucket count, padding
+#   buckets: (word length, word count, offset of first record) per bucket
+#   records: the words of each bucket, back to back, <word length> bytes each
+CACHE_SUFFIX = '.lexcache'
+_MAGIC = b'WORDYLX1'
+_HEADER = struct.Struct('<8sQQII')
+_BUCKET = struct.Struct('<IIQ')
+
+
+class _RecordBucket(Sequence):
+    """ A read-only sequence of the fixed-width words of one bucket in a
+    memory mapped lexicon. Words are only decoded when accessed. """
+
+    __slots__ = ('_buffer', '_offset', '_size', '_count')
+
+    def __init__(self, buffer: mmap.mmap, offset: int, size: int, count: int) -> None:
+        self._buffer = buffer
+        self._offset = offset
+        self._size = size
+        self._count = count
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __getitem__(self, index: Union[int, slice]):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(self._count))]
+
+        if index < 0:
+            index += self._count
+        if not 0 <= index < self._count:
+            raise IndexError("word index out of range")
+
+        start = self._offset + index * self._size
+        return self._buffer[start:start + self._size].decode('ascii')
+
+    def __iter__(self):
+        data = self.raw().decode('ascii')
+        size = self._size
+        for start in range(0, len(data), size):
+            yield data[start:start + size]
+
+    def raw(self) -> bytes:
+        """ Returns the records of this bucket as one bytes object. """
+        return self._buffer[self._offset:self._offset + self._size * self._count]
+
+
+class Lexicon:
+    """ The words of a word list, grouped into one bucket per word length.
+
+    Each bucket keeps the words in file order (so a random choice behaves the
+    same as it did on the plain list) and a frozen hash set of the same words
+    for constant time membership checks. The sets are built the first time a
+    bucket is queried, so loading a compiled lexicon stays cheap.
+    """
+
+    # instance variables
+    source: Optional[str]  # name of the word list file, if loaded from one
+    _words: dict[int, Sequence[str]]  # word length -> words in file order
+    _members: dict[int, frozenset[str]]  # word length -> set of those words
+
+    def __init__(self, words: Iterable[str]) -> None:
+        """ Builds the length buckets from the given words.
+
+        Blank entries are ignored and surrounding whitespace is removed.
+
+        Parameters:
+            words: (Iterable[str]) The words to index.
+        """
+        buckets: dict[int, list[str]] = {}
+
+        for word in words:
+            word = word.strip()
+            if word:
+                buckets.setdefault(len(word), []).append(word)
+
+        self.source = None
+        self._words = {size: tuple(bucket) for size, bucket in buckets.items()}
+        self._members = {}
+
+    @classmethod
+    def from_file(cls, filename: str) -> "Lexicon":
+        """ Creates a lexicon from a file containing one word per line.
+
+        Parameters:
+            filename: (str) Name of the file containing a list of valid words.
+        """
+        with open(filename, 'r') as f:
+            lexicon = cls(f)
+
+        lexicon.source = filename
+        return lexicon
+
+    @classmethod
+    def from_cache(cls, cache_filename: str) -> "Lexicon":
+        """ Creates a lexicon backed by a memory mapped compiled lexicon.
+
+        Parameters:
+            cache_filename: (str) Name of a file written by compile_lexicon.
+
+        Raises:
+            ValueError: When the file is not a compiled lexicon.
+        """
+        with open(cache_filename, 'rb') as f:
+            buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, _, _, bucket_count, _ = _read_header(buffer)
+        if magic != _MAGIC:
+            buffer.close()
+            raise ValueError(f"{cache_filename} is not a compiled lexicon")
+
+        lexicon = cls.__new__(cls)
+        lexicon.source = None
+        lexicon._words = {}
+        lexicon._members = {}
+
+        for i in range(bucket_count):
+            size, count, offset = _BUCKET.unpack_from(
+                buffer, _HEADER.size + i * _BUCKET.size)
+            lexicon._words[size] = _RecordBucket(buffer, offset, size, count)
+
+        return lexicon
+
+    @classmethod
+    def load(cls, filename: str) -> "Lexicon":
+        """ Creates a lexicon for the given word list file, memory mapping its
+        compiled cache when it is up to date. Otherwise the text file is
+        parsed and the cache is (re)written for next time.
+
+        Parameters:
+            filename: (str) Name of the file containing a list of valid words.
+        """
+        cache_filename = filename + CACHE_SUFFIX
+
+        if cache_is_fresh(filename, cache_filename):
+            try:
+                lexicon = cls.from_cache(cache_filename)
+                lexicon.source = filename
+                return lexicon
+            except (OSError, ValueError):
+                pass  # unreadable cache: rebuild it from the text below
+
+        lexicon = cls.from_file(filename)
+        try:
+            compile_lexicon(filename, cache_filename, lexicon)
+        except (OSError, ValueError):
+            pass  # read-only directory or non-ASCII words: just skip the cache
+
+        return lexicon
+
+    def sizes(self) -> list[int]:
+        """ Returns the word lengths that have at least one word, in order. """
+        return sorted(self._words)
+
+    def words(self, size: int) -> Sequence[str]:
+        """ Returns the words of the given length, in the order they appeared
+        in the source (an empty sequence if there are none).
+
+        Parameters:
+            size: (int) The word length.
+        """
+        return self._words.get(size, ())
+
+    def fingerprint(self, size: int) -> str:
+        """ Returns a digest of the words of the given length (and their
+        order), for keying data derived from that bucket.
+
+        Parameters:
+            size: (int) The word length.
+        """
+        import hashlib # only needed for data derived from the lexicon
+
+        words = self.words(size)
+        data = words.raw() if isinstance(words, _RecordBucket) else \
+            ''.join(words).encode('utf-8')
+        return hashlib.sha1(data).hexdigest()
+
+    def contains(self, word: str) -> bool:
+        """ Returns whether <word> is in the lexicon, in O(1).
+
+        Parameters:
+            word: (str) The word to look up.
+        """
+        size = len(word)
+        members = self._members.get(size)
+
+        if members is None:
+            if size not in self._words:
+                return False
+            members = self._members[size] = frozenset(self._words[size])
+
+        return word in members
+
+    def __contains__(self, word: object) -> bool:
+        return isinstance(word, str) and self.contains(word)
+
+    def __len__(self) -> int:
+        return sum(len(bucket) for bucket in self._words.values())
+
+
+# absolute file name -> (source key when loaded, lexicon), see shared_lexicon
+_shared: dict[str, tuple[tuple[int, int], Lexicon]] = {}
+_shared_lock = threading.Lock()
+
+
+def shared_lexicon(filename: str) -> Lexicon:
+    """ Returns the process-wide lexicon of the given word list file, loading
+    it (see Lexicon.load) only the first time, or again once the file has
+    changed. Every caller gets the same object, so the buckets of each word
+    size are shared rather than copied.
+
+    Parameters:
+        filename: (str) Name of the file containing a list of valid words.
+    """
+    path = os.path.abspath(filename)
+    key = source_key(path)
+
+    with _shared_lock:
+        entry = _shared.get(path)
+        if entry is None or entry[0] != key:
+            lexicon = Lexicon.load(filename)
+            _shared[path] = entry = (key, lexicon)
+        return entry[1]
+
+
+def _read_header(buffer) -> tuple[bytes, int, int, int, int]:
+    if len(buffer) < _HEADER.size:
+        return b'', 0, 0, 0, 0
+    return _HEADER.unpack_from(buffer, 0)
+
+
+def source_key(filename: str) -> tuple[int, int]:
+    """ Returns the (size, mtime in ns) pair that files derived from a word
+    list (the compiled lexicon, its DAWG, ...) are keyed by. """
+    stat = os.stat(filename)
+    return stat.st_size, stat.st_mtime_ns
+
+
+@contextmanager
+def atomic_write(filename: str, mode: str = 'wb') -> Iterator[IO]:
+    """ Opens a temporary file to write <filename> through (in binary mode,
+    or text mode given <mode> 'w'), moving it into place only once the with
+    block completes, so readers never see a partly written file. The
+    temporary file is removed if the block fails. """
+    temp_filename = f'{filename}.{os.getpid()}.tmp'
+    try:
+        with open(temp_filename, mode) as f:
+            yield f
+        os.replace(temp_filename, filename)
+    finally:
+        if os.path.exists(temp_filename):
+            os.remove(temp_filename)
+
+
+def cache_is_fresh(filename: str, cache_filename: str) -> bool:
+    """ Returns whether <cache_filename> is a compiled lexicon of the current
+    contents of <filename> (i.e. the source's size and mtime still match).
+
+    Parameters:
+        filename: (str) Name of the word list file.
+        cache_filename: (str) Name of the compiled lexicon.
+    """
+    try:
+        with open(cache_filename, 'rb') as f:
+            header = f.read(_HEADER.size)
+        magic, size, mtime_ns, _, _ = _read_header(header)
+        return magic == _MAGIC and (size, mtime_ns) == source_key(filename)
+    except OSError:
+        return False
+
+
+def compile_lexicon(filename: str, cache_filename: Optional[str] = None,
+                    lexicon: Optional[Lexicon] = None) -> str:
+    """ Compiles the word list in <filename> into a binary lexicon that
+    Lexicon.from_cache can memory map. The file is written atomically.
+
+    Parameters:
+        filename: (str) Name of the word list file.
+        cache_filename: (str) Where to write the result (defaults to
+            <filename> + CACHE_SUFFIX).
+        lexicon: (Lexicon) The already parsed word list, if available.
+
+    Returns:
+        (str) The name of the compiled lexicon.
+
+    Raises:
+        ValueError: When the word list contains non-ASCII words (records
+            must be fixed-width).
+    """
+    if cache_filename is None:
+        cache_filename = filename + CACHE_SUFFIX
+
+    # take the key before reading so a concurrent edit makes the cache stale
+    source_size, source_mtime_ns = source_key(filename)
+    if lexicon is None:
+        lexicon = Lexicon.from_file(filename)
+
+    sizes = lexicon.sizes()
+    offset = _HEADER.size + len(sizes) * _BUCKET.size
+    table = []
+    records = []
+
+    for size in sizes:
+        words = lexicon.words(size)
+        if not all(word.isascii() for word in words):
+            raise ValueError(f"{filename} contains non-ASCII words")
+        data = ''.join(words).encode('ascii')
+
+        table.append(_BUCKET.pack(size, len(words), offset))
+        records.append(data)
+        offset += len(data)
+
+    with atomic_write(cache_filename) as f:
+        f.write(_HEADER.pack(_MAGIC, source_size, source_mtime_ns,
+                             len(sizes), 0))
+        f.writelines(table)
+        f.writelines(records)
+
+    return cache_filename
+
+
+if __name__ == "__main__":
+    for name in sys.argv[1:] or ['long_wordlist.txt']:
+        print(f"compiled {name} -> {compile_lexicon(name)}")
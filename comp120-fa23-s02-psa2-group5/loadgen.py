@@ -0,0 +1,132 @@
+"""
+Module: loadgen
+
+A load generator for server.py: many concurrent keep-alive clients, each
+playing games back to back (guessing random words of the right size), then a
+report of guesses per second and request latency.
+
+    python server.py --port 8080 &
+    python loadgen.py --port 8080 --clients 50 --seconds 10
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import time
+from typing import Optional
+
+from lexicon import Lexicon
+
+
+class Connection:
+    """ One keep-alive HTTP/1.1 connection to the server. """
+
+    # instance variables
+    host: str
+    port: int
+    _reader: Optional[asyncio.StreamReader]
+    _writer: Optional[asyncio.StreamWriter]
+
+    def __init__(self, host: str, port: int) -> None:
+        self.host = host
+        self.port = port
+        self._reader = None
+        self._writer = None
+
+    async def request(self, method: str, path: str,
+                      body: Optional[dict] = None) -> tuple[int, dict]:
+        """ Sends one request, returning the status code and decoded JSON. """
+        if self._writer is None:
+            self._reader, self._writer = await asyncio.open_connection(self.host, self.port)
+
+        payload = json.dumps(body).encode() if body is not None else b''
+        self._writer.write(f'{method} {path} HTTP/1.1\r\n'
+                           f'Host: {self.host}\r\n'
+                           f'Content-Type: application/json\r\n'
+                           f'Content-Length: {len(payload)}\r\n'
+                           f'\r\n'.encode('latin-1') + payload)
+        await self._writer.drain()
+
+        status_line = await self._reader.readline()
+        status = int(status_line.split()[1])
+        headers = {}
+        while True:
+            line = await self._reader.readline()
+            if line in (b'\r\n', b'\n', b''):
+                break
+            name, _, value = line.decode('latin-1').partition(':')
+            headers[name.strip().lower()] = value.strip()
+
+        response = await self._reader.readexactly(int(headers.get('content-length', 0)))
+        if headers.get('connection', '').lower() == 'close':
+            await self.close()
+
+        return status, json.loads(response) if response else {}
+
+    async def close(self) -> None:
+        if self._writer is not None:
+            self._writer.close()
+            self._reader = self._writer = None
+
+
+async def _client(host: str, port: int, words: list[str], word_size: int,
+                  deadline: float, latencies: list[float]) -> None:
+    """ Plays games until <deadline>, recording each guess's latency. """
+    connection = Connection(host, port)
+    try:
+        while time.perf_counter() < deadline:
+            _, game = await connection.request('POST', '/games', {'word_size': word_size})
+            path = f"/games/{game['id']}/guesses"
+
+            while game.get('status', 'in_progress') == 'in_progress' \
+                    and time.perf_counter() < deadline:
+                start = time.perf_counter()
+                _, game = await connection.request('POST', path,
+                                                   {'guess': random.choice(words)})
+                latencies.append(time.perf_counter() - start)
+    finally:
+        await connection.close()
+
+
+async def run(host: str, port: int, words: list[str], word_size: int = 5,
+              clients: int = 50, seconds: float = 10.0) -> dict:
+    """ Runs the load test, returning a summary of the results. """
+    latencies: list[float] = []
+    start = time.perf_counter()
+    await asyncio.gather(*(_client(host, port, words, word_size,
+                                   start + seconds, latencies)
+                           for _ in range(clients)))
+    elapsed = time.perf_counter() - start
+
+    latencies.sort()
+
+    def percentile(p: float) -> float:
+        if not latencies:
+            return 0.0
+        return latencies[min(len(latencies) - 1, int(p * len(latencies)))] * 1000
+
+    return {'guesses': len(latencies),
+            'seconds': elapsed,
+            'guesses_per_sec': len(latencies) / elapsed,
+            'p50_ms': percentile(0.50),
+            'p99_ms': percentile(0.99)}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Load test a Wordy server.")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8080)
+    parser.add_argument('--clients', type=int, default=50)
+    parser.add_argument('--seconds', type=float, default=10.0)
+    parser.add_argument('--word-size', type=int, default=5)
+    parser.add_argument('--word-list', default='long_wordlist.txt')
+    args = parser.parse_args()
+
+    words = list(Lexicon.load(args.word_list).words(args.word_size))
+    summary = asyncio.run(run(args.host, args.port, words, args.word_size,
+                              args.clients, args.seconds))
+
+    print(f"{summary['guesses']} guesses in {summary['seconds']:.1f} s: "
+          f"{summary['guesses_per_sec']:.0f} guesses/s, "
+          f"p50 {summary['p50_ms']:.2f} ms, p99 {summary['p99_ms']:.2f} ms")
@@ -0,0 +1,255 @@
+"""
+Module: log_stats
+
+Summarizes the guess log (every "answer, guess" line WordyModel records) in a
+single streaming pass: the most common opening guesses, how often guesses are
+not valid words, how many guesses each answer took to solve, and how often
+each letter is guessed without being in the answer.
+
+The log (and any rotated segments, see guess_log.log_segments) is read in
+fixed-size chunks, so memory use depends on the number of distinct words and
+answers rather than the size of the log:
+
+    python log_stats.py guess_log.csv --top 10
+"""
+
+import argparse
+import collections
+import gzip
+import json
+import sys
+from typing import Iterable, Iterator, Optional
+
+from guess_log import ANSWER_SEPARATOR, log_segments
+from lexicon import Lexicon, shared_lexicon
+from models import LetterState, score_guess
+from settings import load_settings
+
+
+# bytes read from the log at a time
+CHUNK_SIZE = 1 << 20
+
+
+def iter_lines(filename: str, chunk_size: int = CHUNK_SIZE) -> Iterator[bytes]:
+    """ Yields the lines of a (possibly gzipped) file without their line
+    endings, reading it <chunk_size> bytes at a time.
+
+    Parameters:
+        filename: (str) The file to read; names ending in .gz are decompressed.
+        chunk_size: (int) Bytes to read per chunk.
+    """
+    opener = gzip.open if filename.endswith('.gz') else open
+    with opener(filename, 'rb') as f:
+        partial = b''
+        while True:
+            chunk = f.read(chunk_size)
+            if not chunk:
+                break
+            lines = (partial + chunk).split(b'\n')
+            partial = lines.pop()
+            yield from lines
+        if partial:
+            yield partial
+
+
+def parse_lines(lines: Iterable[bytes]) -> Iterator[tuple[str, str]]:
+    """ Yields the (answer, guess) of every well-formed log line. """
+    for line in lines:
+        answer, comma, guess = line.partition(b',')
+        if comma:
+            yield (answer.strip().decode('utf-8', 'replace'),
+                   guess.strip().decode('utf-8', 'replace'))
+
+
+class GuessLogStats:
+    """ Running totals over a stream of logged guesses.
+
+    The log does not mark where games start, so consecutive guesses with the
+    same answer are taken to be one game, which ends when the answer is
+    guessed, after <num_guesses> valid guesses or when the answer changes.
+    """
+
+    # instance variables
+    lexicon: Lexicon  # the valid words
+    num_guesses: Optional[int]  # valid guesses per game, if known
+    guesses: int  # lines seen
+    multi_board: int  # lines from multi-board games, which are not analyzed
+    invalid: int  # guesses that were not valid words
+    games: int  # games started
+    openers: collections.Counter  # first valid guess of each game -> games
+    solves: dict[str, list[int]]  # answer -> [games solved, guesses they took]
+    guess_counts: collections.Counter  # valid guess -> times made
+    # the INCORRECT letters of a valid guess, as a string -> times seen
+    missed_letters: collections.Counter
+    _answer: Optional[str]  # answer of the game in progress
+    _game_guesses: int  # valid guesses in the game in progress
+    _game_over: bool  # whether the game in progress has ended
+    _repeats_letters: dict[str, bool]  # guess -> whether a letter appears twice
+
+    def __init__(self, lexicon: Lexicon, num_guesses: Optional[int] = None) -> None:
+        self.lexicon = lexicon
+        self.num_guesses = num_guesses
+        self.guesses = 0
+        self.multi_board = 0
+        self.invalid = 0
+        self.games = 0
+        self.openers = collections.Counter()
+        self.solves = {}
+        self.guess_counts = collections.Counter()
+        self.missed_letters = collections.Counter()
+        self._repeats_letters = {}
+        self._answer = None
+        self._game_guesses = 0
+        self._game_over = True
+
+    def add(self, answer: str, guess: str) -> None:
+        """ Counts one logged guess. """
+        self.guesses += 1
+
+        if ANSWER_SEPARATOR in answer:
+            # a guess of a multi-board game, logged once for all its answers
+            self.multi_board += 1
+            return
+
+        if answer != self._answer or self._game_over:
+            self.games += 1
+            self._answer = answer
+            self._game_guesses = 0
+            self._game_over = False
+
+        if len(guess) != len(answer) or guess not in self.lexicon:
+            self.invalid += 1
+            return
+
+        if self._game_guesses == 0:
+            self.openers[guess] += 1
+        self._game_guesses += 1
+
+        self.guess_counts[guess] += 1
+
+        repeats = self._repeats_letters.get(guess)
+        if repeats is None:
+            repeats = self._repeats_letters[guess] = len(set(guess)) < len(guess)
+
+        if repeats:
+            missed = ''.join(letter for letter, state in zip(guess, score_guess(guess, answer))
+                             if state is LetterState.INCORRECT)
+        else:
+            # a letter that appears once is only INCORRECT if the answer lacks it
+            missed = ''.join(letter for letter in guess if letter not in answer)
+        self.missed_letters[missed] += 1
+
+        if guess == answer:
+            solved = self.solves.setdefault(answer, [0, 0])
+            solved[0] += 1
+            solved[1] += self._game_guesses
+            self._game_over = True
+        elif self.num_guesses is not None and self._game_guesses >= self.num_guesses:
+            self._game_over = True
+
+    @property
+    def letter_guesses(self) -> collections.Counter:
+        """ How many times each letter was part of a valid guess. """
+        counts = collections.Counter()
+        for guess, times in self.guess_counts.items():
+            for letter in guess:
+                counts[letter] += times
+        return counts
+
+    @property
+    def letter_misses(self) -> collections.Counter:
+        """ How many times each letter was guessed and marked INCORRECT. """
+        counts = collections.Counter()
+        for missed, times in self.missed_letters.items():
+            for letter in missed:
+                counts[letter] += times
+        return counts
+
+    def add_all(self, entries: Iterable[tuple[str, str]]) -> "GuessLogStats":
+        """ Counts every (answer, guess) in <entries>, returning self. """
+        for answer, guess in entries:
+            self.add(answer, guess)
+        return self
+
+    def summary(self, top: int = 10) -> dict:
+        """ Returns the statistics as a JSON-friendly dictionary.
+
+        Parameters:
+            top: (int) How many openers (most common) and answers (most
+                guesses to solve) to include.
+        """
+        solved_games = sum(games for games, _ in self.solves.values())
+        solved_guesses = sum(guesses for _, guesses in self.solves.values())
+        guesses_to_solve = {answer: guesses / games
+                            for answer, (games, guesses) in self.solves.items()}
+        hardest = sorted(guesses_to_solve.items(), key=lambda item: (-item[1], item[0]))
+        letter_guesses, letter_misses = self.letter_guesses, self.letter_misses
+        single_board = self.guesses - self.multi_board
+
+        return {'guesses': self.guesses,
+                'multi_board_guesses': self.multi_board,
+                'invalid': self.invalid,
+                'invalid_rate': self.invalid / single_board if single_board else 0.0,
+                'games': self.games,
+                'solved': solved_games,
+                'mean_guesses_to_solve': solved_guesses / solved_games if solved_games else 0.0,
+                'top_openers': self.openers.most_common(top),
+                'hardest_answers': hardest[:top],
+                'guesses_to_solve': guesses_to_solve,
+                'letter_miss_rates': {letter: letter_misses[letter] / count
+                                      for letter, count in sorted(letter_guesses.items())}}
+
+
+def analyze(filename: str, lexicon: Lexicon, num_guesses: Optional[int] = None,
+            chunk_size: int = CHUNK_SIZE) -> GuessLogStats:
+    """ Reads the log written to <filename> (rotated segments first) in one
+    pass and returns its statistics.
+
+    Parameters:
+        filename: (str) Name of the (current) log file.
+        lexicon: (Lexicon) The valid words.
+        num_guesses: (int) Valid guesses per game, if known.
+        chunk_size: (int) Bytes to read per chunk.
+    """
+    stats = GuessLogStats(lexicon, num_guesses)
+    for segment in log_segments(filename):
+        stats.add_all(parse_lines(iter_lines(segment, chunk_size)))
+    return stats
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    settings = load_settings()
+
+    parser = argparse.ArgumentParser(description="Summarize the guess log.")
+    parser.add_argument('log', nargs='?', default='guess_log.csv')
+    parser.add_argument('--word-list', default=settings.word_list_file)
+    parser.add_argument('--num-guesses', type=int, default=settings.num_guesses)
+    parser.add_argument('--top', type=int, default=10)
+    parser.add_argument('--json', action='store_true', help="print the full summary as JSON")
+    args = parser.parse_args(argv)
+
+    stats = analyze(args.log, shared_lexicon(args.word_list), args.num_guesses)
+    summary = stats.summary(args.top)
+
+    if args.json:
+        print(json.dumps(summary, indent=2))
+        return 0
+
+    print(f"{summary['guesses']} guesses in {summary['games']} games, "
+          f"{summary['invalid']} invalid ({summary['invalid_rate']:.1%})")
+    print(f"{summary['solved']} solved, mean guesses to solve: "
+          f"{summary['mean_guesses_to_solve']:.2f}")
+    print("most common openers:")
+    for word, games in summary['top_openers']:
+        print(f"  {word}: {games}")
+    print("answers needing the most guesses:")
+    for answer, guesses in summary['hardest_answers']:
+        print(f"  {answer}: {guesses:.2f}")
+    print("letter miss rates:")
+    for letter, rate in sorted(summary['letter_miss_rates'].items(), key=lambda item: -item[1]):
+        print(f"  {letter}: {rate:.1%}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
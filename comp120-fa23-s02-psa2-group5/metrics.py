@@ -0,0 +1,206 @@
+"""
+Module: metrics
+
+Lightweight instrumentation for the hot paths: latency histograms and
+counters, exported as Prometheus text or JSON.
+
+Metrics are off by default. While they are off, timer() hands back one shared
+do-nothing context manager and count() returns right away, so the
+instrumented code pays for little more than a function call:
+
+    import metrics
+
+    metrics.enable()
+    with metrics.timer('wordy_score_seconds'):
+        ...
+    metrics.count('wordy_guesses_total')
+    metrics.write('wordy_metrics.prom')   # or a .json file
+
+The tightest loops use a stopwatch instead, which is None while metrics are
+disabled, so each phase costs one truth test:
+
+    lap = metrics.stopwatch('wordy_model')
+    ...
+    if lap: lap('validate')   # time since the last lap -> wordy_model_validate_seconds
+"""
+
+import bisect
+import time
+from typing import Optional
+
+from lexicon import atomic_write
+
+
+# upper bounds (in seconds) of the histogram buckets: 1 us to ~16 s
+BUCKETS = tuple(2 ** i / 1_000_000 for i in range(25))
+
+
+class Histogram:
+    """ Counts of observed durations per bucket, plus their total. """
+
+    # instance variables
+    counts: list[int]  # observations per bucket of BUCKETS (last: anything larger)
+    total: float  # sum of all observations, in seconds
+    count: int  # number of observations
+
+    def __init__(self) -> None:
+        self.counts = [0] * (len(BUCKETS) + 1)
+        self.total = 0.0
+        self.count = 0
+
+    def observe(self, seconds: float) -> None:
+        self.counts[bisect.bisect_left(BUCKETS, seconds)] += 1
+        self.total += seconds
+        self.count += 1
+
+    def quantile(self, q: float) -> float:
+        """ Returns the upper bound of the bucket holding the <q> quantile
+        (infinity if it is past the last bucket). """
+        rank = q * self.count
+        seen = 0
+        for bound, count in zip(BUCKETS, self.counts):
+            seen += count
+            if seen >= rank and seen:
+                return bound
+        return float('inf')
+
+
+class _Timer:
+    """ Records the time spent in a with block into a histogram. """
+
+    __slots__ = ('histogram', 'start')
+
+    def __init__(self, histogram: Histogram) -> None:
+        self.histogram = histogram
+
+    def __enter__(self) -> "_Timer":
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.histogram.observe(time.perf_counter() - self.start)
+
+
+class Stopwatch:
+    """ Records the time between consecutive laps, each lap into its own
+    histogram (<prefix>_<lap name>_seconds). """
+
+    __slots__ = ('prefix', 'start')
+
+    def __init__(self, prefix: str) -> None:
+        self.prefix = prefix
+        self.start = time.perf_counter()
+
+    def __call__(self, name: str) -> None:
+        now = time.perf_counter()
+        key = f'{self.prefix}_{name}_seconds'
+        histogram = _histograms.get(key)
+        if histogram is None:
+            histogram = _histograms[key] = Histogram()
+        histogram.observe(now - self.start)
+        self.start = now
+
+
+class _NullTimer:
+    """ The timer handed out while metrics are disabled. """
+
+    __slots__ = ()
+
+    def __enter__(self) -> "_NullTimer":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        pass
+
+
+_NULL_TIMER = _NullTimer()
+
+_enabled = False
+_histograms: dict[str, Histogram] = {}
+_counters: dict[str, int] = {}
+
+
+def enable(on: bool = True) -> None:
+    """ Turns recording on (or off). Values recorded so far are kept. """
+    global _enabled
+    _enabled = on
+
+
+def is_enabled() -> bool:
+    return _enabled
+
+
+def reset() -> None:
+    """ Forgets every recorded value. """
+    _histograms.clear()
+    _counters.clear()
+
+
+def timer(name: str):
+    """ Returns a context manager that records how long its block takes in
+    the histogram called <name> (when metrics are enabled). """
+    if not _enabled:
+        return _NULL_TIMER
+
+    histogram = _histograms.get(name)
+    if histogram is None:
+        histogram = _histograms[name] = Histogram()
+    return _Timer(histogram)
+
+
+def stopwatch(prefix: str) -> Optional[Stopwatch]:
+    """ Returns a Stopwatch started now, or None when metrics are disabled. """
+    return Stopwatch(prefix) if _enabled else None
+
+
+def count(name: str, amount: int = 1) -> None:
+    """ Adds <amount> to the counter called <name> (when metrics are
+    enabled). """
+    if _enabled:
+        _counters[name] = _counters.get(name, 0) + amount
+
+
+def snapshot() -> dict:
+    """ Returns every counter and histogram as a JSON-friendly dictionary. """
+    return {'counters': dict(sorted(_counters.items())),
+            'histograms': {name: {'count': h.count,
+                                  'sum': h.total,
+                                  'p50': h.quantile(0.50),
+                                  'p99': h.quantile(0.99),
+                                  'buckets': {repr(bound): count for bound, count
+                                              in zip(BUCKETS + (float('inf'),), h.counts)
+                                              if count}}
+                           for name, h in sorted(_histograms.items())}}
+
+
+def to_prometheus() -> str:
+    """ Returns every counter and histogram in the Prometheus text format. """
+    lines = []
+    for name, value in sorted(_counters.items()):
+        lines.append(f'# TYPE {name} counter')
+        lines.append(f'{name} {value}')
+
+    for name, histogram in sorted(_histograms.items()):
+        lines.append(f'# TYPE {name} histogram')
+        cumulative = 0
+        for bound, count in zip(BUCKETS, histogram.counts):
+            cumulative += count
+            lines.append(f'{name}_bucket{{le="{bound:g}"}} {cumulative}')
+        lines.append(f'{name}_bucket{{le="+Inf"}} {histogram.count}')
+        lines.append(f'{name}_sum {histogram.total:.9f}')
+        lines.append(f'{name}_count {histogram.count}')
+
+    return '\n'.join(lines) + '\n'
+
+
+def write(filename: str, fmt: Optional[str] = None) -> None:
+    """ Writes a snapshot to <filename> (atomically), as JSON when <fmt> is
+    'json' or the name ends in .json, and as Prometheus text otherwise. """
+    import json # only needed when exporting
+
+    if fmt is None:
+        fmt = 'json' if filename.endswith('.json') else 'prometheus'
+    text = json.dumps(snapshot(), indent=2) if fmt == 'json' else to_prometheus()
+
+    with atomic_write(filename, 'w') as f:
+        f.write(text)
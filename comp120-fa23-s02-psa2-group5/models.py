@@ -1,6 +1,14 @@
 import random
 from enum import Enum, auto
-from typing import Optional
+from typing import TYPE_CHECKING, Optional, Sequence
+
+import metrics
+from difficulty import AliasSampler, answer_sampler
+from guess_log import GuessLog, default_guess_log
+from lexicon import Lexicon, shared_lexicon
+
+if TYPE_CHECKING:
+    from feedback_table import FeedbackTable
 
 
 class NotAWordError(ValueError):
@@ -13,22 +21,182 @@ class LetterState(Enum):
     CORRECT = auto()
 
 
+def score_guess(guess: str, answer: str) -> list[LetterState]:
+    """ Scores <guess> against <answer>, returning the state of each letter.
+
+    Letters in the right spot are CORRECT. Every other letter is MISPLACED
+    only while the answer still has an unmatched copy of it (earlier letters
+    in the guess claim copies first), so guessing "sins" against "stop" marks
+    just the first "s".
+
+    Precondition: len(guess) == len(answer)
+
+    Parameters:
+        guess: (str) The guess to score.
+        answer: (str) The hidden word.
+    """
+    letter_states = [LetterState.INCORRECT] * len(guess)
+    unmatched = {} # Count the answer letters that weren't matched exactly
+
+    for i in range(len(guess)):
+        if guess[i] == answer[i]:
+            letter_states[i] = LetterState.CORRECT
+        else:
+            unmatched[answer[i]] = unmatched.get(answer[i], 0) + 1
+
+    for i in range(len(guess)):
+        if letter_states[i] is not LetterState.CORRECT and unmatched.get(guess[i], 0) > 0:
+            letter_states[i] = LetterState.MISPLACED
+            unmatched[guess[i]] -= 1
+
+    return letter_states
+
+
+def score_guess_packed(guess: str, answer: str) -> int:
+    """ Scores <guess> against <answer> like score_guess, but returns the
+    states packed into one integer (see pack_letter_states) without creating
+    any LetterState lists.
+
+    Precondition: len(guess) == len(answer)
+
+    Parameters:
+        guess: (str) The guess to score.
+        answer: (str) The hidden word.
+    """
+    if guess == answer:
+        return 3 ** len(guess) - 1
+
+    correct = [g == a for g, a in zip(guess, answer)]
+    unmatched = {} # Count the answer letters that weren't matched exactly
+    for is_correct, letter in zip(correct, answer):
+        if not is_correct:
+            unmatched[letter] = unmatched.get(letter, 0) + 1
+
+    code = 0
+    for is_correct, letter in zip(correct, guess):
+        if is_correct:
+            code = code * 3 + 2
+        elif unmatched.get(letter, 0) > 0:
+            code = code * 3 + 1
+            unmatched[letter] -= 1
+        else:
+            code *= 3
+    return code
+
+
+def merge_key_states(guess: str, letter_states: Sequence[LetterState]) -> dict[str, LetterState]:
+    """ Returns the state of each distinct letter of <guess>: the best state
+    any copy of it earned (CORRECT > MISPLACED > INCORRECT).
+
+    Parameters:
+        guess: (str) The guess that was scored.
+        letter_states: (Sequence[LetterState]) The state of each letter.
+    """
+    key_states = {}
+    for letter, state in zip(guess, letter_states):
+        if letter not in key_states or state.value > key_states[letter].value:
+            key_states[letter] = state
+    return key_states
+
+
+def update_key_states(key_states: dict[str, LetterState],
+                      new_states: dict[str, LetterState]) -> dict[str, LetterState]:
+    """ Folds the key states of a new guess into the cumulative <key_states>
+    (in place), never downgrading a key (CORRECT > MISPLACED > INCORRECT).
+
+    Parameters:
+        key_states: (dict[str, LetterState]) The best state of each key so far.
+        new_states: (dict[str, LetterState]) The key states of the new guess.
+
+    Returns:
+        (dict[str, LetterState]) The keys whose state changed, with their new state.
+    """
+    changed = {}
+    for letter, state in new_states.items():
+        current = key_states.get(letter)
+        if current is None or state.value > current.value:
+            key_states[letter] = changed[letter] = state
+    return changed
+
+
+def pack_letter_states(letter_states: Sequence[LetterState]) -> int:
+    """ Packs the states of a guess's letters into one integer, as the digits
+    of a base-3 number (first letter most significant, INCORRECT = 0,
+    MISPLACED = 1, CORRECT = 2).
+
+    Parameters:
+        letter_states: (Sequence[LetterState]) The state of each letter.
+    """
+    code = 0
+    for state in letter_states:
+        code = code * 3 + state.value - 1
+    return code
+
+
+def unpack_letter_states(code: int, word_size: int) -> list[LetterState]:
+    """ The inverse of pack_letter_states.
+
+    Parameters:
+        code: (int) A packed feedback code.
+        word_size: (int) The number of letters the code describes.
+    """
+    letter_states = [LetterState.INCORRECT] * word_size
+    for i in range(word_size - 1, -1, -1):
+        code, digit = divmod(code, 3)
+        letter_states[i] = _STATES_BY_DIGIT[digit]
+    return letter_states
+
+
+_STATES_BY_DIGIT = (LetterState.INCORRECT, LetterState.MISPLACED, LetterState.CORRECT)
+
+
+def is_correct_code(code: int, word_size: int) -> bool:
+    """ Whether a packed feedback code marks every letter CORRECT. """
+    return code == 3 ** word_size - 1
+
+
+def unpack_guess_result(guess: str, code: int) -> tuple[bool, list[LetterState], dict[str, LetterState]]:
+    """ Turns the packed feedback for <guess> back into the three things
+    WordyModel.check_guess returns.
+
+    Parameters:
+        guess: (str) The guess the code is for.
+        code: (int) Its packed feedback code.
+    """
+    letter_states = unpack_letter_states(code, len(guess))
+    return (is_correct_code(code, len(guess)), letter_states,
+            merge_key_states(guess, letter_states))
+
+
 class WordyModel:
 
     # instance variables
     word_size: int  # size of the word
-    word_list: list[str]  # list of valid words
+    lexicon: Lexicon  # index of every word in the word list file
+    word_list: Sequence[str]  # list of valid words
     word: str  # the "hidden" word
+    feedback_table: Optional["FeedbackTable"]  # precomputed feedback, if in use
+    difficulty: str  # how answers are drawn (see difficulty.CURVES)
+    answer_sampler: Optional[AliasSampler]  # draws weighted answers; None for uniform
+    guess_log: GuessLog  # where every guess is recorded
 
     _hidden_word_letter_positions: dict[str, list[int]]
 
-    def __init__(self, word_size, word_list_filename, preselected_word=None):
+    def __init__(self, word_size, word_list_filename, preselected_word=None,
+                 guess_log: Optional[GuessLog] = None, difficulty: str = 'uniform'):
         
+        self.guess_log = guess_log if guess_log is not None else default_guess_log() # Record guesses in guess_log.csv unless told otherwise
+
         self.word_size = word_size # Initialize and assign the word_size attribute with the provided word_size
 
-        self.word_list = [] # Initialize an empty list to store words
+        self.word_list = () # Initialize an empty list to store words
         self.set_word_list(word_list_filename) # Call a method to set the word list based on the provided filename
 
+        self.feedback_table = None # Score guesses directly until a feedback table is provided
+
+        self.difficulty = difficulty # Draw answers with the weights of this difficulty setting
+        self.answer_sampler = answer_sampler(self.lexicon, word_size, difficulty)
+
         self.word = None # Initialize the word attribute to None
         self.set_word(preselected_word) # Call a method to set the word based on the optional preselected_word
 
@@ -42,21 +210,44 @@ class WordyModel:
             self (WordyModel): The object being modified.
             filename (str): name of the file containing a list of valid words.
         """
-        self.word_list = [] #Initialize an empty list to store words
+        self.lexicon = shared_lexicon(filename) # Index every word in the file by its length, shared with every other model of the same file
 
-        with open(filename, 'r') as f: # Open the file wit hthe provided filename in read mode
-            for word in f: # Iterate through each line (word) in the file
-                
-                word = word.strip() # Remove leading and trailing whitespaces from the word
-                
-                if len(word) == self.word_size: # Check if the length of the words matches the desired word size
-                    
-                    self.word_list.append(word) # If the word has the desired size, add it to the word_list
+        self.word_list = self.lexicon.words(self.word_size) # Keep the words of the desired size, in file order
 
         if len(self.word_list) == 0: # Check if no words of the desired size were found in the file
             raise RuntimeError(
                 f"No words of length {self.word_size} found in {filename}") # If no words of the desired size were found, raise a RuntimeError
 
+    def set_word_size(self, word_size: int, preselected_word: Optional[str] = None) -> None:
+        """ Switches the model to words of <word_size> letters and picks a new
+        word. This only swaps which bucket of the (shared) lexicon is used,
+        so no file is read.
+
+        Parameters:
+            word_size (int): The new number of letters in a word.
+            preselected_word (str): The new word, or None for a random one.
+
+        Raises:
+            RuntimeError: When the word list has no words of <word_size>.
+            ValueError: When preselected_word isn't the proper size.
+            NotAWordError: When preselected_word is not a valid word.
+        """
+        word_list = self.lexicon.words(word_size)
+        if len(word_list) == 0:
+            raise RuntimeError(f"No words of length {word_size} in the word list")
+        if preselected_word is not None:
+            self._check_preselected_word(preselected_word, word_size) # Before anything changes
+
+        self.word_size = word_size
+        self.word_list = word_list
+        self.answer_sampler = answer_sampler(self.lexicon, word_size, self.difficulty)
+
+        if self.feedback_table is not None and self.feedback_table.word_size != word_size:
+            self.feedback_table = None # The table only covers the old word size
+
+        self.set_word(preselected_word)
+        self.word_letter_positions = self.letter_positions(self.word)
+
     def set_word(self, preselected_word: Optional[str]) -> None:
         """ Sets the word, either to the preselected word or a random one from
         the word list if <preselected_word> is None.
@@ -70,20 +261,43 @@ class WordyModel:
             NotAWordError: When preselected_word is not a valid word.
         """
         if preselected_word is None: # Check if preselected_word is None
-            
-            self.word = random.choice(self.word_list) # If preselected_word is None, randomly choose a word from the word list
+
+            if self.answer_sampler is None:
+                self.word = random.choice(self.word_list) # If preselected_word is None, randomly choose a word from the word list
+            else:
+                self.word = self.word_list[self.answer_sampler.sample()] # Or draw one weighted by difficulty, in O(1)
         
         else: # If preselected_word is not None
 
-            if len(preselected_word) != self.word_size: # Check if the length of preselected_word matches the desired word size
-                
-                raise ValueError("preselected word isn't of the correct size") # If the length is incorrect, raise a ValueError
-            
-            elif self.word in self.word_list: # Check if preselected_word is in the word list (not a valid conditiion)
+            self._check_preselected_word(preselected_word, self.word_size) # Raise if it can't be the word
+            self.word = preselected_word # Set the word to the preselected_word
 
-                raise NotAWordError("preselected word is not in the word list") # If it is, raise a NotAWordError
-            else:
-                self.word = preselected_word # Set the word to the preselected_word
+    def _check_preselected_word(self, preselected_word: str, word_size: int) -> None:
+        """ Raises ValueError if <preselected_word> isn't <word_size> letters
+        long, or NotAWordError if it is not a valid word. """
+        if len(preselected_word) != word_size: # Check if the length of preselected_word matches the desired word size
+
+            raise ValueError("preselected word isn't of the correct size") # If the length is incorrect, raise a ValueError
+
+        elif preselected_word not in self.lexicon: # Check if preselected_word is in the word list
+
+            raise NotAWordError("preselected word is not in the word list") # If it isn't, raise a NotAWordError
+
+    def use_feedback_table(self, table: Optional["FeedbackTable"]) -> None:
+        """ Makes check_guess read feedback from <table> (or score letters
+        directly again if <table> is None).
+
+        Parameters:
+            table (FeedbackTable): Precomputed feedback for this model's word
+                size, e.g. FeedbackTable.open(self.lexicon, self.word_size).
+
+        Raises:
+            ValueError: When the table is for a different word size.
+        """
+        if table is not None and table.word_size != self.word_size:
+            raise ValueError("feedback table is for a different word size")
+
+        self.feedback_table = table
 
     def check_guess(self, guess: str) -> tuple[bool, list[LetterState], dict[str, LetterState]]:
         """ Checks the given <guess> against the answer word, returning three
@@ -98,41 +312,41 @@ class WordyModel:
         Parameters:
             guess: (str) The guess to check.
         """
-        # Log the guess and the word to a CSV file for record-keeping
-        with open('guess_log.csv', 'a') as f: 
-            f.write(f'{self.word}, {guess}\n')
+        return unpack_guess_result(guess, self.check_guess_packed(guess))
 
-        # Check if the guess is a valid word
-        if guess not in self.word_list:
-            raise NotAWordError
+    def check_guess_packed(self, guess: str) -> int:
+        """ Checks the given <guess> against the answer word, returning the
+        state of every letter packed into one integer (see
+        pack_letter_states). Decode it with unpack_guess_result or
+        unpack_letter_states; is_correct_code tells whether it was a win.
 
-        # prrepare returnh value   ???????
-
-        # Initialize variable to store the result
-        is_correct = guess == self.word
-        letter_states = [None] * self.word_size
-        key_states = {}
+        Parameters:
+            guess: (str) The guess to check.
 
-        # algorithm
+        Raises:
+            NotAWordError: When the guess is not a valid word.
+        """
+        lap = metrics.stopwatch('wordy_model') # None unless metrics are enabled
+
+        # Log the guess and the word for record-keeping (written to the CSV
+        # file in the background, so this never waits on the disk)
+        self.guess_log.write(self.word, guess)
+        if lap: lap('log')
+
+        # Check if the guess is a valid word (a hash lookup in its length bucket)
+        is_word = len(guess) == self.word_size and guess in self.lexicon
+        if lap: lap('validate')
+        if not is_word:
+            metrics.count('wordy_model_invalid_guesses_total')
+            raise NotAWordError
 
-        # Iterate through each letter in the guess and compare with the answer word
-        for i in range(self.word_size):
-            if guess[i] not in self.word:
-                # If the letter is not in the answer word, mark as incorrect
-                letter_states[i] = LetterState.INCORRECT
-                key_states[guess[i]] = LetterState.INCORRECT
-            else:
-                if guess[i] != self.word[i]:
-                    # If the letter is misplaced, ark as misplaced
-                    letter_states[i] = LetterState.MISPLACED
-                    key_states[guess[i]] = LetterState.MISPLACED
-                else:
-                    # If the letter is in the correct position, mark as correct
-                    letter_states[i] = LetterState.CORRECT
-                    key_states[guess[i]] = LetterState.CORRECT
-
-        # TODO: implement this method and remove this line
-        return is_correct, letter_states, key_states # Return the result
+        if self.feedback_table is not None:
+            # One read from the precomputed table instead of scoring the letters
+            code = self.feedback_table.lookup(guess, self.word)
+        else:
+            code = score_guess_packed(guess, self.word)
+        if lap: lap('score')
+        return code
 
     def letter_positions(self, word: str) -> dict[str, list[int]]:
         """ Returns a mapping between letters and the indexes at which the
@@ -0,0 +1,154 @@
+"""
+Module: multi_board
+
+A Quordle/Octordle-style model: every guess is played on several boards at
+once, each with its own hidden word.
+
+A guess is logged and validated once, then scored against all the hidden
+words in one vectorized step (see scoring.AnswerScorer) instead of calling
+WordyModel.check_guess once per board. The result holds every board's
+letter states and the keyboard state merged over the boards still in play.
+"""
+
+import random
+from typing import Optional, Sequence
+
+import numpy as np
+
+from difficulty import AliasSampler, answer_sampler
+from guess_log import ANSWER_SEPARATOR, GuessLog, default_guess_log
+from lexicon import Lexicon, shared_lexicon
+from models import LetterState, NotAWordError, merge_key_states
+from scoring import AnswerScorer, CORRECT_CODE, encode_words
+
+
+# state code (see scoring) -> LetterState
+_STATES = (LetterState.INCORRECT, LetterState.MISPLACED, LetterState.CORRECT)
+
+
+class MultiWordyModel:
+    """ The hidden words of several boards and which of them are solved. """
+
+    # instance variables
+    word_size: int  # size of the words
+    num_boards: int  # number of boards (hidden words)
+    lexicon: Lexicon  # index of every word in the word list file
+    word_list: Sequence[str]  # list of valid words
+    answer_sampler: Optional[AliasSampler]  # draws weighted words; None for uniform
+    words: list[str]  # board -> its hidden word
+    solved: list[bool]  # board -> whether its word has been guessed
+    guess_log: GuessLog  # where every guess is recorded
+    _scorer: AnswerScorer  # scores guesses against every hidden word
+
+    def __init__(self, word_size: int, word_list_filename: str, num_boards: int = 4,
+                 preselected_words: Optional[Sequence[str]] = None,
+                 guess_log: Optional[GuessLog] = None, difficulty: str = 'uniform') -> None:
+        """
+        Parameters:
+            word_size: (int) The number of letters in a word.
+            word_list_filename: (str) Name of the file listing the valid words.
+            num_boards: (int) The number of boards played at once.
+            preselected_words: (Sequence[str]) The hidden words, or None for
+                random (distinct) ones.
+            guess_log: (GuessLog) Where guesses are recorded (guess_log.csv
+                unless told otherwise).
+            difficulty: (str) How random words are drawn (see
+                difficulty.CURVES).
+
+        Raises:
+            RuntimeError: When the word list has fewer than <num_boards>
+                words of <word_size> letters.
+        """
+        self.guess_log = guess_log if guess_log is not None else default_guess_log()
+        self.word_size = word_size
+        self.num_boards = num_boards
+        self.lexicon = shared_lexicon(word_list_filename)
+        self.word_list = self.lexicon.words(word_size)
+        self.answer_sampler = answer_sampler(self.lexicon, word_size, difficulty)
+
+        if len(self.word_list) < num_boards:
+            raise RuntimeError(
+                f"Not enough words of length {word_size} in {word_list_filename}")
+
+        self.set_words(preselected_words)
+
+    def set_words(self, preselected_words: Optional[Sequence[str]]) -> None:
+        """ Starts a new game with the given hidden words, or random distinct
+        ones if <preselected_words> is None.
+
+        Raises:
+            ValueError: When there isn't one word per board, or a word isn't
+                the proper size.
+            NotAWordError: When a preselected word is not a valid word.
+        """
+        if preselected_words is None and self.answer_sampler is None:
+            words = random.sample(self.word_list, self.num_boards)
+        elif preselected_words is None:
+            # weighted draws, skipping words another board already has
+            chosen = {}
+            while len(chosen) < self.num_boards:
+                chosen.setdefault(self.answer_sampler.sample(), None)
+            words = [self.word_list[i] for i in chosen]
+        else:
+            words = list(preselected_words)
+            if len(words) != self.num_boards:
+                raise ValueError(f"expected {self.num_boards} preselected words")
+            for word in words:
+                if len(word) != self.word_size:
+                    raise ValueError("preselected word isn't of the correct size")
+                if word not in self.lexicon:
+                    raise NotAWordError("preselected word is not in the word list")
+
+        self.words = words
+        self.solved = [False] * self.num_boards
+        self._scorer = AnswerScorer(encode_words(words))
+
+    @property
+    def all_solved(self) -> bool:
+        return all(self.solved)
+
+    def check_guess_codes(self, guess: str) -> np.ndarray:
+        """ Checks <guess> against every board's word at once, returning a
+        (num_boards, word size) array of state codes (see scoring).
+
+        Raises:
+            NotAWordError: When the guess is not a valid word.
+        """
+        # One log line for the whole guess, whatever the number of boards
+        self.guess_log.write(ANSWER_SEPARATOR.join(self.words), guess)
+
+        if len(guess) != self.word_size or guess not in self.lexicon:
+            raise NotAWordError
+
+        return self._scorer.score(guess)
+
+    def check_guess(self, guess: str) -> tuple[list[bool], list[list[LetterState]],
+                                               dict[str, LetterState]]:
+        """ Checks <guess> against every board's word, returning three things.
+
+        (1) Whether the guess was correct, per board
+        (2) The LetterState of each letter of the guess, per board
+        (3) The best state of each letter of the guess over the boards that
+        were still in play (the keyboard colors)
+
+        Boards whose word is guessed are marked solved.
+
+        Parameters:
+            guess: (str) The guess to check.
+
+        Raises:
+            NotAWordError: When the guess is not a valid word.
+        """
+        # a few numbers per board: cheaper to finish in Python than in numpy
+        rows = self.check_guess_codes(guess).tolist()
+        correct = [min(row) == CORRECT_CODE for row in rows]
+
+        in_play = [row for row, solved in zip(rows, self.solved) if not solved] or rows
+        best = [max(codes) for codes in zip(*in_play)]
+        key_states = merge_key_states(guess, [_STATES[code] for code in best])
+
+        for board, is_correct in enumerate(correct):
+            if is_correct:
+                self.solved[board] = True
+
+        return correct, [[_STATES[code] for code in row] for row in rows], key_states
@@ -0,0 +1,258 @@
+"""
+Module: scoring
+
+Vectorized (NumPy) scoring of many guesses against many answers at once, for
+analysis, simulation and solver code that cannot afford a Python loop per
+(guess, answer) pair.
+
+Words are encoded as uint8 letter matrices (one row per word, one column per
+letter) and feedback is returned as uint8 state codes, one per letter:
+
+    INCORRECT_CODE (0), MISPLACED_CODE (1), CORRECT_CODE (2)
+
+i.e. LetterState.value - 1. Repeated letters are scored the same way as
+models.score_guess: exact matches first, then each remaining guess letter is
+misplaced only while unmatched copies of it are left in the answer.
+"""
+
+from typing import Sequence
+
+import numpy as np
+
+from models import LetterState
+
+
+INCORRECT_CODE = LetterState.INCORRECT.value - 1
+MISPLACED_CODE = LetterState.MISPLACED.value - 1
+CORRECT_CODE = LetterState.CORRECT.value - 1
+
+# number of guesses scored per block; keeps the temporaries cache sized
+_BLOCK_SIZE = 128
+
+# ...or more when there are few answers, up to this many codes per position
+_BLOCK_CODES = 1 << 18
+
+
+def encode_words(words: Sequence[str]) -> np.ndarray:
+    """ Encodes equal-length ASCII words as a (len(words), word size) uint8
+    matrix of character codes.
+
+    Parameters:
+        words: (Sequence[str]) The words to encode.
+
+    Raises:
+        ValueError: When the words are not all the same length.
+    """
+    if len(words) == 0:
+        return np.zeros((0, 0), dtype=np.uint8)
+
+    size = len(words[0])
+    data = ''.join(words).encode('ascii')
+    if len(data) != size * len(words):
+        raise ValueError("all words must be the same length")
+
+    return np.frombuffer(data, dtype=np.uint8).reshape(len(words), size)
+
+
+def decode_words(letters: np.ndarray) -> list[str]:
+    """ The inverse of encode_words.
+
+    Parameters:
+        letters: (np.ndarray) A uint8 letter matrix.
+    """
+    return [row.tobytes().decode('ascii') for row in np.asarray(letters, dtype=np.uint8)]
+
+
+def _letter_counts(answers: np.ndarray) -> np.ndarray:
+    """ Returns a (256, A) uint8 table of how often each character code
+    appears in each answer. """
+    counts = np.zeros((256, answers.shape[0]), dtype=np.uint8)
+    columns = np.arange(answers.shape[0])
+    for j in range(answers.shape[1]):
+        np.add.at(counts, (answers[:, j], columns), 1)
+    return counts
+
+
+def _repeat_patterns(guesses: np.ndarray) -> np.ndarray:
+    """ Returns, for each guess, the index of the first position holding the
+    same letter as each position, e.g. "sass" -> (0, 1, 0, 0). """
+    same = guesses[:, :, None] == guesses[:, None, :]
+    return same.argmax(axis=2)
+
+
+def _score_group(guesses: np.ndarray, answers_t: np.ndarray, counts: np.ndarray,
+                 pattern: Sequence[int]) -> list[np.ndarray]:
+    """ Scores guesses that all share the same repeated-letter <pattern>,
+    returning one (G, A) array of state codes per letter position. """
+    size = len(pattern)
+    green = [guesses[:, i, None] == answers_t[None, i] for i in range(size)]
+    codes = []
+
+    for i in range(size):
+        letter_counts = counts[guesses[:, i]]
+        copies = [j for j in range(size) if pattern[j] == pattern[i]]
+
+        if len(copies) == 1:
+            # the only copy of its letter: misplaced if anywhere in the answer
+            misplaced = letter_counts.astype(bool)
+        else:
+            # exact matches use up copies of the letter in the answer first,
+            # then earlier misplaced copies in the guess claim what is left
+            available = letter_counts.copy()
+            for j in copies:
+                available -= green[j]
+            for j in copies:
+                if j < i:
+                    available -= np.minimum(available, ~green[j])
+            misplaced = available.astype(bool)
+
+        misplaced &= ~green[i]
+        codes.append(green[i].view(np.uint8) * np.uint8(CORRECT_CODE)
+                     + misplaced.view(np.uint8) * np.uint8(MISPLACED_CODE))
+
+    return codes
+
+
+def _score_blocks(guesses: np.ndarray, answers: np.ndarray):
+    """ Scores every guess against every answer, yielding (guess rows, list
+    of per-position (len(rows), A) state code arrays) blocks that together
+    cover every guess. """
+    guesses = np.asarray(guesses, dtype=np.uint8)
+    answers = np.asarray(answers, dtype=np.uint8)
+    if guesses.ndim != 2 or answers.ndim != 2 or guesses.shape[1] != answers.shape[1]:
+        raise ValueError("guesses and answers must be (n, word size) matrices")
+
+    answers_t = np.ascontiguousarray(answers.T)
+    counts = _letter_counts(answers)
+    block_size = max(_BLOCK_SIZE, _BLOCK_CODES // max(1, len(answers)))
+
+    # guesses are scored in groups that repeat letters in the same positions,
+    # so every group needs only the comparisons its repeats call for
+    # (grouping the pattern rows themselves: a number made from them would
+    # overflow for long words and merge different patterns)
+    patterns = _repeat_patterns(guesses)
+    _, first_rows, group_of = np.unique(patterns, axis=0, return_index=True,
+                                        return_inverse=True)
+    group_of = group_of.reshape(-1)
+
+    for group, first_row in enumerate(first_rows):
+        rows = np.flatnonzero(group_of == group)
+        for start in range(0, len(rows), block_size):
+            block = rows[start:start + block_size]
+            yield block, _score_group(guesses[block], answers_t, counts,
+                                      patterns[first_row])
+
+
+def score_matrix(guesses: np.ndarray, answers: np.ndarray) -> np.ndarray:
+    """ Scores every guess against every answer in one vectorized pass.
+
+    Parameters:
+        guesses: (np.ndarray) (G, L) uint8 letter matrix (see encode_words).
+        answers: (np.ndarray) (A, L) uint8 letter matrix.
+
+    Returns:
+        (np.ndarray) (G, A, L) uint8 array where [g, a, i] is the state code
+        of letter i of guess g when the answer is a.
+    """
+    result = np.empty((len(guesses), len(answers), np.shape(guesses)[1]),
+                      dtype=np.uint8)
+
+    for rows, codes in _score_blocks(guesses, answers):
+        result[rows] = np.stack(codes, axis=2)
+
+    return result
+
+
+def packed_dtype(word_size: int) -> np.dtype:
+    """ Returns the smallest unsigned dtype that can hold a packed feedback
+    code (see models.pack_letter_states) for words of the given size. """
+    for dtype in (np.uint8, np.uint16, np.uint32, np.uint64):
+        if 3 ** word_size - 1 <= np.iinfo(dtype).max:
+            return np.dtype(dtype)
+    raise ValueError(f"cannot pack feedback for {word_size} letter words")
+
+
+def pack_codes(codes: np.ndarray) -> np.ndarray:
+    """ Packs the state codes along the last axis into base-3 feedback codes,
+    the same encoding as models.pack_letter_states.
+
+    Parameters:
+        codes: (np.ndarray) (..., L) array of state codes.
+    """
+    dtype = packed_dtype(codes.shape[-1])
+    packed = np.zeros(codes.shape[:-1], dtype=dtype)
+    for i in range(codes.shape[-1]):
+        packed *= dtype.type(3)
+        packed += codes[..., i]
+    return packed
+
+
+def score_packed(guesses: np.ndarray, answers: np.ndarray) -> np.ndarray:
+    """ Like score_matrix, but returns a (G, A) array of packed feedback
+    codes (see pack_codes) without ever holding the (G, A, L) array.
+
+    Parameters:
+        guesses: (np.ndarray) (G, L) uint8 letter matrix.
+        answers: (np.ndarray) (A, L) uint8 letter matrix.
+    """
+    dtype = packed_dtype(np.shape(guesses)[1])
+    result = np.empty((len(guesses), len(answers)), dtype=dtype)
+
+    for rows, codes in _score_blocks(guesses, answers):
+        packed = codes[0].astype(dtype)
+        for position_codes in codes[1:]:
+            packed *= dtype.type(3)
+            packed += position_codes
+        result[rows] = packed
+
+    return result
+
+
+def codes_to_states(codes: Sequence[int]) -> list[LetterState]:
+    """ Converts a row of state codes back to LetterStates.
+
+    Parameters:
+        codes: (Sequence[int]) State codes of the letters of one guess.
+    """
+    return [LetterState(int(code) + 1) for code in codes]
+
+
+class AnswerScorer:
+    """ Scores one guess at a time against a fixed set of answers (e.g. the
+    boards of a multi-board game), keeping the per-answer tables that
+    score_matrix rebuilds on every call.
+
+    A guess without repeated letters takes a handful of array operations
+    whatever the number of answers: each letter is CORRECT where the answer
+    has it at that position and MISPLACED wherever else the answer has it.
+    """
+
+    # instance variables
+    answers: np.ndarray  # (A, L) uint8 letter matrix
+    _answers_t: np.ndarray  # answers, transposed and contiguous
+    _counts: np.ndarray  # (256, A) copies of each character per answer
+    _present: np.ndarray  # (256, A) whether each answer has each character
+
+    def __init__(self, answers: np.ndarray) -> None:
+        self.answers = np.asarray(answers, dtype=np.uint8)
+        self._answers_t = np.ascontiguousarray(self.answers.T)
+        self._counts = _letter_counts(self.answers)
+        self._present = self._counts > 0
+
+    def score(self, guess: str) -> np.ndarray:
+        """ Returns the (A, L) uint8 state codes of <guess> against every
+        answer, as a row of score_matrix would hold them. """
+        letters = np.frombuffer(guess.encode('ascii'), dtype=np.uint8)
+        if len(letters) != self.answers.shape[1]:
+            raise ValueError("guess and answers must be the same length")
+
+        if len(set(guess)) == len(guess):
+            green = self.answers == letters
+            misplaced = self._present[letters].T & ~green
+            return green.view(np.uint8) * np.uint8(CORRECT_CODE) \
+                + misplaced.view(np.uint8) * np.uint8(MISPLACED_CODE)
+
+        guesses = letters[None]
+        codes = _score_group(guesses, self._answers_t, self._counts,
+                             _repeat_patterns(guesses)[0])
+        return np.stack([position_codes[0] for position_codes in codes], axis=1)
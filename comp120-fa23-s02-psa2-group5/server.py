@@ -0,0 +1,350 @@
+"""
+Module: server
+
+A small asyncio HTTP/JSON server for playing Wordy over the network. Every
+game is a GameSession kept in memory (sessions idle for too long are evicted)
+and every game of a given word size shares one preloaded lexicon.
+
+    POST /games                  {"word_size": 5}  -> the new game
+    GET  /games/<id>                               -> the game so far
+    POST /games/<id>/guesses     {"guess": "crane"} -> the guess's feedback
+
+Guesses are logged through the buffered guess log, so no request ever waits
+on the log file. Run it with:
+
+    python server.py --port 8080
+"""
+
+import argparse
+import asyncio
+import json
+import secrets
+import time
+from collections import OrderedDict
+from typing import Optional
+
+from guess_log import GuessLog, default_guess_log
+from lexicon import Lexicon, shared_lexicon
+from models import LetterState, NotAWordError, unpack_letter_states
+from session import (GameOverError, GameRules, GameSession, GameStatus,
+                     WordNotFinishedError)
+from settings import load_settings
+
+
+_REASONS = {200: 'OK', 201: 'Created', 400: 'Bad Request', 404: 'Not Found',
+            405: 'Method Not Allowed', 409: 'Conflict', 413: 'Payload Too Large',
+            422: 'Unprocessable Entity', 431: 'Request Header Fields Too Large'}
+
+# requests with bigger bodies than this are refused
+_MAX_BODY = 4096
+
+# longest request or header line, and most header lines, read per request
+_MAX_LINE = 8192
+_MAX_HEADERS = 100
+
+
+class HTTPError(Exception):
+    """ An error to report to the client with the given status code. """
+
+    def __init__(self, status: int, message: str) -> None:
+        super().__init__(message)
+        self.status = status
+
+
+async def _read_head(reader: asyncio.StreamReader) -> Optional[tuple[bytes, dict[str, str]]]:
+    """ Reads a request line and its headers (names in lower case), or
+    returns None when the client has closed the connection.
+
+    Raises:
+        HTTPError: 400 when the request line is longer than _MAX_LINE, 431
+            when a header line is, or there are more than _MAX_HEADERS.
+    """
+    try:
+        request_line = await reader.readline()
+    except ValueError:  # over the stream's limit
+        raise HTTPError(400, "request line too long")
+    if not request_line:
+        return None
+
+    headers = {}
+    while True:
+        try:
+            line = await reader.readline()
+        except ValueError:
+            raise HTTPError(431, "header line too long")
+        if line in (b'\r\n', b'\n', b''):
+            return request_line, headers
+        if len(headers) == _MAX_HEADERS:
+            raise HTTPError(431, "too many headers")
+        name, _, value = line.decode('latin-1').partition(':')
+        headers[name.strip().lower()] = value.strip()
+
+
+def _state_names(letter_states: list[LetterState]) -> list[str]:
+    return [state.name.lower() for state in letter_states]
+
+
+class GameStore:
+    """ The live sessions, by id, in least recently used order. """
+
+    # instance variables
+    idle_timeout: float  # seconds after which an untouched game is evicted
+    _sessions: "OrderedDict[str, GameSession]"  # oldest access first
+    _last_used: dict[str, float]  # id -> time.monotonic() of last access
+
+    def __init__(self, idle_timeout: float = 1800.0) -> None:
+        self.idle_timeout = idle_timeout
+        self._sessions = OrderedDict()
+        self._last_used = {}
+
+    def __len__(self) -> int:
+        return len(self._sessions)
+
+    def add(self, session: GameSession) -> str:
+        """ Stores <session> and returns its new id. """
+        game_id = secrets.token_urlsafe(9)
+        self._sessions[game_id] = session
+        self._last_used[game_id] = time.monotonic()
+        return game_id
+
+    def get(self, game_id: str) -> GameSession:
+        """ Returns the session with the given id, marking it as used.
+
+        Raises:
+            HTTPError: When there is no such session.
+        """
+        session = self._sessions.get(game_id)
+        if session is None:
+            raise HTTPError(404, "no such game")
+
+        self._sessions.move_to_end(game_id)
+        self._last_used[game_id] = time.monotonic()
+        return session
+
+    def evict_idle(self, now: Optional[float] = None) -> int:
+        """ Removes the sessions idle for longer than idle_timeout, returning
+        how many were removed. """
+        cutoff = (time.monotonic() if now is None else now) - self.idle_timeout
+        evicted = 0
+
+        while self._sessions:
+            game_id = next(iter(self._sessions))
+            if self._last_used[game_id] > cutoff:
+                break
+            del self._sessions[game_id]
+            del self._last_used[game_id]
+            evicted += 1
+
+        return evicted
+
+
+class WordyServer:
+    """ Serves games of Wordy as JSON over HTTP/1.1 (with keep-alive). """
+
+    # instance variables
+    lexicon: Lexicon  # the valid words, shared by every game
+    num_guesses: int  # guesses allowed per game
+    default_word_size: int  # word size of games that don't ask for one
+    difficulty: str  # how answers are drawn (see difficulty.CURVES)
+    games: GameStore  # the live games
+    guess_log: GuessLog  # where every guess is recorded
+    _rules: dict[int, GameRules]  # word size -> rules shared by its games
+    _server: Optional[asyncio.AbstractServer]
+    _evictor: Optional[asyncio.Task]
+
+    def __init__(self, lexicon: Lexicon, num_guesses: int = 6,
+                 default_word_size: int = 5, idle_timeout: float = 1800.0,
+                 guess_log: Optional[GuessLog] = None, difficulty: str = 'uniform') -> None:
+        self.lexicon = lexicon
+        self.difficulty = difficulty
+        self.num_guesses = num_guesses
+        self.default_word_size = default_word_size
+        self.games = GameStore(idle_timeout)
+        self.guess_log = guess_log if guess_log is not None else default_guess_log()
+        self._rules = {}
+        self._server = None
+        self._evictor = None
+
+    def rules(self, word_size: int) -> GameRules:
+        """ Returns the (shared) rules for games of the given word size. """
+        if word_size not in self._rules:
+            if not self.lexicon.words(word_size):
+                raise HTTPError(400, f"no words of length {word_size}")
+            self._rules[word_size] = GameRules(self.lexicon, word_size, self.num_guesses,
+                                               self.guess_log, self.difficulty)
+        return self._rules[word_size]
+
+    async def start(self, host: str = '127.0.0.1', port: int = 8080) -> int:
+        """ Starts listening, returning the port (useful when <port> is 0). """
+        self._server = await asyncio.start_server(self._handle_connection, host, port,
+                                                  limit=_MAX_LINE)
+        self._evictor = asyncio.create_task(self._evict_periodically())
+        return self._server.sockets[0].getsockname()[1]
+
+    async def serve_forever(self) -> None:
+        await self._server.serve_forever()
+
+    async def close(self) -> None:
+        """ Stops listening and flushes the guess log. """
+        if self._evictor is not None:
+            self._evictor.cancel()
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+        await asyncio.get_running_loop().run_in_executor(None, self.guess_log.flush)
+
+    async def _evict_periodically(self) -> None:
+        interval = max(1.0, self.games.idle_timeout / 10)
+        while True:
+            await asyncio.sleep(interval)
+            self.games.evict_idle()
+
+    # request handling
+
+    def handle(self, method: str, path: str, body: bytes) -> tuple[int, dict]:
+        """ Handles one request, returning the status code and JSON body. """
+        parts = path.strip('/').split('/')
+
+        if parts == ['games']:
+            if method != 'POST':
+                raise HTTPError(405, "use POST to create a game")
+            request = self._parse_body(body)
+            word_size = request.get('word_size', self.default_word_size)
+            if not isinstance(word_size, int):
+                raise HTTPError(400, "word_size must be an integer")
+            session = GameSession(self.rules(word_size))
+            return 201, self._describe(self.games.add(session), session)
+
+        if len(parts) == 2 and parts[0] == 'games':
+            if method != 'GET':
+                raise HTTPError(405, "use GET to read a game")
+            return 200, self._describe(parts[1], self.games.get(parts[1]))
+
+        if len(parts) == 3 and parts[0] == 'games' and parts[2] == 'guesses':
+            if method != 'POST':
+                raise HTTPError(405, "use POST to make a guess")
+            session = self.games.get(parts[1])
+            guess = self._parse_body(body).get('guess')
+            if not isinstance(guess, str):
+                raise HTTPError(400, "guess must be a string")
+            return 200, self._guess(parts[1], session, guess.lower())
+
+        raise HTTPError(404, "not found")
+
+    @staticmethod
+    def _parse_body(body: bytes) -> dict:
+        if not body:
+            return {}
+        try:
+            request = json.loads(body)
+        except ValueError:
+            raise HTTPError(400, "body is not valid JSON")
+        if not isinstance(request, dict):
+            raise HTTPError(400, "body must be a JSON object")
+        return request
+
+    def _guess(self, game_id: str, session: GameSession, guess: str) -> dict:
+        try:
+            is_correct, letter_states, key_states = session.guess(guess)
+        except GameOverError as e:
+            raise HTTPError(409, str(e))
+        except (NotAWordError, WordNotFinishedError):
+            raise HTTPError(422, f"{guess} is not a valid word.")
+
+        response = self._describe(game_id, session)
+        response['correct'] = is_correct
+        response['letters'] = _state_names(letter_states)
+        response['keys'] = {letter: state.name.lower()
+                            for letter, state in key_states.items()}
+        return response
+
+    @staticmethod
+    def _describe(game_id: str, session: GameSession) -> dict:
+        rules = session.rules
+        description = {
+            'id': game_id,
+            'word_size': rules.word_size,
+            'num_guesses': rules.num_guesses,
+            'guess_num': session.guess_num,
+            'status': session.status.name.lower(),
+            'history': [{'guess': guess,
+                         'letters': _state_names(unpack_letter_states(code, rules.word_size))}
+                        for guess, code in session.history],
+        }
+        if session.status is GameStatus.LOST:
+            description['answer'] = session.answer
+        return description
+
+    async def _handle_connection(self, reader: asyncio.StreamReader,
+                                 writer: asyncio.StreamWriter) -> None:
+        """ Serves requests on one connection until the client closes it. """
+        try:
+            while True:
+                # a request whose head can't be read leaves the stream in an
+                # unknown place, so the connection closes after the reply
+                keep_alive = False
+                try:
+                    head = await _read_head(reader)
+                    if head is None:
+                        break
+                    request_line, headers = head
+                    keep_alive = headers.get('connection', '').lower() != 'close'
+
+                    method, path, _ = request_line.decode('latin-1').split(' ', 2)
+                    length = int(headers.get('content-length', 0))
+                    if length > _MAX_BODY:
+                        keep_alive = False
+                        raise HTTPError(413, "request body too large")
+                    body = await reader.readexactly(length) if length else b''
+                    status, response = self.handle(method, path, body)
+                except HTTPError as e:
+                    status, response = e.status, {'error': str(e)}
+                except ValueError:
+                    status, response = 400, {'error': "malformed request"}
+                    keep_alive = False
+
+                payload = json.dumps(response).encode()
+                writer.write(
+                    f'HTTP/1.1 {status} {_REASONS.get(status, "")}\r\n'
+                    f'Content-Type: application/json\r\n'
+                    f'Content-Length: {len(payload)}\r\n'
+                    f'Connection: {"keep-alive" if keep_alive else "close"}\r\n'
+                    f'\r\n'.encode('latin-1') + payload)
+                await writer.drain()
+
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+
+async def _main(args: argparse.Namespace) -> None:
+    settings = load_settings(args.settings)
+
+    lexicon = shared_lexicon(settings.word_list_file)
+    default_guess_log(settings.guess_log.max_bytes or None, settings.guess_log.backup_count)
+    server = WordyServer(lexicon, settings.num_guesses, settings.word_size,
+                         args.idle_timeout, difficulty=settings.difficulty)
+    port = await server.start(args.host, args.port)
+    print(f"Serving Wordy on http://{args.host}:{port}")
+
+    try:
+        await server.serve_forever()
+    finally:
+        await server.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Serve Wordy games over HTTP.")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8080)
+    parser.add_argument('--settings', default='settings.json')
+    parser.add_argument('--idle-timeout', type=float, default=1800.0,
+                        help="seconds before an untouched game is evicted")
+
+    try:
+        asyncio.run(_main(parser.parse_args()))
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,171 @@
+"""
+Module: session
+
+A headless (Tk-free) game of Wordy: the same flow as WordyController, driven
+by method calls instead of key presses, so games can be run server-side or in
+bulk. Sessions are small __slots__ objects; everything they have in common
+(the lexicon, word size, number of guesses, guess log) lives in one shared
+GameRules object.
+"""
+
+import random
+from enum import Enum, auto
+from typing import Optional, Sequence
+
+from difficulty import AliasSampler, answer_sampler
+from guess_log import GuessLog, default_guess_log
+from lexicon import Lexicon
+from models import (LetterState, NotAWordError, score_guess_packed,
+                    unpack_guess_result)
+
+
+class WordNotFinishedError(ValueError):
+    pass
+
+
+class GameOverError(RuntimeError):
+    pass
+
+
+class GameStatus(Enum):
+    IN_PROGRESS = auto()
+    WON = auto()
+    LOST = auto()
+
+
+class GameRules:
+    """ The settings shared by every session of one kind of game. """
+
+    # instance variables
+    lexicon: Lexicon  # the valid words, shared by every session
+    word_size: int  # number of characters in the answer
+    num_guesses: int  # number of guesses allowed
+    words: Sequence[str]  # the words of word_size letters (possible answers)
+    guess_log: GuessLog  # where every submitted guess is recorded
+    answer_sampler: Optional[AliasSampler]  # draws weighted answers; None for uniform
+
+    def __init__(self, lexicon: Lexicon, word_size: int, num_guesses: int,
+                 guess_log: Optional[GuessLog] = None, difficulty: str = 'uniform') -> None:
+        """
+        Raises:
+            RuntimeError: When the lexicon has no words of <word_size>.
+            ValueError: When <difficulty> is not one of difficulty.CURVES.
+        """
+        self.lexicon = lexicon
+        self.word_size = word_size
+        self.num_guesses = num_guesses
+        self.words = lexicon.words(word_size)
+        self.guess_log = guess_log if guess_log is not None else default_guess_log()
+
+        if len(self.words) == 0:
+            raise RuntimeError(f"No words of length {word_size} in the lexicon")
+        self.answer_sampler = answer_sampler(lexicon, word_size, difficulty)
+
+    def random_answer(self) -> str:
+        """ Returns a random answer, weighted by difficulty if one was set. """
+        if self.answer_sampler is None:
+            return random.choice(self.words)
+        return self.words[self.answer_sampler.sample()]
+
+
+class GameSession:
+    """ One game in progress: the answer, the guess being typed, and the
+    finished guesses (each stored as the word and its packed feedback). """
+
+    __slots__ = ('rules', 'answer', 'current_guess', 'guess_num', 'history', 'status')
+
+    rules: GameRules
+    answer: str
+    current_guess: str
+    guess_num: int  # the guess the player is on (starts at 0)
+    history: tuple[tuple[str, int], ...]  # (guess, pack_letter_states code)
+    status: GameStatus
+
+    def __init__(self, rules: GameRules, answer: Optional[str] = None) -> None:
+        """ Starts a game with the given answer, or a random one (see
+        GameRules.random_answer).
+
+        Raises:
+            ValueError: When <answer> isn't the proper size.
+            NotAWordError: When <answer> is not a valid word.
+        """
+        if answer is None:
+            answer = rules.random_answer()
+        elif len(answer) != rules.word_size:
+            raise ValueError("answer isn't of the correct size")
+        elif answer not in rules.lexicon:
+            raise NotAWordError("answer is not in the word list")
+
+        self.rules = rules
+        self.answer = answer
+        self.current_guess = ''
+        self.guess_num = 0
+        self.history = ()
+        self.status = GameStatus.IN_PROGRESS
+
+    @property
+    def is_over(self) -> bool:
+        """ Whether the game has been won or lost. """
+        return self.status is not GameStatus.IN_PROGRESS
+
+    def type_letter(self, letter: str) -> bool:
+        """ Adds <letter> to the current guess, unless the guess is already
+        full or the game is over. Returns whether the letter was added. """
+        if self.is_over or len(self.current_guess) >= self.rules.word_size:
+            return False
+        self.current_guess += letter
+        return True
+
+    def backspace(self) -> bool:
+        """ Removes the last letter of the current guess, if there is one.
+        Returns whether a letter was removed. """
+        if self.is_over or not self.current_guess:
+            return False
+        self.current_guess = self.current_guess[:-1]
+        return True
+
+    def submit(self) -> tuple[bool, list[LetterState], dict[str, LetterState]]:
+        """ Checks the current guess, returning the same three things as
+        WordyModel.check_guess. A valid guess uses up one of the guesses and
+        may end the game.
+
+        Raises:
+            GameOverError: When the game is already over.
+            WordNotFinishedError: When the current guess is too short.
+            NotAWordError: When the current guess is not a valid word (the
+                guess is kept so it can be corrected).
+        """
+        if self.is_over:
+            raise GameOverError("the game is over")
+
+        guess = self.current_guess
+        if len(guess) < self.rules.word_size:
+            raise WordNotFinishedError("Word not finished!")
+
+        self.rules.guess_log.write(self.answer, guess)
+        if guess not in self.rules.lexicon:
+            raise NotAWordError(f"{guess} is not a valid word.")
+
+        code = score_guess_packed(guess, self.answer)
+        is_correct = guess == self.answer
+
+        self.history += ((guess, code),)
+        self.current_guess = ''
+        self.guess_num += 1
+
+        if is_correct:
+            self.status = GameStatus.WON
+        elif self.guess_num == self.rules.num_guesses:
+            self.status = GameStatus.LOST
+
+        return unpack_guess_result(guess, code)
+
+    def guess(self, word: str) -> tuple[bool, list[LetterState], dict[str, LetterState]]:
+        """ Replaces the current guess with <word> and submits it. """
+        if self.is_over:
+            raise GameOverError("the game is over")
+        if len(word) > self.rules.word_size:
+            raise NotAWordError(f"{word} is not a valid word.")
+
+        self.current_guess = word
+        return self.submit()
@@ -0,0 +1,205 @@
+"""
+Module: settings
+
+The contents of settings.json as immutable, typed objects. The file is read
+and checked once, up front: a missing key, an unknown key (usually a typo) or
+a value of the wrong type is reported with its full path, e.g.
+
+    SettingsError: settings.json: ui.guesses.letter_box_size: expected int, got str
+
+Everything else reads attributes (settings.ui.guesses.letter_box_size)
+instead of looking up nested dictionaries. Use dataclasses.replace to make a
+variation of the settings.
+"""
+
+import dataclasses
+import json
+import typing
+from dataclasses import dataclass
+
+
+class SettingsError(ValueError):
+    pass
+
+
+@dataclass(frozen=True, slots=True)
+class GuessesSettings:
+    frame_width: int
+    frame_height: int
+    letter_box_size: int
+    letter_padding: int
+    initial_bg_color: str
+    initial_text_color: str
+    updated_text_color: str
+    letter_font_size: int
+    process_wait_time: float  # seconds between revealing the letters of a guess
+    renderer: str = 'frames'  # 'frames' (a widget per letter) or 'canvas'
+    # text color of a guess whose letters can no longer become a word
+    dead_prefix_text_color: str = 'red'
+
+
+@dataclass(frozen=True, slots=True)
+class MessagesSettings:
+    frame_height: int
+    font_size: int
+    display_time: int
+
+
+@dataclass(frozen=True, slots=True)
+class KeyboardSettings:
+    frame_height: int
+    key_height: int
+    key_width: int
+    key_width_long: int
+    text_color: str
+    key_layout: tuple[tuple[str, ...], ...]  # the labels of each row of keys
+
+
+@dataclass(frozen=True, slots=True)
+class UISettings:
+    window_width: int
+    incorrect_color: str
+    misplaced_color: str
+    correct_color: str
+    font_family: str
+    guesses: GuessesSettings
+    messages: MessagesSettings
+    keyboard: KeyboardSettings
+
+
+@dataclass(frozen=True, slots=True)
+class MetricsSettings:
+    enabled: bool = False
+    export_file: str = 'wordy_metrics.prom'
+
+
+@dataclass(frozen=True, slots=True)
+class GuessLogSettings:
+    max_bytes: int = 10 * 1024 * 1024  # size at which guess_log.csv is rotated (0: never)
+    backup_count: int = 5  # rotated (gzipped) segments to keep
+
+
+@dataclass(frozen=True, slots=True)
+class Settings:
+    word_size: int
+    num_guesses: int
+    word_list_file: str
+    ui: UISettings
+    metrics: MetricsSettings = MetricsSettings()
+    guess_log: GuessLogSettings = GuessLogSettings()
+    num_boards: int = 1  # hidden words played at once (see multi_board)
+    difficulty: str = 'uniform'  # how answers are drawn, one of DIFFICULTIES
+
+
+RENDERERS = ('frames', 'canvas')
+DIFFICULTIES = ('uniform', 'easy', 'normal', 'hard')  # see difficulty.CURVES
+
+
+def _convert(value: object, kind: object, path: str) -> object:
+    """ Returns <value> as the given type, raising SettingsError if it is
+    not one. """
+    if dataclasses.is_dataclass(kind):
+        return _from_dict(kind, value, path)
+
+    if typing.get_origin(kind) is tuple:
+        if not isinstance(value, list):
+            raise SettingsError(f"{path}: expected a list, got {type(value).__name__}")
+        item_kind = typing.get_args(kind)[0]
+        return tuple(_convert(item, item_kind, f"{path}[{i}]")
+                     for i, item in enumerate(value))
+
+    # JSON has no separate int type for floats, and bool is a subclass of int
+    if kind is float and isinstance(value, int) and not isinstance(value, bool):
+        return float(value)
+    if isinstance(value, kind) and (kind is bool or not isinstance(value, bool)):
+        return value
+
+    raise SettingsError(f"{path}: expected {kind.__name__}, got {type(value).__name__}")
+
+
+def _from_dict(cls: type, data: object, path: str = '') -> object:
+    """ Builds a settings dataclass from the matching part of settings.json. """
+    prefix = f"{path}." if path else ''
+    if not isinstance(data, dict):
+        raise SettingsError(f"{path or 'settings'}: expected an object, got {type(data).__name__}")
+
+    kinds = typing.get_type_hints(cls)
+    fields = {field.name: field for field in dataclasses.fields(cls)}
+
+    unknown = sorted(set(data) - set(fields))
+    if unknown:
+        raise SettingsError(f"{prefix}{unknown[0]}: unknown setting")
+
+    values = {}
+    for name, field in fields.items():
+        if name in data:
+            values[name] = _convert(data[name], kinds[name], prefix + name)
+        elif field.default is dataclasses.MISSING:
+            raise SettingsError(f"{prefix}{name}: missing")
+
+    return cls(**values)
+
+
+def validate(settings: Settings) -> None:
+    """ Checks the values themselves (sizes, choices).
+
+    Raises:
+        SettingsError: Naming the first setting that is out of range.
+    """
+    positive = {'word_size': settings.word_size,
+                'num_guesses': settings.num_guesses,
+                'num_boards': settings.num_boards,
+                'ui.window_width': settings.ui.window_width,
+                'ui.guesses.frame_height': settings.ui.guesses.frame_height,
+                'ui.guesses.letter_box_size': settings.ui.guesses.letter_box_size,
+                'ui.guesses.letter_font_size': settings.ui.guesses.letter_font_size,
+                'ui.messages.font_size': settings.ui.messages.font_size}
+    for path, value in positive.items():
+        if value <= 0:
+            raise SettingsError(f"{path}: must be positive, got {value}")
+
+    if settings.ui.guesses.process_wait_time < 0:
+        raise SettingsError("ui.guesses.process_wait_time: must not be negative")
+    if settings.guess_log.max_bytes < 0:
+        raise SettingsError("guess_log.max_bytes: must not be negative")
+    if settings.guess_log.backup_count < 0:
+        raise SettingsError("guess_log.backup_count: must not be negative")
+    if settings.ui.messages.display_time < 0:
+        raise SettingsError("ui.messages.display_time: must not be negative")
+    if settings.ui.guesses.renderer not in RENDERERS:
+        raise SettingsError(f"ui.guesses.renderer: must be one of {', '.join(RENDERERS)}")
+    if settings.difficulty not in DIFFICULTIES:
+        raise SettingsError(f"difficulty: must be one of {', '.join(DIFFICULTIES)}")
+    if len(settings.ui.keyboard.key_layout) != 3:
+        raise SettingsError("ui.keyboard.key_layout: must have 3 rows")
+
+
+def parse_settings(data: dict) -> Settings:
+    """ Returns the settings described by <data> (settings.json, decoded).
+
+    Raises:
+        SettingsError: When a setting is missing, unknown, of the wrong type
+            or out of range.
+    """
+    settings = _from_dict(Settings, data)
+    validate(settings)
+    return settings
+
+
+def load_settings(filename: str = 'settings.json') -> Settings:
+    """ Reads and checks the settings file.
+
+    Raises:
+        SettingsError: When the file is not valid JSON or a setting is
+            missing, unknown, of the wrong type or out of range.
+    """
+    with open(filename, 'r') as settings_file:
+        try:
+            data = json.load(settings_file)
+        except ValueError as e:
+            raise SettingsError(f"{filename}: not valid JSON ({e})") from None
+
+    try:
+        return parse_settings(data)
+    except SettingsError as e:
+        raise SettingsError(f"{filename}: {e}") from None
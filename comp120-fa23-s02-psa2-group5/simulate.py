@@ -0,0 +1,209 @@
+"""
+Module: simulate
+
+Evaluates a guessing strategy by playing a game for every answer of one word
+size, sharded across a process pool. Each worker maps the compiled lexicon
+(so the word list is shared, not copied) and plays headless GameSessions.
+
+Per-game results are streamed as they finish (optionally to a JSON lines
+file) and the run ends with the guess-count distribution, failure rate and
+games/sec:
+
+    python simulate.py --strategy entropy --word-size 8
+"""
+
+import argparse
+import collections
+import json
+import multiprocessing
+import os
+import sys
+import time
+from typing import TYPE_CHECKING, Callable, Iterator, Optional
+
+from guess_log import NullGuessLog
+from knowledge import KnowledgeState, letter_index
+from lexicon import Lexicon, shared_lexicon
+from session import GameRules, GameSession, GameStatus
+from settings import load_settings
+
+# numpy (through scoring and solver) is only imported by the entropy
+# strategy, so workers playing the 'first' strategy start quickly
+if TYPE_CHECKING:
+    from solver import Solver
+
+
+# a strategy picks the next guess given what is known so far
+Strategy = Callable[[KnowledgeState], str]
+
+# answers per task handed to a worker
+_CHUNK_SIZE = 256
+
+
+def first_possible(knowledge: KnowledgeState) -> str:
+    """ Guesses the first word (in lexicon order) that could be the answer. """
+    survivors = knowledge.survivors
+    return knowledge.index.words[(survivors & -survivors).bit_length() - 1]
+
+
+class MostInformative:
+    """ Guesses the still-possible word whose feedback splits the remaining
+    answers most evenly. The opening guess is ranked once over all guesses
+    (see Solver) and reused for every game. """
+
+    def __init__(self, opening: str, solver: "Solver") -> None:
+        self.opening = opening
+        self.solver = solver
+
+    def __call__(self, knowledge: KnowledgeState) -> str:
+        if knowledge.survivors == knowledge.index.all_words:
+            return self.opening
+
+        remaining = knowledge.indexes()
+        if len(remaining) <= 2:
+            return knowledge.index.words[remaining[0]]
+
+        return self.solver.rank_guesses(remaining, guesses=remaining, k=1)[0][0]
+
+
+STRATEGIES = ('first', 'entropy')
+
+# set in each worker process by _init_worker
+_worker: dict = {}
+
+
+def _make_strategy(name: str, lexicon: Lexicon, word_size: int,
+                   opening: Optional[str], table_file: Optional[str]) -> Strategy:
+    if name == 'first':
+        return first_possible
+    if name == 'entropy':
+        from feedback_table import FeedbackTable
+        from solver import Solver
+        # the table was built by simulate; each worker only maps it
+        table = FeedbackTable.open(lexicon, word_size, table_file) if table_file else None
+        return MostInformative(opening, Solver(lexicon, word_size, table=table))
+    raise ValueError(f"unknown strategy {name}")
+
+
+def _init_worker(word_list_file: str, word_size: int, num_guesses: int,
+                 strategy: str, opening: Optional[str], table_file: Optional[str]) -> None:
+    lexicon = shared_lexicon(word_list_file)
+    _worker['rules'] = GameRules(lexicon, word_size, num_guesses, NullGuessLog())
+    _worker['index'] = letter_index(lexicon, word_size)
+    _worker['strategy'] = _make_strategy(strategy, lexicon, word_size, opening, table_file)
+
+
+def play(rules: GameRules, knowledge: KnowledgeState, strategy: Strategy,
+         answer: str) -> int:
+    """ Plays one game, returning the number of guesses it took to win (or
+    0 if the guesses ran out). """
+    session = GameSession(rules, answer)
+    while not session.is_over:
+        guess = strategy(knowledge)
+        knowledge.update(guess, session.guess(guess)[1])
+    return session.guess_num if session.status is GameStatus.WON else 0
+
+
+def _play_chunk(bounds: tuple[int, int]) -> list[tuple[str, int]]:
+    rules, index, strategy = _worker['rules'], _worker['index'], _worker['strategy']
+    return [(answer, play(rules, KnowledgeState(index), strategy, answer))
+            for answer in rules.words[bounds[0]:bounds[1]]]
+
+
+def simulate(word_list_file: str, word_size: int, num_guesses: int,
+             strategy: str = 'first', processes: Optional[int] = None,
+             limit: Optional[int] = None) -> Iterator[tuple[str, int]]:
+    """ Plays every answer of <word_size> letters (or the first <limit>),
+    yielding (answer, guesses used, 0 for a loss) as games finish.
+
+    Parameters:
+        word_list_file: (str) Name of the word list file.
+        word_size: (int) Length of the answers.
+        num_guesses: (int) Guesses allowed per game.
+        strategy: (str) One of STRATEGIES.
+        processes: (int) Worker processes (defaults to the number of CPUs).
+        limit: (int) Only play this many answers.
+    """
+    lexicon = shared_lexicon(word_list_file)
+    count = len(lexicon.words(word_size))
+    if limit is not None:
+        count = min(count, limit)
+
+    opening = table_file = None
+    if strategy == 'entropy':
+        from feedback_table import open_table, table_filename
+        from solver import Solver
+        table = open_table(lexicon, word_size, processes)
+        if table is not None:
+            table_file = table_filename(lexicon, word_size)
+        opening = Solver(lexicon, word_size, table=table,
+                         processes=processes).rank([], k=1)[0][0]
+
+    init_args = (word_list_file, word_size, num_guesses, strategy, opening, table_file)
+    chunks = [(start, min(start + _CHUNK_SIZE, count))
+              for start in range(0, count, _CHUNK_SIZE)]
+    processes = min(processes or os.cpu_count() or 1, len(chunks))
+
+    if processes <= 1:
+        _init_worker(*init_args)
+        for chunk in chunks:
+            yield from _play_chunk(chunk)
+        return
+
+    with multiprocessing.Pool(processes, _init_worker, init_args) as pool:
+        for results in pool.imap_unordered(_play_chunk, chunks):
+            yield from results
+
+
+def summarize(guesses_used: list[int], seconds: float) -> dict:
+    """ Returns the guess-count distribution, failure rate and throughput of
+    a run, given the result of every game. """
+    games = len(guesses_used)
+    wins = [used for used in guesses_used if used]
+    return {'games': games,
+            'distribution': dict(sorted(collections.Counter(wins).items())),
+            'failures': games - len(wins),
+            'failure_rate': (games - len(wins)) / games if games else 0.0,
+            'mean_guesses': sum(wins) / len(wins) if wins else 0.0,
+            'seconds': seconds,
+            'games_per_sec': games / seconds if seconds else 0.0}
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    settings = load_settings()
+
+    parser = argparse.ArgumentParser(description="Play every answer with a strategy.")
+    parser.add_argument('--strategy', choices=STRATEGIES, default='first')
+    parser.add_argument('--word-size', type=int, default=settings.word_size)
+    parser.add_argument('--num-guesses', type=int, default=settings.num_guesses)
+    parser.add_argument('--word-list', default=settings.word_list_file)
+    parser.add_argument('--processes', type=int)
+    parser.add_argument('--limit', type=int, help="only play this many answers")
+    parser.add_argument('--results', help="stream per-game results to this JSON lines file")
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    guesses_used = []
+    results_file = open(args.results, 'w') if args.results else None
+    try:
+        for answer, used in simulate(args.word_list, args.word_size, args.num_guesses,
+                                     args.strategy, args.processes, args.limit):
+            guesses_used.append(used)
+            if results_file is not None:
+                results_file.write(json.dumps({'answer': answer, 'guesses': used}) + '\n')
+    finally:
+        if results_file is not None:
+            results_file.close()
+
+    summary = summarize(guesses_used, time.perf_counter() - start)
+    print(f"{summary['games']} games in {summary['seconds']:.2f} s "
+          f"({summary['games_per_sec']:,.0f} games/s)")
+    for used, games in summary['distribution'].items():
+        print(f"  {used} guesses: {games}")
+    print(f"  failed: {summary['failures']} ({summary['failure_rate']:.2%}), "
+          f"mean guesses when solved: {summary['mean_guesses']:.3f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,305 @@
+"""
+Module: solver
+
+Recommends guesses by expected information gain: a guess splits the answers
+that are still possible into groups by the feedback each one would produce,
+and the best guesses are those whose groups are the most even (highest
+entropy, in bits).
+
+It can be used headless, e.g. after guessing "crane" and getting back
+incorrect, incorrect, misplaced, incorrect, correct:
+
+    python solver.py crane:00102
+"""
+
+import math
+import multiprocessing
+import os
+import sys
+from typing import TYPE_CHECKING, Optional, Sequence, Union
+
+import numpy as np
+
+from lexicon import Lexicon, shared_lexicon
+from models import LetterState, pack_letter_states
+from scoring import encode_words, score_packed
+
+if TYPE_CHECKING:
+    from feedback_table import FeedbackTable
+
+
+# a finished guess: the word and either its letter states or packed code
+HistoryEntry = tuple[str, Union[Sequence[LetterState], int]]
+
+# upper bound on guess x candidate codes held in memory at once
+_MAX_BLOCK_CODES = 1 << 22
+
+# guess x candidate pairs scored per interactive hint: about 30 ms of work,
+# keeping each later move of a 5-letter game within 50 ms
+INTERACTIVE_MAX_PAIRS = 1 << 20
+
+# set in each worker process by _init_worker
+_worker_letters: Optional[np.ndarray] = None
+
+
+def _entropies(codes: np.ndarray, word_size: int) -> np.ndarray:
+    """ Returns the entropy (in bits) of the partition of the columns of each
+    row of <codes> (a (G, C) array of packed feedback codes). """
+    rows, candidates = codes.shape
+    patterns = 3 ** word_size
+
+    if rows * patterns <= _MAX_BLOCK_CODES:
+        # count every pattern of every row with one bincount
+        offsets = np.arange(rows, dtype=np.int64)[:, None] * patterns
+        counts = np.bincount((codes + offsets).ravel(),
+                             minlength=rows * patterns).reshape(rows, patterns)
+        sizes = np.arange(candidates + 1, dtype=np.float64)
+        sizes[1:] *= np.log2(sizes[1:])
+        weighted = sizes[counts].sum(axis=1)
+    else:
+        # too many patterns to count densely: sort each row and measure runs
+        ordered = np.sort(codes, axis=1)
+        starts = np.ones(ordered.shape, dtype=bool)
+        starts[:, 1:] = ordered[:, 1:] != ordered[:, :-1]
+        flat_starts = np.flatnonzero(starts.ravel())
+        lengths = np.diff(np.append(flat_starts, ordered.size)).astype(np.float64)
+        weighted = np.bincount(flat_starts // candidates,
+                               weights=lengths * np.log2(lengths), minlength=rows)
+
+    return math.log2(candidates) - weighted / candidates
+
+
+def _score_guess_block(guesses: np.ndarray, candidates: np.ndarray) -> np.ndarray:
+    """ Returns the entropy of each guess in the block over <candidates>. """
+    block = max(1, _MAX_BLOCK_CODES // max(1, len(candidates)))
+    result = np.empty(len(guesses), dtype=np.float64)
+
+    for start in range(0, len(guesses), block):
+        codes = score_packed(guesses[start:start + block], candidates)
+        result[start:start + block] = _entropies(codes, guesses.shape[1])
+
+    return result
+
+
+def _init_worker(letters: np.ndarray) -> None:
+    global _worker_letters
+    _worker_letters = letters
+
+
+def _score_rows(bounds: tuple[int, int]) -> np.ndarray:
+    start, stop = bounds
+    return _score_guess_block(_worker_letters[start:stop], _worker_letters)
+
+
+class Solver:
+    """ Ranks the guesses of one word size by expected information gain over
+    the answers that are consistent with a game's history so far. """
+
+    # instance variables
+    word_size: int  # length of the words being guessed
+    words: Sequence[str]  # valid guesses (and possible answers), in order
+    letters: np.ndarray  # words encoded as a uint8 letter matrix
+    table: Optional["FeedbackTable"]  # precomputed feedback, if available
+    processes: Optional[int]  # worker processes for the opening move
+    max_pairs: Optional[int]  # cap on guess x answer pairs scored per later move
+    _opening: Optional[np.ndarray]  # entropies of every guess with no history
+    _opening_order: Optional[np.ndarray]  # word indexes, best opening guess first
+    _index: dict[str, int]  # word -> index into words
+
+    def __init__(self, lexicon: Lexicon, word_size: int,
+                 table: Optional["FeedbackTable"] = None,
+                 processes: Optional[int] = None,
+                 max_pairs: Optional[int] = None) -> None:
+        """ Creates a solver for the <word_size> words of <lexicon>.
+
+        Parameters:
+            lexicon: (Lexicon) The valid words.
+            word_size: (int) Length of the words being guessed.
+            table: (FeedbackTable) Precomputed feedback for that bucket, used
+                instead of scoring guesses on the fly.
+            processes: (int) Worker processes used to rank the opening move
+                (defaults to the number of CPUs).
+            max_pairs: (int) When ranking every guess over the remaining
+                answers would score more (guess, answer) pairs than this,
+                only the best opening guesses (and the remaining answers)
+                are ranked. None ranks every guess.
+        """
+        self.word_size = word_size
+        self.words = lexicon.words(word_size)
+        if len(self.words) == 0:
+            raise ValueError(f"no words of length {word_size} in the lexicon")
+
+        self.letters = encode_words(self.words)
+        self.table = table
+        self.processes = processes
+        self.max_pairs = max_pairs
+        self._opening = None
+        self._opening_order = None
+        self._index = {word: i for i, word in enumerate(self.words)}
+
+    def _feedback(self, guess_rows: np.ndarray, answer_rows: np.ndarray) -> np.ndarray:
+        """ Returns the (G, A) packed feedback of the given guess rows against
+        the given answer rows. """
+        if self.table is not None:
+            return self.table.codes[np.ix_(guess_rows, answer_rows)]
+        return score_packed(self.letters[guess_rows], self.letters[answer_rows])
+
+    def candidates(self, history: Sequence[HistoryEntry]) -> np.ndarray:
+        """ Returns the indexes (into self.words) of the answers that would
+        have produced every result in <history>.
+
+        Parameters:
+            history: (Sequence[HistoryEntry]) The guesses made so far, each
+                with its letter states or packed feedback code.
+        """
+        remaining = np.arange(len(self.words))
+
+        for guess, result in history:
+            code = result if isinstance(result, int) else pack_letter_states(result)
+            row = np.array([self._index[guess]])
+            remaining = remaining[self._feedback(row, remaining)[0] == code]
+
+        return remaining
+
+    def guess_entropies(self, remaining: Sequence[int],
+                        guesses: Optional[Sequence[int]] = None) -> np.ndarray:
+        """ Returns the entropy (in bits) of each guess over the <remaining>
+        answers.
+
+        Parameters:
+            remaining: (Sequence[int]) The indexes of the answers still possible.
+            guesses: (Sequence[int]) The indexes of the guesses to score, or
+                None for every word.
+        """
+        remaining = np.asarray(remaining, dtype=np.intp)
+        if guesses is None:
+            if len(remaining) == len(self.words):
+                return self._opening_entropies()
+            guesses = np.arange(len(self.words))
+
+        guesses = np.asarray(guesses, dtype=np.intp)
+        if self.table is not None:
+            return self._table_entropies(guesses, remaining)
+        return _score_guess_block(self.letters[guesses], self.letters[remaining])
+
+    def _table_entropies(self, guesses: np.ndarray, remaining: np.ndarray) -> np.ndarray:
+        """ Like _score_guess_block, reading the codes from the table a block
+        of guesses at a time. """
+        block = max(1, _MAX_BLOCK_CODES // max(1, len(remaining)))
+        result = np.empty(len(guesses), dtype=np.float64)
+
+        for start in range(0, len(guesses), block):
+            codes = self._feedback(guesses[start:start + block], remaining)
+            result[start:start + block] = _entropies(codes, self.word_size)
+
+        return result
+
+    def _capped_guesses(self, remaining: np.ndarray) -> Optional[np.ndarray]:
+        """ Returns the guesses worth ranking over <remaining> within
+        max_pairs: the remaining answers (if they fit) and the best opening
+        guesses. Returns None when every guess fits. """
+        if self.max_pairs is None or len(self.words) * len(remaining) <= self.max_pairs:
+            return None
+
+        count = max(1, self.max_pairs // len(remaining))
+        if self._opening_order is None:
+            self._opening_order = np.argsort(-self._opening_entropies(), kind='stable')
+        if len(remaining) >= count:
+            return self._opening_order[:count]
+        return np.union1d(remaining, self._opening_order[:count - len(remaining)])
+
+    def _opening_entropies(self) -> np.ndarray:
+        """ Ranks every guess against every answer (the expensive first move),
+        from the feedback table or across a process pool, caching the result. """
+        if self._opening is None:
+            count = len(self.words)
+            processes = min(self.processes or os.cpu_count() or 1, count)
+
+            if self.table is not None:
+                # one read of the table, no scoring to share out
+                everything = np.arange(count)
+                self._opening = self._table_entropies(everything, everything)
+            elif processes == 1:
+                self._opening = _score_guess_block(self.letters, self.letters)
+            else:
+                step = -(-count // (processes * 4))
+                bounds = [(start, min(start + step, count))
+                          for start in range(0, count, step)]
+                with multiprocessing.Pool(processes, _init_worker,
+                                          (self.letters,)) as pool:
+                    self._opening = np.concatenate(pool.map(_score_rows, bounds))
+
+        return self._opening
+
+    def rank(self, history: Sequence[HistoryEntry], k: int = 5,
+             remaining: Optional[Sequence[int]] = None) -> list[tuple[str, float]]:
+        """ Returns the <k> best next guesses with their expected information
+        gain in bits, best first. Among equally good guesses, ones that could
+        still be the answer come first.
+
+        Parameters:
+            history: (Sequence[HistoryEntry]) The guesses made so far.
+            k: (int) Number of guesses to return.
+            remaining: (Sequence[int]) The indexes of the answers still
+                possible, if already known (e.g. KnowledgeState.indexes()),
+                in which case <history> is not replayed.
+        """
+        if remaining is None:
+            remaining = self.candidates(history)
+        remaining = np.asarray(remaining, dtype=np.intp)
+        if len(remaining) <= 2:
+            return [(self.words[i], float(len(remaining) - 1)) for i in remaining[:k]]
+
+        return self.rank_guesses(remaining, k=k)
+
+    def rank_guesses(self, remaining: Sequence[int], guesses: Optional[Sequence[int]] = None,
+                     k: int = 5) -> list[tuple[str, float]]:
+        """ Returns the <k> best of <guesses> (indexes into self.words, or
+        None for every word, cut down to fit max_pairs) with their expected
+        information gain over the <remaining> answers, best first. Among equally good guesses, ones
+        that could still be the answer come first, then lexicon order.
+
+        Parameters:
+            remaining: (Sequence[int]) The indexes of the answers still possible.
+            guesses: (Sequence[int]) The indexes of the guesses to rank, e.g.
+                <remaining> itself to only guess words that could be the answer.
+            k: (int) Number of guesses to return.
+        """
+        remaining = np.asarray(remaining, dtype=np.intp)
+        if guesses is None and len(remaining) < len(self.words):
+            guesses = self._capped_guesses(remaining)
+        rows = (np.arange(len(self.words)) if guesses is None
+                else np.asarray(guesses, dtype=np.intp))
+        entropies = self.guess_entropies(remaining, guesses)
+        possible = np.zeros(len(self.words), dtype=bool)
+        possible[remaining] = True
+
+        order = np.lexsort((~possible[rows], -entropies))[:k]
+        return [(self.words[rows[i]], float(entropies[i])) for i in order]
+
+
+def recommend(history: Sequence[HistoryEntry], word_size: int = 5,
+              word_list_file: str = 'long_wordlist.txt', k: int = 5) -> list[tuple[str, float]]:
+    """ Convenience wrapper: loads the word list and ranks the next guesses.
+
+    Parameters:
+        history: (Sequence[HistoryEntry]) The guesses made so far.
+        word_size: (int) Length of the words being guessed.
+        word_list_file: (str) Name of the word list file.
+        k: (int) Number of guesses to return.
+    """
+    solver = Solver(shared_lexicon(word_list_file), word_size)
+    return solver.rank(history, k)
+
+
+if __name__ == "__main__":
+    # each argument is guess:digits, one digit per letter (0 = incorrect,
+    # 1 = misplaced, 2 = correct)
+    history = []
+    for arg in sys.argv[1:]:
+        guess, digits = arg.split(':')
+        history.append((guess, [LetterState(int(d) + 1) for d in digits]))
+
+    size = len(history[0][0]) if history else 5
+    for word, bits in recommend(history, size):
+        print(f"{word}  {bits:.3f} bits")
@@ -0,0 +1,36 @@
+from benchmarks import build_cases, compare, main, measure
+
+
+def test_measure_reports_rate_and_percentiles():
+    result = measure(lambda: sum(range(100)), min_time=0.01)
+
+    assert result['runs'] >= 5
+    assert result['ops_per_sec'] > 0
+    assert result['p50_us'] <= result['p99_us']
+
+def test_compare_flags_only_drops_beyond_threshold():
+    baseline = {'a': {'ops_per_sec': 1000.0}, 'b': {'ops_per_sec': 1000.0}}
+    results = {'a': {'ops_per_sec': 850.0}, 'b': {'ops_per_sec': 700.0},
+               'new': {'ops_per_sec': 1.0}}
+
+    regressions = compare(results, baseline, threshold=0.2)
+
+    assert len(regressions) == 1 and regressions[0].startswith('b:')
+
+def test_main_fails_on_regression(tmp_path):
+    baseline = tmp_path / "baseline.json"
+    baseline.write_text('{"check_guess[5]": {"ops_per_sec": 1e15}}')
+    output = str(tmp_path / "results.json")
+
+    assert main(['--filter', 'check_guess', '--min-time', '0.01',
+                 '--output', output, '--baseline', str(baseline)]) == 1
+    assert main(['--filter', 'check_guess', '--min-time', '0.01',
+                 '--output', output, '--baseline', output]) == 0
+
+def test_word_list_loading_is_benchmarked_per_size():
+    cases = build_cases([4, 5])
+
+    for size in (4, 5):
+        for name in (f'lexicon_load[{size}]', f'lexicon_from_cache[{size}]'):
+            assert cases[name]() > 0
+        assert f'model_init_warm[{size}]' in cases
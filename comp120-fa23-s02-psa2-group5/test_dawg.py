@@ -0,0 +1,47 @@
+from dawg import Dawg, lexicon_dawg
+from lexicon import Lexicon
+
+WORDS = ["help", "hemp", "held", "hold", "helps", "stop", "shop", "sits", "at", "a"]
+
+
+def test_can_complete_checks_prefix_and_length():
+    dawg = Dawg(WORDS)
+
+    assert dawg.can_complete("", 4)
+    assert dawg.can_complete("he", 4)
+    assert dawg.can_complete("help", 5)
+    assert not dawg.can_complete("help", 6)
+    assert not dawg.can_complete("hx", 4)
+    assert not dawg.can_complete("sto", 5)
+    assert not dawg.can_complete("helps", 4)
+
+def test_contains_and_completions():
+    dawg = Dawg(WORDS)
+
+    assert "helps" in dawg and "a" in dawg
+    assert "hel" not in dawg and "" not in dawg
+    assert list(dawg.completions("he", 4)) == ["held", "help", "hemp"]
+    assert list(dawg.completions("", 2)) == ["at"]
+    assert list(dawg.completions("q", 4)) == []
+
+def test_matches_the_word_list():
+    lexicon = Lexicon.load('long_wordlist.txt')
+    dawg = lexicon_dawg(lexicon)
+    words = lexicon.words(5)
+
+    assert list(dawg.completions("", 5)) == sorted(words)
+    prefixes = {word[:3] for word in words}
+    for prefix in ("abc", "qzx", "cra", "zzz", "xyl"):
+        assert dawg.can_complete(prefix, 5) == (prefix in prefixes)
+
+def test_save_and_load_roundtrip(tmp_path):
+    filename = str(tmp_path / "words.dawg")
+    dawg = Dawg(WORDS)
+    dawg.save(filename, (10, 20))
+
+    loaded = Dawg.load(filename, (10, 20))
+    assert loaded is not None
+    assert sorted(loaded.completions("", 4)) == sorted(dawg.completions("", 4))
+    assert loaded.nbytes == dawg.nbytes
+    # built from another version of the word list
+    assert Dawg.load(filename, (10, 21)) is None
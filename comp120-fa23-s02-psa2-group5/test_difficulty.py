@@ -0,0 +1,55 @@
+import random
+
+import pytest
+
+from difficulty import AliasSampler, answer_sampler, load_scores, save_scores, word_difficulty
+from lexicon import Lexicon
+from models import WordyModel
+from session import GameRules, GameSession
+
+
+def test_alias_sampler_matches_the_weights():
+    sampler = AliasSampler([1, 0, 3, 6])
+    rng = random.Random(25)
+
+    draws = [sampler.sample(rng) for _ in range(20000)]
+
+    assert 1 not in draws
+    for index, weight in [(0, 0.1), (2, 0.3), (3, 0.6)]:
+        assert draws.count(index) / len(draws) == pytest.approx(weight, abs=0.02)
+    with pytest.raises(ValueError):
+        AliasSampler([0, 0])
+
+def test_scores_rank_common_letters_as_easier():
+    lexicon = Lexicon.load('long_wordlist.txt')
+    words = list(lexicon.words(5))
+    scores = word_difficulty(lexicon)[5]
+
+    assert len(scores) == len(words)
+    assert 0.0 <= min(scores) and max(scores) <= 1.0
+    assert scores[words.index("crane")] < scores[words.index("whiff")]
+
+def test_save_and_load_scores(tmp_path):
+    filename = str(tmp_path / "words.difficulty")
+    scores = word_difficulty(Lexicon(["help", "hemp", "held", "stop", "at"]))
+    save_scores(filename, scores, (10, 20))
+
+    assert load_scores(filename, (10, 20)) == scores
+    assert load_scores(filename, (10, 21)) is None
+
+def test_difficulty_setting_skews_the_answers():
+    lexicon = Lexicon.load('long_wordlist.txt')
+    scores = word_difficulty(lexicon)[5]
+    words = list(lexicon.words(5))
+    random.seed(120)
+
+    def mean_difficulty(difficulty):
+        rules = GameRules(lexicon, 5, 6, difficulty=difficulty)
+        answers = [GameSession(rules).answer for _ in range(2000)]
+        return sum(scores[words.index(answer)] for answer in answers) / len(answers)
+
+    assert mean_difficulty('easy') < 0.4 < 0.6 < mean_difficulty('hard')
+    assert answer_sampler(lexicon, 5, 'uniform') is None
+    assert WordyModel(5, 'long_wordlist.txt', difficulty='hard').answer_sampler is not None
+    with pytest.raises(ValueError):
+        GameRules(lexicon, 5, 6, difficulty='brutal')
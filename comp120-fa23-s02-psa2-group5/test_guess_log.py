@@ -0,0 +1,106 @@
+import gzip
+import os
+
+import pytest
+
+from guess_log import (DEFAULT_MAX_BYTES, BufferedGuessLog, NullGuessLog,
+                       default_guess_log, log_segments, set_default_guess_log)
+from lexicon import Lexicon
+from log_stats import analyze
+from models import NotAWordError, WordyModel
+from settings import load_settings
+
+
+def test_buffered_guess_log_batches_lines_until_flush(tmp_path):
+    filename = tmp_path / "guess_log.csv"
+    guess_log = BufferedGuessLog(str(filename), max_batch=1000, flush_interval=60)
+
+    guess_log.write("help", "hack")
+    guess_log.write("help", "fftz")
+    assert not filename.exists(), "Lines should wait for a batch"
+
+    guess_log.flush()
+    assert filename.read_text() == "help, hack\nhelp, fftz\n"
+
+    guess_log.write("help", "help")
+    guess_log.close()
+    assert filename.read_text().endswith("help, help\n")
+
+    guess_log.write("help", "knot")
+    assert filename.read_text().count("\n") == 3, "Writes after close are dropped"
+
+def test_buffered_guess_log_writes_full_batches(tmp_path):
+    filename = tmp_path / "guess_log.csv"
+    guess_log = BufferedGuessLog(str(filename), max_batch=2, flush_interval=60)
+
+    for guess in ["hack", "knot", "peat"]:
+        guess_log.write("help", guess)
+    guess_log.close()
+
+    assert filename.read_text() == "help, hack\nhelp, knot\nhelp, peat\n"
+
+def test_model_logs_invalid_guesses_too(tmp_path):
+    filename = tmp_path / "guess_log.csv"
+    guess_log = BufferedGuessLog(str(filename))
+    model = WordyModel(4, 'long_wordlist.txt', preselected_word="help",
+                       guess_log=guess_log)
+
+    model.check_guess("hack")
+    with pytest.raises(NotAWordError):
+        model.check_guess("fftz")
+    guess_log.close()
+
+    assert filename.read_text() == "help, hack\nhelp, fftz\n"
+
+def test_null_guess_log_records_nothing():
+    model = WordyModel(4, 'long_wordlist.txt', preselected_word="help",
+                       guess_log=NullGuessLog())
+
+    assert model.check_guess("help")[0]
+
+def test_buffered_guess_log_rotates_and_compresses(tmp_path):
+    filename = tmp_path / "guess_log.csv"
+    guess_log = BufferedGuessLog(str(filename), max_batch=1, max_bytes=20,
+                                 backup_count=2)
+
+    for guess in ["hack", "knot", "peat", "stop", "help"]:
+        guess_log.write("help", guess)
+    guess_log.close()
+
+    segments = log_segments(str(filename))
+    assert [os.path.basename(s) for s in segments] == \
+        ["guess_log.csv.2.gz", "guess_log.csv.1.gz", "guess_log.csv"]
+    with gzip.open(segments[0], 'rt') as f:
+        assert f.read() == "help, hack\nhelp, knot\n"
+    assert filename.read_text() == "help, help\n"
+
+def test_log_stats_reads_segments_in_one_pass(tmp_path):
+    filename = tmp_path / "guess_log.csv"
+    with gzip.open(str(filename) + ".1.gz", 'wt') as f:
+        f.write("help, hack\nhelp, fftz\nhelp, help\n")
+    filename.write_text("stop, hack\nstop, spot\nstop, stop\nknot, hack\n")
+
+    stats = analyze(str(filename), Lexicon.load('long_wordlist.txt'), chunk_size=7)
+    summary = stats.summary()
+
+    assert summary['guesses'] == 7 and summary['invalid'] == 1
+    assert summary['games'] == 3 and summary['solved'] == 2
+    assert summary['top_openers'] == [("hack", 3)]
+    assert summary['guesses_to_solve'] == {"help": 2, "stop": 3}
+    assert summary['letter_miss_rates']['c'] == 1.0
+    assert summary['letter_miss_rates']['h'] == 0.5
+
+def test_default_guess_log_rotates(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    set_default_guess_log(None)
+
+    guess_log = default_guess_log()
+    try:
+        assert isinstance(guess_log, BufferedGuessLog)
+        assert guess_log.max_bytes == DEFAULT_MAX_BYTES
+        assert default_guess_log(max_bytes=None) is guess_log
+    finally:
+        guess_log.close()
+
+    settings = load_settings(os.path.join(os.path.dirname(__file__), 'settings.json'))
+    assert settings.guess_log.max_bytes > 0
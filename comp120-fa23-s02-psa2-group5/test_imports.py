@@ -0,0 +1,38 @@
+import subprocess
+import sys
+
+# the slowest of these modules (server) measured about 0.1 s on a slow
+# single-CPU machine, the rest 0.03-0.07 s; importing numpy alone took
+# another 0.12 s, so a module that pulls it in goes over
+IMPORT_BUDGET = 0.2
+
+# best of this many fresh imports, so one slow start doesn't fail the test
+ATTEMPTS = 3
+
+HEAVY_MODULES = {'tkinter', '_tkinter', 'numpy', 'views'}
+
+
+def import_in_fresh_interpreter(module):
+    """ Imports <module> in a new Python process, returning how long it took
+    and which of the heavy modules (or their submodules) it loaded. """
+    code = (f"import sys, time\n"
+            f"start = time.perf_counter()\n"
+            f"import {module}\n"
+            f"elapsed = time.perf_counter() - start\n"
+            f"loaded = {{name.split('.')[0] for name in sys.modules}}\n"
+            f"print(elapsed, *sorted(loaded & {HEAVY_MODULES!r}))\n")
+    output = subprocess.run([sys.executable, '-c', code], capture_output=True,
+                            text=True, check=True).stdout.split()
+    return float(output[0]), output[1:]
+
+
+def test_game_logic_imports_without_gui_or_numpy():
+    for module in ['models', 'session', 'wordy', 'server', 'log_stats', 'simulate']:
+        elapsed, heavy = import_in_fresh_interpreter(module)
+        assert heavy == [], f"importing {module} loaded {heavy}"
+
+        for _ in range(ATTEMPTS - 1):
+            if elapsed < IMPORT_BUDGET:
+                break
+            elapsed = min(elapsed, import_in_fresh_interpreter(module)[0])
+        assert elapsed < IMPORT_BUDGET, f"importing {module} took {elapsed:.3f} s"
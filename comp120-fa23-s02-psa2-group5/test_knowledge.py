@@ -0,0 +1,45 @@
+import random
+
+from knowledge import KnowledgeState, LetterIndex, letter_index
+from lexicon import Lexicon
+from models import LetterState, score_guess
+
+WORDS = ["help", "hemp", "held", "hold", "stop", "shop", "sits", "mess", "sins", "knot"]
+
+
+def test_update_narrows_to_words_consistent_with_feedback():
+    knowledge = KnowledgeState(LetterIndex(WORDS, 4))
+
+    knowledge.update("sins", score_guess("sins", "stop"))
+
+    assert knowledge.words() == ["stop", "shop"]
+    assert knowledge.min_counts["s"] == 1 and knowledge.max_counts["s"] == 1
+    assert knowledge.allowed_letters(0) == "s"
+    assert "i" not in knowledge.allowed_letters(1)
+
+def test_repeated_letter_counts():
+    knowledge = KnowledgeState(LetterIndex(WORDS, 4))
+
+    knowledge.update("mess", [LetterState.INCORRECT, LetterState.INCORRECT,
+                              LetterState.MISPLACED, LetterState.CORRECT])
+
+    assert knowledge.words() == ["sits", "sins"]
+    assert knowledge.count() == 2
+    assert knowledge.min_counts["s"] == 2
+
+def test_matches_rescanning_the_word_list():
+    lexicon = Lexicon.load('long_wordlist.txt')
+    words = lexicon.words(5)
+    rng = random.Random(6)
+
+    for _ in range(20):
+        answer = rng.choice(words)
+        knowledge = KnowledgeState(letter_index(lexicon, 5))
+        remaining = list(words)
+
+        for guess in rng.sample(list(words), 3):
+            states = score_guess(guess, answer)
+            knowledge.update(guess, states)
+            remaining = [word for word in remaining if score_guess(guess, word) == states]
+
+            assert knowledge.words() == remaining
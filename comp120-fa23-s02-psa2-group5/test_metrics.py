@@ -0,0 +1,49 @@
+import json
+
+import pytest
+
+import metrics
+from guess_log import NullGuessLog
+from models import NotAWordError, WordyModel
+
+
+@pytest.fixture
+def recording():
+    metrics.reset()
+    metrics.enable()
+    yield
+    metrics.enable(False)
+    metrics.reset()
+
+
+def test_disabled_metrics_record_nothing():
+    metrics.reset()
+    with metrics.timer('wordy_test_seconds'):
+        metrics.count('wordy_test_total')
+    assert metrics.snapshot() == {'counters': {}, 'histograms': {}}
+
+def test_model_records_hot_path_latencies(recording):
+    model = WordyModel(4, 'long_wordlist.txt', preselected_word="help",
+                       guess_log=NullGuessLog())
+    model.check_guess("hack")
+    with pytest.raises(NotAWordError):
+        model.check_guess("fftz")
+
+    snapshot = metrics.snapshot()
+    assert snapshot['counters'] == {'wordy_model_invalid_guesses_total': 1}
+    assert snapshot['histograms']['wordy_model_validate_seconds']['count'] == 2
+    assert snapshot['histograms']['wordy_model_score_seconds']['count'] == 1
+
+def test_metrics_export_formats(recording, tmp_path):
+    metrics.count('wordy_test_total', 3)
+    with metrics.timer('wordy_test_seconds'):
+        pass
+
+    text = metrics.to_prometheus()
+    assert '# TYPE wordy_test_total counter\nwordy_test_total 3\n' in text
+    assert 'wordy_test_seconds_bucket{le="+Inf"} 1\n' in text
+    assert 'wordy_test_seconds_count 1\n' in text
+
+    metrics.write(str(tmp_path / "metrics.json"))
+    saved = json.loads((tmp_path / "metrics.json").read_text())
+    assert saved['counters'] == {'wordy_test_total': 3}
@@ -1,6 +1,10 @@
+import os
+
 import pytest
 
-from models import NotAWordError, LetterState, WordyModel
+from lexicon import CACHE_SUFFIX, Lexicon, atomic_write, cache_is_fresh, shared_lexicon
+from models import (NotAWordError, LetterState, WordyModel, pack_letter_states,
+                    unpack_guess_result, update_key_states)
 
 def test_check_guess_correct():
     model = WordyModel(4, 'long_wordlist.txt', preselected_word="help")
@@ -85,7 +89,7 @@ def test_check_guess_repeated_letters_one_correct_one_incorrect():
     assert letter_states == expected_letter_states, "Incorrect letter states"
     assert key_states == expected_key_states, "Incorrect key states"
 
-def test_check_guess_repeated_letters_one_correct_one_incorrect():
+def test_check_guess_repeated_letters_one_misplaced_one_correct():
     model = WordyModel(4, 'long_wordlist.txt', preselected_word="sits")
 
     expected_letter_states = [LetterState.INCORRECT, LetterState.INCORRECT, LetterState.MISPLACED, LetterState.CORRECT]
@@ -104,6 +108,110 @@ def test_check_guess_raises_notaword_exception():
     with pytest.raises(NotAWordError):
         model.check_guess("fftz")
 
+def test_preselected_word_not_in_word_list_raises_notaword_exception():
+    with pytest.raises(NotAWordError):
+        WordyModel(4, 'long_wordlist.txt', preselected_word="fftz")
+
+def test_check_guess_packed_matches_check_guess():
+    model = WordyModel(5, 'long_wordlist.txt', preselected_word='sissy')
+
+    for guess in ['essay', 'geese', 'sissy', 'crane']:
+        code = model.check_guess_packed(guess)
+        expected = model.check_guess(guess)
+        assert code == pack_letter_states(expected[1])
+        assert unpack_guess_result(guess, code) == expected
+
+    with pytest.raises(NotAWordError):
+        model.check_guess_packed("fftzz")
+
+def test_update_key_states_never_downgrades():
+    key_states = {}
+    changed = update_key_states(key_states, {'a': LetterState.CORRECT,
+                                             'b': LetterState.MISPLACED})
+    assert changed == key_states == {'a': LetterState.CORRECT, 'b': LetterState.MISPLACED}
+
+    changed = update_key_states(key_states, {'a': LetterState.MISPLACED,
+                                             'b': LetterState.CORRECT,
+                                             'c': LetterState.INCORRECT})
+    assert changed == {'b': LetterState.CORRECT, 'c': LetterState.INCORRECT}
+    assert key_states['a'] == LetterState.CORRECT
+
+def test_lexicon_buckets_words_by_length():
+    lexicon = Lexicon(["help", "stop", "  knot\n", "", "hack", "crane"])
+
+    assert lexicon.sizes() == [4, 5]
+    assert list(lexicon.words(4)) == ["help", "stop", "knot", "hack"]
+    assert "knot" in lexicon and "crane" in lexicon
+    assert "fftz" not in lexicon and "" not in lexicon
+    assert lexicon.words(7) == ()
+
+def test_lexicon_load_uses_compiled_cache_until_source_changes(tmp_path):
+    source = tmp_path / "words.txt"
+    source.write_text("help\nstop\ncrane\n")
+
+    Lexicon.load(str(source))
+    assert cache_is_fresh(str(source), str(source) + CACHE_SUFFIX)
+
+    cached = Lexicon.from_cache(str(source) + CACHE_SUFFIX)
+    assert list(cached.words(4)) == ["help", "stop"]
+    assert "crane" in cached and "knot" not in cached
+
+    source.write_text("help\nstop\nknot\ncrane\n")
+    assert not cache_is_fresh(str(source), str(source) + CACHE_SUFFIX)
+    assert list(Lexicon.load(str(source)).words(4)) == ["help", "stop", "knot"]
+
+def test_models_share_one_lexicon_across_word_sizes():
+    four = WordyModel(4, 'long_wordlist.txt')
+    five = WordyModel(5, 'long_wordlist.txt')
+    assert four.lexicon is five.lexicon
+    assert four.word_list is four.lexicon.words(4)
+
+    four.set_word_size(5, preselected_word='crane')
+    assert four.word_list is five.word_list
+    assert four.check_guess('crane')[0]
+
+    with pytest.raises(RuntimeError):
+        four.set_word_size(40)
+
+def test_failed_set_word_size_leaves_the_model_unchanged():
+    model = WordyModel(4, 'long_wordlist.txt', preselected_word='help')
+    word_list = model.word_list
+
+    with pytest.raises(NotAWordError):
+        model.set_word_size(5, preselected_word='fftzz')
+    with pytest.raises(ValueError):
+        model.set_word_size(5, preselected_word='help')
+
+    assert model.word_size == 4 and model.word == 'help'
+    assert model.word_list is word_list
+    assert model.check_guess('help')[0]
+
+def test_shared_lexicon_reloads_changed_file(tmp_path):
+    source = tmp_path / "words.txt"
+    source.write_text("help\nstop\n")
+    lexicon = shared_lexicon(str(source))
+    assert shared_lexicon(str(source)) is lexicon
+
+    source.write_text("help\nstop\nknot\n")
+    os.utime(source, ns=(0, os.stat(source).st_mtime_ns + 10**9))
+    assert "knot" in shared_lexicon(str(source))
+
+def test_atomic_write_keeps_the_old_file_when_writing_fails(tmp_path):
+    target = tmp_path / "words.bin"
+    with atomic_write(str(target)) as f:
+        f.write(b"old")
+
+    with pytest.raises(RuntimeError):
+        with atomic_write(str(target)) as f:
+            f.write(b"new")
+            raise RuntimeError
+    assert target.read_bytes() == b"old"
+    assert os.listdir(tmp_path) == ["words.bin"]
+
+    with atomic_write(str(target), 'w') as f:
+        f.write("text")
+    assert target.read_text() == "text"
+
 
 if __name__ == "__main__":
     pytest.main()
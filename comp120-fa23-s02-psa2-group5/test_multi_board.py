@@ -0,0 +1,151 @@
+from dataclasses import replace
+
+import pytest
+
+from guess_log import BufferedGuessLog, NullGuessLog
+from lexicon import Lexicon
+from log_stats import analyze
+from models import LetterState, NotAWordError, score_guess
+from multi_board import MultiWordyModel
+from scoring import AnswerScorer, codes_to_states, encode_words
+from settings import load_settings
+from wordy import MultiWordyController
+
+C, M, I = LetterState.CORRECT, LetterState.MISPLACED, LetterState.INCORRECT
+
+
+def test_answer_scorer_matches_score_guess():
+    answers = ["sass", "stop", "mess", "help", "asks"]
+    scorer = AnswerScorer(encode_words(answers))
+
+    for guess in ["sass", "asss", "sins", "help", "knot"]:
+        codes = scorer.score(guess)
+        assert [codes_to_states(row) for row in codes] == \
+            [score_guess(guess, answer) for answer in answers], guess
+
+def test_check_guess_scores_every_board():
+    model = MultiWordyModel(4, 'long_wordlist.txt', 3, ["help", "stop", "knot"],
+                            guess_log=NullGuessLog())
+
+    correct, results, key_states = model.check_guess("shop")
+
+    assert correct == [False, False, False]
+    assert results == [score_guess("shop", word) for word in model.words]
+    # best over every board: the p is CORRECT for stop, the o for stop and knot
+    assert key_states == {"s": C, "h": M, "o": C, "p": C}
+
+def test_solved_boards_drop_out_of_the_keyboard_state():
+    model = MultiWordyModel(4, 'long_wordlist.txt', 2, ["help", "knot"],
+                            guess_log=NullGuessLog())
+
+    assert model.check_guess("help")[0] == [True, False]
+    assert model.solved == [True, False] and not model.all_solved
+
+    # only knot is still in play, so "help" shows nothing found
+    correct, results, key_states = model.check_guess("hemp")
+    assert results[1] == [I, I, I, I]
+    assert key_states == {"h": I, "e": I, "m": I, "p": I}
+
+    model.check_guess("knot")
+    assert model.all_solved
+
+def test_one_log_line_per_guess(tmp_path):
+    filename = tmp_path / "guess_log.csv"
+    guess_log = BufferedGuessLog(str(filename))
+    model = MultiWordyModel(4, 'long_wordlist.txt', 2, ["help", "knot"],
+                            guess_log=guess_log)
+
+    model.check_guess("hack")
+    with pytest.raises(NotAWordError):
+        model.check_guess("fftz")
+    guess_log.close()
+
+    assert filename.read_text() == "help+knot, hack\nhelp+knot, fftz\n"
+    summary = analyze(str(filename), Lexicon.load('long_wordlist.txt')).summary()
+    assert summary['multi_board_guesses'] == 2 and summary['games'] == 0
+
+
+class FakeView:
+    """ Records what the controller asks a WordyView to show. """
+
+    def __init__(self):
+        self.handlers = {}
+        self.board_results = []
+        self.solved = []
+        self.messages = []
+        self.over = False
+
+    def set_key_handler(self, key, handler):
+        self.handlers[key] = handler
+
+    def create_binding(self, event_type, action):
+        pass
+
+    def start_gui(self):
+        pass
+
+    def set_letter(self, letter, guess_num, letter_index):
+        pass
+
+    def show_dead_prefix(self, guess_num, dead):
+        pass
+
+    def display_board_results(self, guess_num, results, letter_states):
+        self.board_results.append((guess_num, results, letter_states))
+
+    def mark_board_solved(self, board):
+        self.solved.append(board)
+
+    def display_message(self, msg):
+        self.messages.append(msg)
+
+    def game_over(self):
+        self.over = True
+
+    def type(self, word):
+        for letter in word:
+            self.handlers[letter]()
+        self.handlers['enter']()
+
+
+def multi_controller(words, num_guesses):
+    settings = replace(load_settings(), word_size=4, num_guesses=num_guesses,
+                       num_boards=len(words))
+    model = MultiWordyModel(4, 'long_wordlist.txt', len(words), words,
+                            guess_log=NullGuessLog())
+    view = FakeView()
+    return MultiWordyController(view, model, settings), view
+
+def test_controller_plays_every_board_until_all_are_solved():
+    controller, view = multi_controller(["help", "stop", "knot"], 6)
+
+    view.type("stop")
+    guess_num, results, key_states = view.board_results[-1]
+    assert guess_num == 0 and sorted(results) == [0, 1, 2]
+    assert results[1] == [C, C, C, C]
+    assert view.solved == [1] and not view.over
+
+    # the solved board drops out of the results and the merged key colors
+    view.type("shop")
+    guess_num, results, key_states = view.board_results[-1]
+    assert guess_num == 1 and sorted(results) == [0, 2]
+    assert key_states == {'s': I, 'h': M, 'o': C, 'p': C}
+
+    view.type("help")
+    view.type("knot")
+    assert view.solved == [1, 0, 2]
+    assert view.over
+    assert view.messages[-1] == "Every board solved! Nice job. Game over."
+
+def test_controller_ends_the_game_when_guesses_run_out():
+    controller, view = multi_controller(["help", "stop", "knot"], 2)
+
+    view.type("shop")
+    # merged over every board: s and o from stop, p from help and stop
+    assert view.board_results[-1][2] == {'s': C, 'h': M, 'o': C, 'p': C}
+    assert not view.over
+
+    view.type("help")
+    assert view.solved == [0]
+    assert view.over
+    assert view.messages[-1] == "Guesses used up. Unsolved: stop, knot. Game over."
@@ -0,0 +1,100 @@
+import random
+
+import pytest
+
+from feedback_table import FeedbackTable, _remove_stale_tables, open_table
+from lexicon import Lexicon
+from models import WordyModel, pack_letter_states, score_guess
+from scoring import codes_to_states, decode_words, encode_words, score_matrix
+
+
+def test_score_matrix_matches_score_guess_with_repeated_letters():
+    words = ["sass", "asss", "ssas", "stop", "sins", "mess", "sits", "help"]
+    letters = encode_words(words)
+
+    feedback = score_matrix(letters, letters)
+
+    assert feedback.shape == (len(words), len(words), 4)
+    for g, guess in enumerate(words):
+        for a, answer in enumerate(words):
+            assert codes_to_states(feedback[g, a]) == score_guess(guess, answer), \
+                f"Wrong feedback for {guess} against {answer}"
+
+def test_score_matrix_matches_score_guess_on_word_list_sample():
+    words = list(Lexicon.load('long_wordlist.txt').words(5))
+    guesses = random.Random(120).sample(words, 200)
+
+    feedback = score_matrix(encode_words(guesses), encode_words(words))
+
+    for g, guess in enumerate(guesses):
+        for a in range(0, len(words), 37):
+            assert codes_to_states(feedback[g, a]) == score_guess(guess, words[a])
+
+def test_score_matrix_keeps_long_repeat_patterns_apart():
+    # with 32 letters, a number built from the repeat pattern wraps around
+    # and these two guesses (repeats at different positions) would collide
+    guess = "abcdefghijklmnopqrstuvwxyz" + "zzzzzz"
+    other = guess[:20] + "a" + guess[21:]
+    answers = [guess, other, "a" * 32, "bcdefghijklmnopqrstuvwxyza" + "yyyyyy"]
+
+    feedback = score_matrix(encode_words([guess, other]), encode_words(answers))
+
+    for g, word in enumerate([guess, other]):
+        for a, answer in enumerate(answers):
+            assert codes_to_states(feedback[g, a]) == score_guess(word, answer)
+
+def test_encode_words_round_trip_and_size_check():
+    assert decode_words(encode_words(["crane", "slate"])) == ["crane", "slate"]
+
+    with pytest.raises(ValueError):
+        encode_words(["crane", "help"])
+
+def test_feedback_table_is_built_once_and_rebuilt_when_words_change(tmp_path):
+    source = tmp_path / "words.txt"
+    source.write_text("help\nstop\nsits\nmess\nsins\n")
+
+    table = FeedbackTable.open(Lexicon.load(str(source)), 4, processes=1)
+    words = list(table.words)
+    for guess in words:
+        for answer in words:
+            assert table.lookup(guess, answer) == \
+                pack_letter_states(score_guess(guess, answer))
+
+    source.write_text("help\nstop\nsits\nmess\nsins\nknot\n")
+    lexicon = Lexicon.load(str(source))
+    table = FeedbackTable.open(lexicon, 4, processes=1)
+
+    assert table.codes.shape == (6, 6)
+    assert table.lookup("knot", "stop") == \
+        pack_letter_states(score_guess("knot", "stop"))
+    assert len(list(tmp_path.glob("*.npy"))) == 1
+
+def test_stale_table_cleanup_keeps_tables_being_built(tmp_path):
+    old = tmp_path / "words.txt.feedback4-0000.npy"
+    building = tmp_path / "words.txt.feedback4-2222.npy.123.tmp.npy"
+    current = tmp_path / "words.txt.feedback4-1111.npy"
+    for path in (old, building, current):
+        path.write_bytes(b"")
+
+    _remove_stale_tables(str(current))
+
+    assert not old.exists() and building.exists() and current.exists()
+
+def test_open_table_falls_back_to_scoring_on_the_fly(tmp_path):
+    assert open_table(Lexicon(["help", "stop"]), 4) is None
+
+    source = tmp_path / "words.txt"
+    source.write_text("help\nstop\nsits\n")
+    table = open_table(Lexicon.load(str(source)), 4, processes=1)
+    assert table is not None and table.lookup("stop", "sits") == \
+        pack_letter_states(score_guess("stop", "sits"))
+
+def test_check_guess_with_feedback_table(tmp_path):
+    source = tmp_path / "words.txt"
+    source.write_text("help\nstop\nsits\nmess\nsins\n")
+
+    model = WordyModel(4, str(source), preselected_word="sits")
+    expected = model.check_guess("mess")
+    model.use_feedback_table(FeedbackTable.open(model.lexicon, 4, processes=1))
+
+    assert model.check_guess("mess") == expected
@@ -0,0 +1,102 @@
+import asyncio
+
+from guess_log import NullGuessLog
+from lexicon import Lexicon
+from loadgen import Connection, run
+from server import GameStore, WordyServer
+from session import GameRules, GameSession
+
+
+def serve(test):
+    """ Runs <test>(connection, server) against a server on a free port. """
+    async def main():
+        server = WordyServer(Lexicon.load('long_wordlist.txt'), num_guesses=2,
+                             default_word_size=4, guess_log=NullGuessLog())
+        port = await server.start('127.0.0.1', 0)
+        connection = Connection('127.0.0.1', port)
+        try:
+            await test(connection, server, port)
+        finally:
+            await connection.close()
+            await server.close()
+
+    asyncio.run(main())
+
+def test_play_a_game_over_http():
+    async def test(connection, server, port):
+        status, game = await connection.request('POST', '/games')
+        assert status == 201
+        assert game['word_size'] == 4 and game['status'] == 'in_progress'
+
+        session = server.games.get(game['id'])
+        session.answer = "help"
+        path = f"/games/{game['id']}/guesses"
+
+        status, result = await connection.request('POST', path, {'guess': 'fftz'})
+        assert status == 422
+
+        status, result = await connection.request('POST', path, {'guess': 'peat'})
+        assert status == 200
+        assert result['letters'] == ['misplaced', 'correct', 'incorrect', 'incorrect']
+        assert result['keys']['e'] == 'correct'
+
+        status, result = await connection.request('POST', path, {'guess': 'knot'})
+        assert result['status'] == 'lost' and result['answer'] == 'help'
+
+        status, result = await connection.request('POST', path, {'guess': 'help'})
+        assert status == 409
+
+        status, result = await connection.request('GET', f"/games/{game['id']}")
+        assert [h['guess'] for h in result['history']] == ['peat', 'knot']
+
+    serve(test)
+
+def test_bad_requests():
+    async def test(connection, server, port):
+        assert (await connection.request('GET', '/games/nope'))[0] == 404
+        assert (await connection.request('POST', '/games', {'word_size': 40}))[0] == 400
+        assert (await connection.request('GET', '/games'))[0] == 405
+
+    serve(test)
+
+def test_over_long_request_heads_are_refused():
+    async def send(port, head):
+        reader, writer = await asyncio.open_connection('127.0.0.1', port)
+        writer.write(head)
+        await writer.drain()
+        response = await reader.read()  # the server closes the connection
+        writer.close()
+        return response.split(b'\r\n', 1)[0]
+
+    async def test(connection, server, port):
+        long_path = b'/games/' + b'x' * 20000
+        assert await send(port, b'GET ' + long_path + b' HTTP/1.1\r\n\r\n') == \
+            b'HTTP/1.1 400 Bad Request'
+        assert await send(port, b'GET /games HTTP/1.1\r\nX-Big: ' + b'y' * 20000
+                          + b'\r\n\r\n') == b'HTTP/1.1 431 Request Header Fields Too Large'
+        many = b''.join(b'X-%d: 1\r\n' % i for i in range(200))
+        assert (await send(port, b'GET /games HTTP/1.1\r\n' + many + b'\r\n')).startswith(
+            b'HTTP/1.1 431')
+
+        # the server is still serving
+        assert (await connection.request('GET', '/games/nope'))[0] == 404
+
+    serve(test)
+
+def test_load_generator_runs_against_server():
+    async def test(connection, server, port):
+        words = list(server.lexicon.words(4))
+        summary = await run('127.0.0.1', port, words, 4, clients=4, seconds=0.3)
+        assert summary['guesses'] > 0
+
+    serve(test)
+
+def test_idle_games_are_evicted():
+    rules = GameRules(Lexicon.load('long_wordlist.txt'), 4, 6, NullGuessLog())
+    store = GameStore(idle_timeout=10)
+    old = store.add(GameSession(rules))
+    new = store.add(GameSession(rules))
+    store._last_used[old] -= 60
+
+    assert store.evict_idle() == 1
+    assert len(store) == 1 and store.get(new)
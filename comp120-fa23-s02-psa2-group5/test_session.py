@@ -0,0 +1,70 @@
+import pytest
+
+from guess_log import NullGuessLog
+from lexicon import Lexicon
+from models import LetterState, NotAWordError
+from session import (GameOverError, GameRules, GameSession, GameStatus,
+                     WordNotFinishedError)
+
+
+@pytest.fixture
+def rules():
+    return GameRules(Lexicon.load('long_wordlist.txt'), 4, 3, NullGuessLog())
+
+
+def type_word(session, word):
+    for letter in word:
+        session.type_letter(letter)
+
+def test_typing_is_limited_to_word_size(rules):
+    session = GameSession(rules, "help")
+
+    type_word(session, "hackz")
+    assert session.current_guess == "hack"
+
+    assert session.backspace() and session.backspace()
+    assert session.current_guess == "ha"
+
+    with pytest.raises(WordNotFinishedError):
+        session.submit()
+
+def test_invalid_guess_keeps_letters_and_uses_no_guess(rules):
+    session = GameSession(rules, "help")
+    type_word(session, "fftz")
+
+    with pytest.raises(NotAWordError):
+        session.submit()
+
+    assert session.current_guess == "fftz"
+    assert session.guess_num == 0
+
+def test_win_ends_the_game(rules):
+    session = GameSession(rules, "help")
+    type_word(session, "peat")
+
+    is_correct, letter_states, _ = session.submit()
+    assert not is_correct
+    assert letter_states[1] == LetterState.CORRECT
+
+    assert session.guess("help")[0]
+    assert session.status == GameStatus.WON
+    assert [guess for guess, _ in session.history] == ["peat", "help"]
+    assert not session.type_letter("a")
+
+    with pytest.raises(GameOverError):
+        session.submit()
+
+def test_running_out_of_guesses_loses(rules):
+    session = GameSession(rules, "help")
+
+    for word in ["knot", "cash", "stop"]:
+        session.guess(word)
+
+    assert session.status == GameStatus.LOST
+
+def test_sessions_are_slotted(rules):
+    session = GameSession(rules)
+
+    assert session.answer in rules.words
+    with pytest.raises(AttributeError):
+        session.extra = 1
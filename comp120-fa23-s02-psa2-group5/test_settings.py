@@ -0,0 +1,49 @@
+import dataclasses
+import json
+
+import pytest
+
+from settings import SettingsError, load_settings, parse_settings
+
+
+def settings_data():
+    with open('settings.json', 'r') as settings_file:
+        return json.load(settings_file)
+
+
+def test_load_settings_gives_typed_attributes():
+    settings = load_settings()
+
+    assert settings.word_size == 5
+    assert settings.ui.guesses.letter_box_size == 50
+    assert isinstance(settings.ui.guesses.process_wait_time, float)
+    assert settings.ui.keyboard.key_layout[2][0] == "ENTER"
+    assert not hasattr(settings, '__dict__'), "settings should use __slots__"
+
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        settings.word_size = 4
+
+    smaller = dataclasses.replace(settings, word_size=3)
+    assert smaller.word_size == 3 and smaller.ui is settings.ui
+
+@pytest.mark.parametrize("change, message", [
+    (lambda data: data['ui']['guesses'].pop('letter_box_size'),
+     "ui.guesses.letter_box_size: missing"),
+    (lambda data: data['ui'].update(font_famly="ariel"),
+     "ui.font_famly: unknown setting"),
+    (lambda data: data['ui']['messages'].update(font_size="20"),
+     "ui.messages.font_size: expected int, got str"),
+    (lambda data: data.update(num_guesses=True),
+     "num_guesses: expected int, got bool"),
+    (lambda data: data['ui']['guesses'].update(renderer="svg"),
+     "ui.guesses.renderer: must be one of frames, canvas"),
+    (lambda data: data.update(word_size=0),
+     "word_size: must be positive, got 0"),
+])
+def test_invalid_settings_fail_with_their_path(change, message):
+    data = settings_data()
+    change(data)
+
+    with pytest.raises(SettingsError) as e:
+        parse_settings(data)
+    assert str(e.value) == message
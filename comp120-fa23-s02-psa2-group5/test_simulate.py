@@ -0,0 +1,23 @@
+from simulate import simulate, summarize
+
+
+def test_simulate_plays_each_answer_once():
+    results = list(simulate('long_wordlist.txt', 4, 6, 'first', processes=1, limit=300))
+
+    answers = [answer for answer, _ in results]
+    assert len(answers) == 300 and len(set(answers)) == len(answers)
+    assert all(0 <= used <= 6 for _, used in results)
+
+def test_simulate_across_processes_matches_single_process():
+    single = sorted(simulate('long_wordlist.txt', 4, 6, 'entropy', processes=1, limit=600))
+    pooled = sorted(simulate('long_wordlist.txt', 4, 6, 'entropy', processes=2, limit=600))
+
+    assert pooled == single
+
+def test_summarize():
+    summary = summarize([3, 4, 0, 3], seconds=2.0)
+
+    assert summary['distribution'] == {3: 2, 4: 1}
+    assert summary['failure_rate'] == 0.25
+    assert summary['mean_guesses'] == 10 / 3
+    assert summary['games_per_sec'] == 2.0
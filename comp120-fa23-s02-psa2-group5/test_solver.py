@@ -0,0 +1,64 @@
+from lexicon import Lexicon
+from models import pack_letter_states, score_guess
+from solver import Solver
+
+WORDS = ["help", "hemp", "held", "hold", "stop", "shop", "sits", "mess", "knot"]
+
+
+def play(solver, answer):
+    history = []
+    while not history or history[-1][0] != answer:
+        guess = solver.rank(history, k=1)[0][0]
+        history.append((guess, score_guess(guess, answer)))
+    return history
+
+def test_candidates_are_consistent_with_history():
+    solver = Solver(Lexicon(WORDS), 4, processes=1)
+    history = [("knot", score_guess("knot", "help"))]
+
+    remaining = [solver.words[i] for i in solver.candidates(history)]
+
+    assert remaining == ["help", "hemp", "held", "mess"]
+    assert list(solver.candidates([("knot", pack_letter_states(history[0][1]))])) == \
+        list(solver.candidates(history))
+
+def test_rank_orders_guesses_by_information_gain():
+    solver = Solver(Lexicon(WORDS), 4, processes=1)
+
+    ranked = solver.rank([], k=len(WORDS))
+
+    bits = [b for _, b in ranked]
+    assert bits == sorted(bits, reverse=True)
+    assert sorted(word for word, _ in ranked) == sorted(WORDS)
+
+def test_solver_finds_every_answer():
+    solver = Solver(Lexicon(WORDS), 4, processes=1)
+
+    for answer in WORDS:
+        assert len(play(solver, answer)) <= 4
+
+def test_rank_guesses_only_ranks_the_given_guesses():
+    solver = Solver(Lexicon(WORDS), 4, processes=1)
+    remaining = solver.candidates([("knot", score_guess("knot", "help"))])
+
+    ranked = solver.rank_guesses(remaining, guesses=remaining, k=len(WORDS))
+    everything = dict(solver.rank_guesses(remaining, k=len(WORDS)))
+
+    assert sorted(word for word, _ in ranked) == ["held", "help", "hemp", "mess"]
+    for word, bits in ranked:
+        assert abs(bits - everything[word]) < 1e-9
+
+def test_max_pairs_ranks_the_best_openers_and_the_remaining_answers():
+    lexicon = Lexicon.load('long_wordlist.txt')
+    capped = Solver(lexicon, 5, processes=1, max_pairs=50_000)
+    full = Solver(lexicon, 5, processes=1)
+    history = [("fuzzy", score_guess("fuzzy", "stamp"))]
+    remaining = capped.candidates(history)
+
+    count = 50_000 // len(remaining)
+    ranked = capped.rank(history, k=len(capped.words), remaining=remaining)
+    openers = {word for word, _ in full.rank([], k=count)}
+
+    assert len(ranked) == count
+    assert {word for word, _ in ranked} == openers
+    assert ranked[0] in full.rank(history, k=len(full.words), remaining=remaining)
@@ -0,0 +1,250 @@
+import string
+from dataclasses import replace
+
+import views
+from models import LetterState
+from settings import load_settings
+from views import (KeyboardFrame, RevealScheduler, StyleRegistry, board_layout,
+                   multi_board_layouts)
+
+
+class FakeWidget:
+    """ Stands in for a Tk widget: after() callbacks run when the test
+    advances the clock. """
+
+    def __init__(self):
+        self.now = 0.0
+        self.pending = {}
+        self.next_id = 0
+
+    def after(self, ms, callback):
+        self.next_id += 1
+        self.pending[str(self.next_id)] = (self.now + ms / 1000, callback)
+        return str(self.next_id)
+
+    def after_cancel(self, after_id):
+        del self.pending[after_id]
+
+    def advance(self, seconds):
+        """ Moves the clock forward, running the callbacks that come due. """
+        end = self.now + seconds
+        while self.pending:
+            after_id, (due, callback) = min(self.pending.items(), key=lambda item: item[1][0])
+            if due > end:
+                break
+            del self.pending[after_id]
+            self.now = due
+            callback()
+        self.now = end
+
+
+def test_reveal_runs_updates_in_order_over_time():
+    widget = FakeWidget()
+    reveals = RevealScheduler(widget, clock=lambda: widget.now)
+    done = []
+
+    reveals.schedule([lambda i=i: done.append(i) for i in range(3)], 1.0)
+    reveals.then(lambda: done.append('keys'))
+    assert reveals.busy
+
+    widget.advance(0.5)
+    assert done == [0]
+    widget.advance(1.0)
+    assert done == [0, 1]
+    widget.advance(1.0)
+    assert done == [0, 1, 2, 'keys']
+    assert not reveals.busy
+
+
+def test_reveal_coalesces_updates_due_together():
+    widget = FakeWidget()
+    reveals = RevealScheduler(widget, clock=lambda: widget.now)
+    done = []
+
+    reveals.schedule([lambda i=i: done.append(i) for i in range(5)], 0)
+    assert len(widget.pending) == 1
+
+    widget.advance(0)
+    assert done == [0, 1, 2, 3, 4]
+    assert not widget.pending
+
+
+def test_reveal_cancel_and_finish():
+    widget = FakeWidget()
+    reveals = RevealScheduler(widget, clock=lambda: widget.now)
+    done = []
+
+    reveals.schedule([lambda i=i: done.append(i) for i in range(3)], 1.0)
+    reveals.cancel()
+    widget.advance(5)
+    assert done == [] and not reveals.busy and not widget.pending
+
+    reveals.schedule([lambda i=i: done.append(i) for i in range(3)], 1.0)
+    reveals.finish()
+    assert done == [0, 1, 2] and not widget.pending
+
+
+def test_board_layout_centers_the_configured_boxes():
+    settings = load_settings()
+    guesses = settings.ui.guesses
+    layout = board_layout(settings, settings.ui.window_width, guesses.frame_height)
+
+    assert layout.box == guesses.letter_box_size
+    assert layout.font_size == guesses.letter_font_size
+    x0, y0, x1, y1 = layout.cell_box(0, 0)
+    right = layout.cell_box(settings.num_guesses - 1, settings.word_size - 1)
+    # same margin on both sides (to within a pixel of rounding)
+    assert abs(x0 - (settings.ui.window_width - right[2])) <= 1
+    assert abs(y0 - (guesses.frame_height - right[3])) <= 1
+    assert layout.cell_box(1, 2)[:2] == (x0 + 2 * (layout.box + layout.padding),
+                                         y0 + layout.box + layout.padding)
+
+
+def test_board_layout_shrinks_boxes_that_would_not_fit():
+    settings = replace(load_settings(), word_size=12, num_guesses=10)
+    guesses = settings.ui.guesses
+    layout = board_layout(settings, settings.ui.window_width, guesses.frame_height)
+
+    assert layout.box < guesses.letter_box_size
+    assert layout.font_size < guesses.letter_font_size
+    first = layout.cell_box(0, 0)
+    last = layout.cell_box(9, 11)
+    assert first[0] >= 0 and first[1] >= 0
+    assert last[2] <= settings.ui.window_width and last[3] <= guesses.frame_height
+
+
+def test_multi_board_layouts_fit_side_by_side_without_overlap():
+    settings = replace(load_settings(), num_boards=6)
+    guesses = settings.ui.guesses
+    layouts = multi_board_layouts(settings, 4)
+
+    assert len(layouts) == 6
+    assert len({(layout.box, layout.font_size) for layout in layouts}) == 1
+    extents = [(layout.cell_box(0, 0)[:2],
+                layout.cell_box(settings.num_guesses - 1, settings.word_size - 1)[2:])
+               for layout in layouts]
+    for (x0, y0), (x1, y1) in extents:
+        assert 0 <= x0 < x1 <= settings.ui.window_width
+        assert 0 <= y0 < y1 <= guesses.frame_height
+    # 4 boards on the first row, 2 below them
+    assert [top_left[1] for top_left, _ in extents[:4]] == [extents[0][0][1]] * 4
+    assert extents[4][0][1] > extents[0][1][1]
+    for (a0, a1), (b0, b1) in zip(extents[:3], extents[1:4]):
+        assert a1[0] < b0[0]
+
+
+class FakeFont:
+    created = []
+
+    def __init__(self, **options):
+        self.options = options
+        FakeFont.created.append(options)
+
+
+class FakeRoot:
+    def _root(self):
+        return self
+
+
+class FakeChild:
+    def __init__(self, root):
+        self.root = root
+
+    def _root(self):
+        return self.root
+
+
+def test_style_registry_looks_colors_up_from_settings():
+    settings = load_settings()
+    ui = settings.ui
+    styles = StyleRegistry(settings)
+
+    assert styles.letter_colors[LetterState.CORRECT] == \
+        (ui.correct_color, ui.guesses.updated_text_color)
+    assert styles.letter_colors[LetterState.MISPLACED][0] == ui.misplaced_color
+    assert styles.key_colors[LetterState.INCORRECT] == ui.incorrect_color
+
+
+def test_style_registry_is_shared_per_window_and_caches_fonts(monkeypatch):
+    monkeypatch.setattr(views.font, 'Font', FakeFont)
+    FakeFont.created = []
+    settings = load_settings()
+    root, other_root = FakeRoot(), FakeRoot()
+
+    styles = StyleRegistry.shared(FakeChild(root), settings)
+    assert StyleRegistry.shared(root, settings) is styles
+    assert StyleRegistry.shared(other_root, settings) is not styles
+
+    assert styles.font(20) is styles.font(20)
+    assert styles.font() is not styles.font(20)
+    assert FakeFont.created == [{'family': settings.ui.font_family, 'size': 20},
+                                {'family': settings.ui.font_family}]
+
+
+class FakeButton:
+    def __init__(self):
+        self.configured = []
+
+    def configure(self, **options):
+        self.configured.append(options)
+
+
+def fake_keyboard(settings):
+    """ A KeyboardFrame with fake buttons, built without Tk; after_idle
+    callbacks are collected in keyboard.idle. """
+    keyboard = KeyboardFrame.__new__(KeyboardFrame)
+    keyboard.settings = settings
+    keyboard.styles = StyleRegistry(settings)
+    keyboard.keyboard_buttons = {letter: FakeButton() for letter in string.ascii_lowercase}
+    keyboard.key_states = {}
+    keyboard._pending_colors = {}
+    keyboard._shown_colors = {}
+    keyboard._flush_id = None
+    keyboard.idle = []
+    keyboard.after_idle = lambda callback: keyboard.idle.append(callback) or 'idle'
+    return keyboard
+
+
+def run_idle(keyboard):
+    callbacks, keyboard.idle = keyboard.idle, []
+    for callback in callbacks:
+        callback()
+
+
+def test_key_colors_only_reconfigure_changed_keys():
+    settings = load_settings()
+    ui = settings.ui
+    keyboard = fake_keyboard(settings)
+    buttons = keyboard.keyboard_buttons
+
+    keyboard.set_key_colors({'a': LetterState.MISPLACED, 'b': LetterState.CORRECT})
+    keyboard.set_key_colors({'c': LetterState.MISPLACED})
+    assert len(keyboard.idle) == 1  # one flush for both updates
+    run_idle(keyboard)
+    assert buttons['a'].configured == [{'fg': ui.misplaced_color}]
+    assert buttons['b'].configured == [{'fg': ui.correct_color}]
+
+    # same states again, or worse ones: nothing to do
+    keyboard.set_key_colors({'a': LetterState.MISPLACED, 'b': LetterState.INCORRECT})
+    assert keyboard.idle == []
+
+    keyboard.set_key_colors({'a': LetterState.CORRECT, 'b': LetterState.CORRECT,
+                             'd': LetterState.MISPLACED})
+    run_idle(keyboard)
+    assert buttons['a'].configured == [{'fg': ui.misplaced_color}, {'fg': ui.correct_color}]
+    assert len(buttons['b'].configured) == 1
+    assert buttons['d'].configured == [{'fg': ui.misplaced_color}]
+    assert all(not buttons[letter].configured for letter in 'efghijklmnopqrstuvwxyz')
+
+
+def test_key_colors_skip_keys_already_showing_the_color():
+    settings = load_settings()
+    keyboard_settings = replace(settings.ui.keyboard, text_color=settings.ui.incorrect_color)
+    settings = replace(settings, ui=replace(settings.ui, keyboard=keyboard_settings))
+    keyboard = fake_keyboard(settings)
+
+    keyboard.set_key_colors({'a': LetterState.INCORRECT, 'b': LetterState.CORRECT})
+    run_idle(keyboard)
+
+    assert keyboard.keyboard_buttons['a'].configured == []
+    assert keyboard.keyboard_buttons['b'].configured == [{'fg': settings.ui.correct_color}]
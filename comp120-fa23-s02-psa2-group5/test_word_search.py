@@ -0,0 +1,37 @@
+import pytest
+
+from lexicon import Lexicon
+from word_search import count_matches, parse_query, search
+
+WORDS = ["help", "hemp", "held", "hold", "hilt", "stop", "shop", "sits", "seem", "knot"]
+
+
+def test_positions_sets_and_wildcards():
+    lexicon = Lexicon(WORDS)
+
+    assert search(lexicon, "h?l?") == ["help", "held", "hold", "hilt"]
+    assert search(lexicon, "h[eo]l?") == ["help", "held", "hold"]
+    assert search(lexicon, "[^h]..p") == ["stop", "shop"]
+    assert search(lexicon, "h???", limit=2) == ["help", "hemp"]
+    assert search(lexicon, "x???") == []
+
+def test_include_and_exclude():
+    lexicon = Lexicon(WORDS)
+
+    assert search(lexicon, "????", include="p", exclude="e") == ["stop", "shop"]
+    assert search(lexicon, "s???", include="ee") == ["seem"]
+    assert count_matches(lexicon, "?e??", exclude="m") == 2
+
+def test_matches_scanning_the_word_list():
+    lexicon = Lexicon.load('long_wordlist.txt')
+    words = lexicon.words(7)
+
+    expected = [word for word in words
+                if word[1] == 'e' and word[3] in 'st' and 'a' not in word]
+    assert search(lexicon, "?e?[st]???", exclude="a") == expected
+
+def test_bad_patterns():
+    assert parse_query("[^aeiou]?").positions == (("aeiou", True), ("", True))
+    for pattern in ("h[el", "h[]l", "h-l"):
+        with pytest.raises(ValueError):
+            parse_query(pattern)
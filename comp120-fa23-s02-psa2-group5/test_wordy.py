@@ -0,0 +1,113 @@
+import time
+from dataclasses import replace
+
+from guess_log import NullGuessLog
+from models import LetterState, WordyModel, score_guess
+from settings import load_settings
+from wordy import WordyController
+
+C = LetterState.CORRECT
+
+
+class FakeView:
+    """ Records what the controller asks a WordyView to show; after()
+    callbacks run when the test calls run_pending. """
+
+    def __init__(self):
+        self.handlers = {}
+        self.results = []
+        self.messages = []
+        self.pending = []
+        self.over = False
+
+    def set_key_handler(self, key, handler):
+        self.handlers[key] = handler
+
+    def create_binding(self, event_type, action):
+        self.handlers[event_type] = action
+
+    def start_gui(self):
+        pass
+
+    def set_letter(self, letter, guess_num, letter_index):
+        pass
+
+    def show_dead_prefix(self, guess_num, dead):
+        pass
+
+    def after(self, ms, callback):
+        self.pending.append(callback)
+
+    def display_guess_result(self, guess_num, guess_results, letter_states):
+        self.results.append((guess_num, guess_results, letter_states))
+
+    def display_message(self, msg):
+        self.messages.append(msg)
+
+    def game_over(self):
+        self.over = True
+
+    def type(self, word):
+        for letter in word:
+            self.handlers[letter]()
+        self.handlers['enter']()
+
+    def run_pending(self, timeout=30.0):
+        """ Runs after() callbacks (as the Tk loop would) until none are left. """
+        end = time.monotonic() + timeout
+        while self.pending and time.monotonic() < end:
+            callbacks, self.pending = self.pending, []
+            for callback in callbacks:
+                callback()
+            time.sleep(0.01)
+        assert not self.pending, "after() callbacks still pending"
+
+
+def controller_for(answer, num_guesses=6):
+    settings = replace(load_settings(), word_size=len(answer), num_guesses=num_guesses)
+    model = WordyModel(len(answer), 'long_wordlist.txt', answer, guess_log=NullGuessLog())
+    view = FakeView()
+    return WordyController(view, model, settings), view
+
+
+def test_correct_guess_ends_the_game():
+    controller, view = controller_for("help")
+
+    view.type("hel")
+    assert view.messages == ["Word not finished!"] and view.results == []
+    view.handlers['p']()
+    view.handlers['enter']()
+
+    assert view.results == [(0, score_guess("help", "help"),
+                             {'h': C, 'e': C, 'l': C, 'p': C})]
+    assert view.messages[-1] == "Correct! Nice job. Game over."
+    assert view.over
+
+def test_running_out_of_guesses_ends_the_game():
+    controller, view = controller_for("help", num_guesses=2)
+
+    view.type("qzxv")
+    assert view.messages[-1] == "qzxv is not a valid word."
+    for _ in range(4):
+        view.handlers['back']()
+
+    view.type("knot")
+    assert not view.over and controller.current_guess_num == 1
+    view.type("stop")
+
+    assert [guess_num for guess_num, _, _ in view.results] == [0, 1]
+    assert view.messages[-1] == "Guesses used up. Word was help. Game over."
+    assert view.over
+
+
+def test_hint_is_ranked_off_the_tk_thread():
+    controller, view = controller_for("help")
+    view.type("knot")
+
+    view.handlers['Control-H'](None)
+    assert view.messages[-1] == 'Hint: thinking...'
+    view.run_pending()
+
+    assert view.messages[-1].startswith('Hint: try ')
+    best_guess = view.messages[-1].split()[2]
+    assert controller.solver.rank(controller.guess_history, k=1)[0][0] == best_guess
@@ -1,48 +1,187 @@
-from typing import Union, Callable
+from collections import deque
+from dataclasses import dataclass, replace
+from typing import Optional, Sequence, Union, Callable
 import string
 import time
+import weakref
 import tkinter as tk
 import tkinter.font as font
-from models import LetterState
+import metrics
+from models import LetterState, update_key_states
+from settings import Settings
+
+
+class StyleRegistry:
+    """ The fonts and colors shared by every widget in one Tk window.
+
+    Each (family, size) font is created once, and the colors for each
+    LetterState are looked up in the settings once, up front.
+    """
+
+    # instance variables
+    settings: Settings  # all the settings (see settings.py)
+    # LetterState -> (background, text color) of a scored guess letter
+    letter_colors: dict[LetterState, tuple[str, str]]
+    key_colors: dict[LetterState, str]  # LetterState -> keyboard text color
+    _fonts: dict[tuple[str, Optional[int]], font.Font]
+
+    _registries: "weakref.WeakKeyDictionary[tk.Misc, StyleRegistry]" = \
+        weakref.WeakKeyDictionary()
+
+    def __init__(self, settings: Settings) -> None:
+        self.settings = settings
+        self._fonts = {}
+
+        ui = settings.ui
+        colors = {LetterState.INCORRECT: ui.incorrect_color,
+                  LetterState.MISPLACED: ui.misplaced_color,
+                  LetterState.CORRECT: ui.correct_color}
+
+        self.letter_colors = {state: (color, ui.guesses.updated_text_color)
+                              for state, color in colors.items()}
+        self.key_colors = colors
+
+    @classmethod
+    def shared(cls, widget: tk.Misc, settings: Settings) -> "StyleRegistry":
+        """ Returns the registry of the window <widget> is in, creating it
+        (from <settings>) the first time. """
+        root = widget._root()
+        if root not in cls._registries:
+            cls._registries[root] = cls(settings)
+        return cls._registries[root]
+
+    def font(self, size: Optional[int] = None) -> font.Font:
+        """ Returns the font of the configured family in the given size
+        (or the default size), creating it the first time it is used. """
+        key = (self.settings.ui.font_family, size)
+        if key not in self._fonts:
+            if size is None:
+                self._fonts[key] = font.Font(family=key[0])
+            else:
+                self._fonts[key] = font.Font(family=key[0], size=size)
+        return self._fonts[key]
+
+
+class RevealScheduler:
+    """ Runs queued UI updates at set times using the widget's after()
+    timers, so animations never block the Tk event loop.
+
+    Updates that come due within the same frame (about 16 ms) are applied in
+    a single callback. Updates queued while others are still pending run
+    after them, and everything pending can be cancelled (or finished right
+    away).
+    """
+
+    FRAME_TIME = 0.016  # seconds; updates due this close together share a callback
+
+    # instance variables
+    widget: tk.Misc  # the widget whose after() timers are used
+    clock: Callable[[], float]  # current time, in seconds
+    _queue: "deque[tuple[float, Callable[[], None]]]"  # (due time, update), soonest first
+    _after_id: Optional[str]  # the pending after() callback, if any
+
+    def __init__(self, widget: tk.Misc, clock: Callable[[], float] = time.monotonic) -> None:
+        self.widget = widget
+        self.clock = clock
+        self._queue = deque()
+        self._after_id = None
+
+    @property
+    def busy(self) -> bool:
+        """ Whether any updates are still waiting to run. """
+        return bool(self._queue)
+
+    def schedule(self, updates: Sequence[Callable[[], None]], interval: float) -> None:
+        """ Queues <updates> to run <interval> seconds apart, the first one as
+        soon as everything already queued has run.
+
+        Parameters:
+            updates: (Sequence[Callable[[], None]]) The updates, in order.
+            interval: (float) Seconds between consecutive updates.
+        """
+        start = self.clock()
+        if self._queue:
+            start = max(start, self._queue[-1][0] + interval)
+
+        for i, update in enumerate(updates):
+            self._queue.append((start + i * interval, update))
+        self._wake()
+
+    def then(self, callback: Callable[[], None]) -> None:
+        """ Runs <callback> right after the last queued update. """
+        due = self._queue[-1][0] if self._queue else self.clock()
+        self._queue.append((due, callback))
+        self._wake()
+
+    def cancel(self) -> None:
+        """ Drops every pending update. """
+        if self._after_id is not None:
+            self.widget.after_cancel(self._after_id)
+            self._after_id = None
+        self._queue.clear()
+
+    def finish(self) -> None:
+        """ Runs every pending update immediately. """
+        if self._after_id is not None:
+            self.widget.after_cancel(self._after_id)
+            self._after_id = None
+        while self._queue:
+            self._queue.popleft()[1]()
+
+    def _wake(self) -> None:
+        """ Makes sure a callback is scheduled for the soonest update. """
+        if self._after_id is None and self._queue:
+            wait = max(0.0, self._queue[0][0] - self.clock())
+            self._after_id = self.widget.after(int(wait * 1000), self._run_due)
+
+    def _run_due(self) -> None:
+        """ Runs every update due by the end of this frame. """
+        self._after_id = None
+        cutoff = self.clock() + self.FRAME_TIME
+        with metrics.timer('wordy_view_reveal_frame_seconds'):
+            while self._queue and self._queue[0][0] <= cutoff:
+                self._queue.popleft()[1]()
+        self._wake()
 
 
 class GuessLetter(tk.Frame):
 
     # instance variables
-    settings: dict  # the dictionary with all the UI settings
+    settings: Settings  # all the settings (see settings.py)
+    styles: StyleRegistry  # fonts and colors shared with the rest of the window
     label: tk.Label  # the label containing the text for this frame
 
-    def __init__(self, parent: Union[tk.Tk, tk.Frame], row: int, col: int, settings: dict) -> None:
+    def __init__(self, parent: Union[tk.Tk, tk.Frame], row: int, col: int, settings: Settings,
+                 styles: Optional[StyleRegistry] = None) -> None:
         super().__init__(parent)
 
         self.settings = settings
+        self.styles = styles or StyleRegistry.shared(self, settings)
 
-        self['width'] = settings['ui']['guesses']['letter_box_size']
-        self['height'] = settings['ui']['guesses']['letter_box_size']
+        self['width'] = settings.ui.guesses.letter_box_size
+        self['height'] = settings.ui.guesses.letter_box_size
 
         #set bg of this frame (self) using the initial_bg_color in the settings
 
-        self['bg'] = settings['ui']['guesses']['initial_bg_color']
+        self['bg'] = settings.ui.guesses.initial_bg_color
 
         # Use grid to set the location of this key to be row and column.
         # Use the padx and pady parameters to grid to provide spacing between
         # letters (both sides and top/bottom), based on the letter_padding
         # given in the settings
 
-        self.grid(row=row, column=col, padx=settings['ui']['guesses']['letter_padding'],
-                  pady=settings['ui']['guesses']['letter_padding'])
+        self.grid(row=row, column=col, padx=settings.ui.guesses.letter_padding,
+                  pady=settings.ui.guesses.letter_padding)
 
         self.grid_propagate(False)
 
-        f = font.Font(family=settings['ui']['font_family'])
-
         # Create the label, setting the bg to initial_bg_color and fg to
-        # initial_text_color in settings. Set the font parameter to a tuple of
-        # f and the letter_font_size. Replace this with a tk.Label
+        # initial_text_color in settings, using the shared font of the
+        # letter_font_size
         self.label = tk.Label(
-            self, bg=settings['ui']['guesses']['initial_bg_color'],
-            fg=settings['ui']['guesses']['initial_text_color'],
-            font=(f, settings['ui']['guesses']['letter_font_size']))
+            self, bg=settings.ui.guesses.initial_bg_color,
+            fg=settings.ui.guesses.initial_text_color,
+            font=self.styles.font(settings.ui.guesses.letter_font_size))
 
         # don't change anything below here
         self.label.grid(row=1, column=1, sticky='ewns')
@@ -71,41 +210,32 @@ class GuessLetter(tk.Frame):
         Parameters:
             state (LetterState): The state used to determine the color of the background and foreground (text)
         """
-        # Set the text/foreground color of the label based on settings
-        self.label['fg'] = self.settings['ui']['guesses']['updated_text_color']
-        
-        # Determine the background color based on the LetterState
-        if state == LetterState.INCORRECT:
-            # Set the background color to the 'incorrect_color' definded in settings
-            self.label['bg'] = self.settings['ui']['incorrect_color']
-            self['bg'] = self.settings['ui']['incorrect_color'] # Set the background color for the current widget
-        elif state == LetterState.CORRECT:
-            # Set the background color to the 'correct_color' defined in settings
-            self.label['bg'] = self.settings['ui']['correct_color']
-            self['bg'] = self.settings['ui']['correct_color'] # Set the background color for the current widget
-        elif state == LetterState.MISPLACED:
-            # Set the background color to the 'misplaced_color' defined in settings
-            self.label['bg'] = self.settings['ui']['misplaced_color']
-            self['bg'] = self.settings['ui']['misplaced_color'] # Set the background color for the current widget
-    
+        # Look up the background and text colors for this state (computed
+        # once for the whole window) and apply them in one call per widget
+        bg, fg = self.styles.letter_colors[state]
+        self.label.configure(bg=bg, fg=fg)
+        self.configure(bg=bg)
 
 
 class GuessesFrame(tk.Frame):
     """ A Tk Frame used to display the guesses that user has made. """
 
     # instance variables
-    settings: dict  # the dictionary with all the UI settings
+    settings: Settings  # all the settings (see settings.py)
     # 2D list of letters (i.e. the matrix of guess letter)
     guess_letters: list[list[GuessLetter]]
+    reveals: RevealScheduler  # reveals the letters of each guess one at a time
 
-    def __init__(self, parent: Union[tk.Tk, tk.Frame], settings: dict) -> None:
+    def __init__(self, parent: Union[tk.Tk, tk.Frame], settings: Settings) -> None:
         super().__init__(parent) # Call the constructor of the parent class
 
-        self.settings = settings # Store the settings dictionary for later use
+        self.settings = settings # Store the settings for later use
+        self.styles = StyleRegistry.shared(self, settings) # Fonts and colors shared by every letter
+        self.reveals = RevealScheduler(self) # Animates the guess results
 
         # Set the height and width of the GuessFrame based on settings
-        self['height'] = settings['ui']['guesses']['frame_height']
-        self['width'] = settings['ui']['window_width']
+        self['height'] = settings.ui.guesses.frame_height
+        self['width'] = settings.ui.window_width
 
         # Pack the GuessFrame with some padding at the top
         self.pack(pady=(20, 0))
@@ -121,11 +251,11 @@ class GuessesFrame(tk.Frame):
         # guesses.
 
         # Create a matrix of GuessLetter instances based on the number of guesses and word size
-        for r in range(1, self.settings['num_guesses']+1):
+        for r in range(1, self.settings.num_guesses+1):
             frame_row = []
-            for c in range(1, self.settings['word_size']+1):
+            for c in range(1, self.settings.word_size+1):
                 # Create a GuessLetter instance and add it to the matrix
-                frame = GuessLetter(self, r, c, self.settings)
+                frame = GuessLetter(self, r, c, self.settings, self.styles)
                 frame_row.append(frame)
 
             # Append the row of GuessLetter instances to the list
@@ -133,9 +263,9 @@ class GuessesFrame(tk.Frame):
 
         # Center guess frames in the larger guess frame.
         self.columnconfigure(0, weight=1) # make the first column expandable
-        self.columnconfigure(settings['word_size']+1, weight=1) # make the last column expandable
+        self.columnconfigure(settings.word_size+1, weight=1) # make the last column expandable
         self.rowconfigure(0, weight=1) # Make the first row expandable
-        self.rowconfigure(settings['num_guesses']+1, weight=1) # Make the last row expandable
+        self.rowconfigure(settings.num_guesses+1, weight=1) # Make the last row expandable
 
     def set_letter(self, letter: str, guess_num: int, letter_index: int) -> None:
         """ Sets the guess letter at the <letter_index> in the specified <guess_num> to <letter>.
@@ -152,6 +282,20 @@ class GuessesFrame(tk.Frame):
         # Call the set_letter method of the corresponding GuessLetter for the specified guess and letter index
         self.guess_letters[guess_num][letter_index].set_letter(letter)
 
+    def show_dead_prefix(self, guess_num: int, dead: bool) -> None:
+        """ Shows the letters of guess <guess_num> in the dead prefix color
+        (when the letters typed so far can't become a word) or the initial
+        text color.
+
+        Parameters:
+            guess_num: (int) The number of the guess to update
+            dead: (bool) Whether the guess can no longer become a word
+        """
+        guesses = self.settings.ui.guesses
+        color = guesses.dead_prefix_text_color if dead else guesses.initial_text_color
+        for guess_letter in self.guess_letters[guess_num]:
+            guess_letter.label.configure(fg=color)
+
     def show_guess_result(self, guess_num: int, results: list[LetterState]) -> None:
         """ Updates the specific guess based on the given results.
 
@@ -165,27 +309,266 @@ class GuessesFrame(tk.Frame):
             results: (list[LetterState]) The state of each letter in the guess.
 
         """
-        # Iterate over each letter in the guess
-        for i in range(len(results)):
-            # Update the status of the corresponding GuessLetter for the current letter
-            self.guess_letters[guess_num][i].set_status(results[i])
+        # Queue an update of the corresponding GuessLetter for each letter,
+        # process_wait_time seconds apart (the Tk loop keeps running meanwhile)
+        letters = self.guess_letters[guess_num]
+        self.reveals.schedule(
+            [lambda i=i: letters[i].set_status(results[i]) for i in range(len(results))],
+            self.settings.ui.guesses.process_wait_time)
+
+
+@dataclass(frozen=True, slots=True)
+class BoardLayout:
+    """ Where the letter boxes of one board go on a canvas. """
+    box: int  # side of a letter box, in pixels
+    padding: int  # space between letter boxes
+    left: int  # x of the first column's boxes
+    top: int  # y of the first row's boxes
+    font_size: int  # letter font size, scaled down with the boxes
+
+    def cell_box(self, row: int, col: int) -> tuple[int, int, int, int]:
+        """ Returns the (x0, y0, x1, y1) corners of the letter box at <row>, <col>. """
+        x = self.left + col * (self.box + self.padding)
+        y = self.top + row * (self.box + self.padding)
+        return x, y, x + self.box, y + self.box
+
+
+def board_layout(settings: Settings, width: int, height: int) -> BoardLayout:
+    """ Lays out one board of num_guesses rows of word_size letters, centered
+    in a <width> x <height> area. The letter boxes (and their font) are
+    shrunk if the board wouldn't fit at the configured size. """
+    guesses = settings.ui.guesses
+    rows, cols = settings.num_guesses, settings.word_size
+    padding = guesses.letter_padding
+
+    box = max(1, min(guesses.letter_box_size,
+                     (width - padding) // cols - padding,
+                     (height - padding) // rows - padding))
+    font_size = max(1, guesses.letter_font_size * box // guesses.letter_box_size)
+
+    left = (width - cols * (box + padding) + padding) // 2
+    top = (height - rows * (box + padding) + padding) // 2
+    return BoardLayout(box, padding, left, top, font_size)
+
+
+def multi_board_layouts(settings: Settings, boards_per_row: int) -> list[BoardLayout]:
+    """ Lays out num_boards boards in rows of up to <boards_per_row>, each
+    centered (by board_layout) in an equal share of the guesses area, with
+    a gap of a few letter paddings between neighbouring boards. """
+    guesses = settings.ui.guesses
+    board_cols = min(settings.num_boards, boards_per_row)
+    board_rows = -(-settings.num_boards // board_cols)
+    area_width = settings.ui.window_width // board_cols
+    area_height = guesses.frame_height // board_rows
+    gap = 4 * guesses.letter_padding  # between boards
+
+    layout = board_layout(settings, area_width - gap, area_height - gap)
+    return [replace(layout,
+                    left=layout.left + (b % board_cols) * area_width + gap // 2,
+                    top=layout.top + (b // board_cols) * area_height + gap // 2)
+            for b in range(settings.num_boards)]
+
+
+class CanvasGuessesFrame(tk.Canvas):
+    """ A drop-in alternative to GuessesFrame that draws the whole board on a
+    single Tk Canvas (one rectangle and one text item per letter) instead of
+    creating a Frame and a Label for every letter. """
+
+    # instance variables
+    settings: Settings  # all the settings (see settings.py)
+    # 2D list of (rectangle item, text item) ids, one per guess letter
+    cells: list[list[tuple[int, int]]]
+    reveals: RevealScheduler  # reveals the letters of each guess one at a time
+
+    def __init__(self, parent: Union[tk.Tk, tk.Frame], settings: Settings) -> None:
+        super().__init__(parent, width=settings.ui.window_width,
+                         height=settings.ui.guesses.frame_height,
+                         highlightthickness=0)
+
+        self.settings = settings
+        self.styles = StyleRegistry.shared(self, settings)
+        self.reveals = RevealScheduler(self)
+
+        # Pack the canvas with the same padding as GuessesFrame
+        self.pack(pady=(20, 0))
+
+        guesses = settings.ui.guesses
+        rows, cols = settings.num_guesses, settings.word_size
+        layout = board_layout(settings, settings.ui.window_width, guesses.frame_height)
+        letter_font = self.styles.font(layout.font_size)
+
+        self.cells = []
+        for r in range(rows):
+            row = []
+            for c in range(cols):
+                x0, y0, x1, y1 = layout.cell_box(r, c)
+                rect = self.create_rectangle(
+                    x0, y0, x1, y1, width=0,
+                    fill=guesses.initial_bg_color, tags=('cell', f'row{r}'))
+                text = self.create_text(
+                    (x0 + x1) / 2, (y0 + y1) / 2, text='', font=letter_font,
+                    fill=guesses.initial_text_color, tags=('letter', f'row{r}'))
+                row.append((rect, text))
+            self.cells.append(row)
+
+    def set_letter(self, letter: str, guess_num: int, letter_index: int) -> None:
+        """ Sets the guess letter at the <letter_index> in the specified <guess_num> to <letter>.
+
+        Preconditions:
+            guess_num is between 0 and num guesses
+            col is between 0 and word size
+
+        Parameters:
+            letter: (str) The letter to show.
+            guess_num: (int) The number of the guess to update
+            letter_index: (int) The index in the guess that will be updated
+        """
+        self.itemconfigure(self.cells[guess_num][letter_index][1], text=letter)
+
+    def show_dead_prefix(self, guess_num: int, dead: bool) -> None:
+        """ Shows the letters of guess <guess_num> in the dead prefix color
+        (when the letters typed so far can't become a word) or the initial
+        text color. """
+        guesses = self.settings.ui.guesses
+        color = guesses.dead_prefix_text_color if dead else guesses.initial_text_color
+        for _, text in self.cells[guess_num]:
+            self.itemconfigure(text, fill=color)
+
+    def set_status(self, guess_num: int, letter_index: int, state: LetterState) -> None:
+        """ Colors one letter based on its LetterState (using the colors
+        defined in settings). """
+        rect, text = self.cells[guess_num][letter_index]
+        bg, fg = self.styles.letter_colors[state]
+        self.itemconfigure(rect, fill=bg)
+        self.itemconfigure(text, fill=fg)
+
+    def show_guess_result(self, guess_num: int, results: list[LetterState]) -> None:
+        """ Updates the specific guess based on the given results, one letter
+        every process_wait_time seconds.
+
+        Preconditon: len(results) == word size
+
+        Parameters:
+            guess_num: (int) The number of the guess to update
+            results: (list[LetterState]) The state of each letter in the guess.
+        """
+        self.reveals.schedule(
+            [lambda i=i: self.set_status(guess_num, i, results[i]) for i in range(len(results))],
+            self.settings.ui.guesses.process_wait_time)
+
+
+class MultiBoardFrame(tk.Canvas):
+    """ The boards of a multi-board game (see multi_board), side by side on
+    a single Tk Canvas: one rectangle and one text item per letter, with no
+    widgets per board.
+
+    Typed letters go to every board that is still in play. Their text items
+    carry a live tag per (guess, letter) cell, so each letter is one
+    itemconfigure whatever the number of boards; a solved board loses its
+    live tags. """
+
+    # instance variables
+    settings: Settings  # all the settings (see settings.py)
+    # board -> guess -> letter -> (rectangle item, text item)
+    cells: list[list[list[tuple[int, int]]]]
+    reveals: RevealScheduler  # reveals the letters of each guess one at a time
+
+    # boards per row of boards
+    BOARDS_PER_ROW = 4
+
+    def __init__(self, parent: Union[tk.Tk, tk.Frame], settings: Settings) -> None:
+        super().__init__(parent, width=settings.ui.window_width,
+                         height=settings.ui.guesses.frame_height,
+                         highlightthickness=0)
+
+        self.settings = settings
+        self.styles = StyleRegistry.shared(self, settings)
+        self.reveals = RevealScheduler(self)
+        self.pack(pady=(20, 0))
+
+        guesses = settings.ui.guesses
+        boards, rows, cols = settings.num_boards, settings.num_guesses, settings.word_size
+        layouts = multi_board_layouts(settings, self.BOARDS_PER_ROW)
+        letter_font = self.styles.font(layouts[0].font_size)
+
+        self.cells = []
+        for b, layout in enumerate(layouts):
+            board = []
+            for r in range(rows):
+                row = []
+                for c in range(cols):
+                    x0, y0, x1, y1 = layout.cell_box(r, c)
+                    rect = self.create_rectangle(
+                        x0, y0, x1, y1, width=0,
+                        fill=guesses.initial_bg_color, tags=('cell', f'board{b}'))
+                    text = self.create_text(
+                        (x0 + x1) / 2, (y0 + y1) / 2, text='', font=letter_font,
+                        fill=guesses.initial_text_color,
+                        tags=('letter', f'board{b}', f'live{r}_{c}', f'liverow{r}'))
+                    row.append((rect, text))
+                board.append(row)
+            self.cells.append(board)
+
+    def set_letter(self, letter: str, guess_num: int, letter_index: int) -> None:
+        """ Sets the letter at <letter_index> of guess <guess_num> on every
+        board still in play. """
+        self.itemconfigure(f'live{guess_num}_{letter_index}', text=letter)
+
+    def show_dead_prefix(self, guess_num: int, dead: bool) -> None:
+        """ Shows the letters of guess <guess_num> (on the boards still in
+        play) in the dead prefix color or the initial text color. """
+        guesses = self.settings.ui.guesses
+        color = guesses.dead_prefix_text_color if dead else guesses.initial_text_color
+        self.itemconfigure(f'liverow{guess_num}', fill=color)
+
+    def set_status(self, board: int, guess_num: int, letter_index: int,
+                   state: LetterState) -> None:
+        """ Colors one letter of one board based on its LetterState. """
+        rect, text = self.cells[board][guess_num][letter_index]
+        bg, fg = self.styles.letter_colors[state]
+        self.itemconfigure(rect, fill=bg)
+        self.itemconfigure(text, fill=fg)
+
+    def mark_solved(self, board: int) -> None:
+        """ Stops typed letters from showing on <board>. """
+        for r, row in enumerate(self.cells[board]):
+            for c, (_, text) in enumerate(row):
+                self.dtag(text, f'live{r}_{c}')
+                self.dtag(text, f'liverow{r}')
+
+    def show_board_results(self, guess_num: int,
+                           results: dict[int, list[LetterState]]) -> None:
+        """ Reveals guess <guess_num> on the given boards, one letter (on
+        every board at once) every process_wait_time seconds.
+
+        Parameters:
+            guess_num: (int) The number of the guess to update
+            results: (dict[int, list[LetterState]]) board -> the state of
+                each letter of the guess on that board.
+        """
+        def reveal(i: int) -> None:
+            for board, states in results.items():
+                self.set_status(board, guess_num, i, states[i])
+
+        self.reveals.schedule([lambda i=i: reveal(i) for i in range(self.settings.word_size)],
+                              self.settings.ui.guesses.process_wait_time)
 
 
 class MessageFrame(tk.Frame):
     """ A Tk Frame used to display a message to the user. """
 
-    def __init__(self, parent, settings: dict) -> None:
+    def __init__(self, parent, settings: Settings) -> None:
         super().__init__(parent)
 
-        self['height'] = settings['ui']['messages']['frame_height']
+        self['height'] = settings.ui.messages.frame_height
 
         self.pack(pady=20, fill=tk.X)
         self.pack_propagate(False)
 
         self.message_str = tk.StringVar()
-        f = font.Font(family=settings['ui']['font_family'])
+        styles = StyleRegistry.shared(self, settings)
         message_label = tk.Label(self, textvariable=self.message_str,
-                                 font=(f, settings['ui']['messages']['font_size']))
+                                 font=styles.font(settings.ui.messages.font_size))
         message_label.place(relx=.5, rely=.5, anchor="center")
 
         self.message_timer = None
@@ -224,14 +607,19 @@ class KeyboardFrame(tk.Frame):
     """ A Tk Frame used to display a keyboard to the user. """
 
     keyboard_buttons: dict[str, tk.Button]
+    key_states: dict[str, LetterState]  # the best state each key has earned so far
+    _pending_colors: dict[str, str]  # key -> text color not yet applied
+    _shown_colors: dict[str, str]  # key -> text color currently on the button
+    _flush_id: Optional[str]  # the pending after_idle callback, if any
 
-    def __init__(self, parent, settings: dict) -> None:
+    def __init__(self, parent, settings: Settings) -> None:
         super().__init__(parent)
 
         self.settings = settings
+        self.styles = StyleRegistry.shared(self, settings)
 
-        self['height'] = settings['ui']['keyboard']['frame_height']
-        self['width'] = settings['ui']['window_width']
+        self['height'] = settings.ui.keyboard.frame_height
+        self['width'] = settings.ui.window_width
 
         # put solid border around keyboard to really make it POP!
         self['borderwidth'] = 1
@@ -241,6 +629,10 @@ class KeyboardFrame(tk.Frame):
         self.pack_propagate(False)
 
         self.keyboard_buttons = {}
+        self.key_states = {}
+        self._pending_colors = {}
+        self._shown_colors = {}
+        self._flush_id = None
         self.add_keyboard_buttons()
 
     def add_keyboard_buttons(self) -> None:
@@ -259,31 +651,31 @@ class KeyboardFrame(tk.Frame):
         self.grid_rowconfigure(0, weight=1)
         self.grid_rowconfigure(4, weight=1)
 
-        layout = self.settings['ui']['keyboard']['key_layout']
+        layout = self.settings.ui.keyboard.key_layout
 
-        f = font.Font(family=self.settings['ui']['font_family'])
+        f = self.styles.font()
 
         # Create keyboard buttons
         for r in range(3):
             for c in range(len(layout[r])):
                 if layout[r][c] == 'ENTER':
                     button = tk.Button(keyboard_button_frames[r],
-                                       width=self.settings['ui']['keyboard']['key_width_long'],
+                                       width=self.settings.ui.keyboard.key_width_long,
                                        text=layout[r][c],
-                                       fg=self.settings['ui']['keyboard']['text_color'],
+                                       fg=self.settings.ui.keyboard.text_color,
                                        font=f)
 
                 elif layout[r][c] == "BACK":
                     button = tk.Button(keyboard_button_frames[r],
-                                       width=self.settings['ui']['keyboard']['key_width_long'],
+                                       width=self.settings.ui.keyboard.key_width_long,
                                        text=layout[r][c],
-                                       fg=self.settings['ui']['keyboard']['text_color'],
+                                       fg=self.settings.ui.keyboard.text_color,
                                        font=f)
                 else:
                     button = tk.Button(keyboard_button_frames[r],
-                                       width=self.settings['ui']['keyboard']['key_width'],
+                                       width=self.settings.ui.keyboard.key_width,
                                        text=layout[r][c],
-                                       fg=self.settings['ui']['keyboard']['text_color'],
+                                       fg=self.settings.ui.keyboard.text_color,
                                        font=f)
 
                 button.grid(row=r, column=c)
@@ -293,21 +685,31 @@ class KeyboardFrame(tk.Frame):
     def set_key_colors(self, key_states: dict[str, LetterState]) -> None:
         """ Updates the colors of keys based on their states.
 
+        A key never goes back to a worse state (CORRECT > MISPLACED >
+        INCORRECT), and only the keys whose color changes are reconfigured,
+        all together once Tk is idle.
+
         Parameters:
             key_states (dict[str, LetterState]): Dictionary mapping key to its state
         """
-        # Iterate over each key nad its corresponding state
-        for letter, state in key_states.items():
-            # Determine the text color on the LetterState
-            if state == LetterState.CORRECT:
-                text_color = self.settings["ui"]["correct_color"]
-            elif state == LetterState.INCORRECT:
-                text_color = self.settings["ui"]["incorrect_color"]
-            else:
-                text_color = self.settings["ui"]["misplaced_color"]
+        changed = update_key_states(self.key_states, key_states)
+        for letter, state in changed.items():
+            self._pending_colors[letter] = self.styles.key_colors[state]
+
+        if self._pending_colors and self._flush_id is None:
+            self._flush_id = self.after_idle(self._apply_key_colors)
 
-            # Set the text color of the button associated with the key
-            self.keyboard_buttons[letter]['fg'] = text_color
+    def _apply_key_colors(self) -> None:
+        """ Reconfigures every key whose color changed since the last call. """
+        self._flush_id = None
+        default_color = self.settings.ui.keyboard.text_color
+
+        with metrics.timer('wordy_view_key_colors_seconds'):
+            for letter, color in self._pending_colors.items():
+                if color != self._shown_colors.get(letter, default_color):
+                    self.keyboard_buttons[letter].configure(fg=color)
+                    self._shown_colors[letter] = color
+        self._pending_colors.clear()
 
     def disable(self):
         """ Disables the keyboard by setting the state of all buttons to 'disabled'. """
@@ -329,7 +731,7 @@ class KeyboardFrame(tk.Frame):
 
 
 class WordyView:
-    def __init__(self, settings):
+    def __init__(self, settings: Settings):
 
         self.settings = settings
 
@@ -339,9 +741,15 @@ class WordyView:
 
         # Create three primary window frames: guesses, messages, and keyboard
 
-        # Assign self.guess_frame to a new GuessesFrame object
+        # Assign self.guess_frame to a new GuessesFrame object (or draw the
+        # board on a single canvas, which scales better to large boards)
 
-        self.guess_frame = GuessesFrame(self.window, settings)
+        if settings.num_boards > 1:
+            self.guess_frame = MultiBoardFrame(self.window, settings)
+        elif settings.ui.guesses.renderer == 'canvas':
+            self.guess_frame = CanvasGuessesFrame(self.window, settings)
+        else:
+            self.guess_frame = GuessesFrame(self.window, settings)
 
         self.message_frame = MessageFrame(self.window, settings)
         self.keyboard_frame = KeyboardFrame(self.window, settings)
@@ -359,14 +767,30 @@ class WordyView:
             letter_index: (int) The index in the guess that will be updated
         """
         # Call the set_letter method of the guess frame to set the letter
-        self.guess_frame.set_letter(letter, guess_num, letter_index)
+        with metrics.timer('wordy_view_set_letter_seconds'):
+            self.guess_frame.set_letter(letter, guess_num, letter_index)
+
+    @property
+    def revealing(self) -> bool:
+        """ Whether a guess result is still being revealed. """
+        return self.guess_frame.reveals.busy
+
+    def show_dead_prefix(self, guess_num: int, dead: bool) -> None:
+        """ Marks whether the guess being typed can still become a word. """
+        with metrics.timer('wordy_view_dead_prefix_seconds'):
+            self.guess_frame.show_dead_prefix(guess_num, dead)
 
     def start_gui(self):
         """ Starts the GUI. """
         self.window.mainloop()
 
+    def after(self, ms: int, callback: Callable[[], None]) -> None:
+        """ Calls <callback> on the Tk thread in about <ms> milliseconds. """
+        self.window.after(ms, callback)
+
     def quit_program(self):
         """ Quits the program by shutting down the Tk window. """
+        self.guess_frame.reveals.cancel()
         self.window.destroy()
 
     def display_guess_result(self, guess_num: int, guess_results: list[LetterState], letter_states: dict[str, LetterState]) -> None:
@@ -378,11 +802,32 @@ class WordyView:
              letter_states: (dict[str, LetterState]) The state of each letter in the guess.
         """
         # Call the show_guess_result method of the guess frame and pass the guess number and results
-        self.guess_frame.show_guess_result(guess_num, guess_results)
-        
-        # Set the key colors in the keyboard frame based on the letter states
-        self.keyboard_frame.set_key_colors(letter_states)
-        
+        with metrics.timer('wordy_view_queue_result_seconds'):
+            self.guess_frame.show_guess_result(guess_num, guess_results)
+
+        # Once the whole guess is revealed, set the key colors in the keyboard
+        # frame based on the letter states
+        self.guess_frame.reveals.then(lambda: self.keyboard_frame.set_key_colors(letter_states))
+
+    def display_board_results(self, guess_num: int, results: dict[int, list[LetterState]],
+                              letter_states: dict[str, LetterState]) -> None:
+        """ Like display_guess_result, for a multi-board game.
+
+        Parameters:
+             guess_num: (int) The number of the guess to update.
+             results: (dict[int, list[LetterState]]) board -> the state of each
+                letter in the guess, for the boards still in play.
+             letter_states: (dict[str, LetterState]) The state of each letter
+                in the guess, merged over those boards.
+        """
+        with metrics.timer('wordy_view_queue_result_seconds'):
+            self.guess_frame.show_board_results(guess_num, results)
+
+        self.guess_frame.reveals.then(lambda: self.keyboard_frame.set_key_colors(letter_states))
+
+    def mark_board_solved(self, board: int) -> None:
+        """ Stops typed letters from showing on a solved board. """
+        self.guess_frame.mark_solved(board)
 
     def display_message(self, msg: str) -> None:
         """ Displays the given message in the message frame.
@@ -405,11 +850,21 @@ class WordyView:
        handler: Callable[[], None]) The handler function to call when
         the key is pressed.
          """
+        # Key presses are ignored while a guess is being revealed
+        def guarded_handler() -> None:
+            if not self.revealing:
+                handler()
+
         # Call the set_key)handler method of the keyboard frame and pass the key and handler
-        self.keyboard_frame.set_key_handler(key, handler)
+        self.keyboard_frame.set_key_handler(key, guarded_handler)
 
     def create_binding(self, event_type: str, action: Callable[[tk.Event],
                                                                None]):
         """ Sets the function to call when the given event type happens. """
+        # Events are ignored while a guess is being revealed
+        def guarded_action(e: tk.Event) -> None:
+            if not self.revealing:
+                action(e)
+
         # Bing the specified event type to the provided action (function) using the Tkinter bind method
-        self.window.bind(event_type, action)
+        self.window.bind(event_type, guarded_action)
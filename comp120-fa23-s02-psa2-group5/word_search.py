@@ -0,0 +1,171 @@
+"""
+Module: word_search
+
+Finds the words matching a positional pattern, such as "h?l?" (four letters,
+h first and l third) or "?e???" with "a" excluded, by intersecting the
+per-(position, letter) bitsets of a LetterIndex instead of scanning the word
+list.
+
+Pattern syntax, one item per letter of the word:
+
+    h        exactly that letter
+    ?        any letter (. and _ work too)
+    [aeiou]  one of the listed letters
+    [^aeiou] any letter except the listed ones (! works in place of ^)
+
+Letters that must appear somewhere (repeat a letter to require several
+copies) or must not appear at all are given separately:
+
+    python word_search.py "?e???" --exclude a
+    python word_search.py "s????" --include ee --count
+"""
+
+import argparse
+import sys
+from dataclasses import dataclass
+from typing import Optional
+
+from knowledge import LetterIndex, bits_to_indexes, letter_index
+from lexicon import Lexicon, shared_lexicon
+from settings import load_settings
+
+
+_ANY = '?._'
+
+
+@dataclass(frozen=True, slots=True)
+class WordQuery:
+    """ A parsed search: what each position may hold, plus the letters that
+    must or must not appear anywhere. """
+
+    # position -> (letters, whether they are excluded); ('', True) matches anything
+    positions: tuple[tuple[str, bool], ...]
+    include: str = ''  # letters that must appear, repeated for several copies
+    exclude: str = ''  # letters that must not appear
+
+    @property
+    def word_size(self) -> int:
+        return len(self.positions)
+
+
+def parse_query(pattern: str, include: str = '', exclude: str = '') -> WordQuery:
+    """ Parses <pattern> (see the module docstring) into a WordQuery.
+
+    Raises:
+        ValueError: When the pattern has an unclosed or empty [...] set, or
+            a character that is not a letter or a wildcard.
+    """
+    pattern = pattern.lower()
+    positions = []
+    i = 0
+    while i < len(pattern):
+        char = pattern[i]
+        if char in _ANY:
+            positions.append(('', True))
+            i += 1
+        elif char == '[':
+            end = pattern.find(']', i)
+            if end < 0:
+                raise ValueError(f"unclosed [ at position {i + 1} of {pattern!r}")
+            letters = pattern[i + 1:end]
+            excluded = letters[:1] in ('^', '!')
+            if excluded:
+                letters = letters[1:]
+            if not letters or not letters.isalpha():
+                raise ValueError(f"bad letter set [{pattern[i + 1:end]}] in {pattern!r}")
+            positions.append((''.join(sorted(set(letters))), excluded))
+            i = end + 1
+        elif char.isalpha():
+            positions.append((char, False))
+            i += 1
+        else:
+            raise ValueError(f"unexpected {char!r} in {pattern!r}")
+
+    return WordQuery(tuple(positions), include.lower(), exclude.lower())
+
+
+def query_bits(index: LetterIndex, query: WordQuery) -> int:
+    """ Returns the bitset (see knowledge) of the words of <index> that
+    match <query>. """
+    bits = index.all_words
+    for position, (letters, excluded) in enumerate(query.positions):
+        if not letters:
+            continue
+        matching = 0
+        for letter in letters:
+            matching |= index.at_position(position, letter)
+        bits &= ~matching if excluded else matching
+
+    for letter in set(query.include):
+        bits &= index.with_at_least(letter, query.include.count(letter))
+    for letter in set(query.exclude):
+        bits &= ~index.with_at_least(letter, 1)
+    return bits
+
+
+def _first_indexes(bits: int, limit: int) -> list[int]:
+    """ Returns the positions of the lowest <limit> set bits of <bits>. """
+    indexes = []
+    while bits and len(indexes) < limit:
+        lowest = bits & -bits
+        indexes.append(lowest.bit_length() - 1)
+        bits ^= lowest
+    return indexes
+
+
+def search(lexicon: Lexicon, pattern: str, include: str = '', exclude: str = '',
+           limit: Optional[int] = None) -> list[str]:
+    """ Returns the words of <lexicon> matching <pattern>, in lexicon order.
+
+    Parameters:
+        lexicon: (Lexicon) The words to search.
+        pattern: (str) One item per letter; see the module docstring.
+        include: (str) Letters that must appear (repeated for several copies).
+        exclude: (str) Letters that must not appear.
+        limit: (int) Return at most this many words.
+
+    Raises:
+        ValueError: When the pattern is malformed.
+    """
+    query = parse_query(pattern, include, exclude)
+    index = letter_index(lexicon, query.word_size)
+    bits = query_bits(index, query)
+    indexes = bits_to_indexes(bits) if limit is None else _first_indexes(bits, limit)
+    return [index.words[i] for i in indexes]
+
+
+def count_matches(lexicon: Lexicon, pattern: str, include: str = '',
+                  exclude: str = '') -> int:
+    """ Returns how many words of <lexicon> match <pattern> (see search). """
+    query = parse_query(pattern, include, exclude)
+    return query_bits(letter_index(lexicon, query.word_size), query).bit_count()
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    settings = load_settings()
+
+    parser = argparse.ArgumentParser(description="Find the words matching a pattern.")
+    parser.add_argument('pattern', help='e.g. "h?l?", "?e???" or "[st]?[^aeiou]??"')
+    parser.add_argument('--include', default='', help="letters that must appear")
+    parser.add_argument('--exclude', default='', help="letters that must not appear")
+    parser.add_argument('--limit', type=int, help="print at most this many words")
+    parser.add_argument('--count', action='store_true', help="only print how many words match")
+    parser.add_argument('--word-list', default=settings.word_list_file)
+    args = parser.parse_args(argv)
+
+    lexicon = shared_lexicon(args.word_list)
+    try:
+        if args.count:
+            print(count_matches(lexicon, args.pattern, args.include, args.exclude))
+            return 0
+        words = search(lexicon, args.pattern, args.include, args.exclude, args.limit)
+    except ValueError as e:
+        parser.error(str(e))
+
+    for word in words:
+        print(word)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
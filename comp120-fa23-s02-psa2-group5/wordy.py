@@ -7,13 +7,25 @@ Authors:
 - Will Dobrzanski - wdobrzanski@sandiego.edu
 """
 
+import atexit
 import string
-import json
-from typing import Callable
-from tkinter import Event
+from typing import TYPE_CHECKING, Callable, Optional
 
-from views import WordyView
-from models import WordyModel, NotAWordError
+import metrics
+from guess_log import default_guess_log
+from models import WordyModel, NotAWordError, LetterState
+from dawg import Dawg, lexicon_dawg
+from knowledge import KnowledgeState, letter_index
+from settings import Settings, load_settings
+
+# The GUI (tkinter) and the solver (numpy) are only imported when they are
+# first needed, so importing the controller's module stays cheap.
+if TYPE_CHECKING:
+    from concurrent.futures import Future, ThreadPoolExecutor
+    from tkinter import Event
+    from views import WordyView
+    from solver import Solver
+    from multi_board import MultiWordyModel
 
 
 class WordyController:
@@ -23,22 +35,40 @@ class WordyController:
     NUM_GUESSES: int  # number of guesses allowed by the user
 
     model: WordyModel  # the model used to verify the guess
-    view: WordyView    # the GUI view
+    view: "WordyView"  # the GUI view
 
     # the guess number the user is currently on (starts at 0)
     current_guess_num: int
     current_guess: list[str]  # list of characters in the current guess
-
-    def __init__(self, view: WordyView, model: WordyModel, settings: dict) -> None:
+    # the finished guesses so far, with the state of each of their letters
+    guess_history: list[tuple[str, list[LetterState]]]
+    knowledge: KnowledgeState  # what the finished guesses say about the answer
+    dawg: Dawg  # every valid word, for checking prefixes while typing
+    prefix_alive: bool  # whether the current guess can still become a word
+    solver: Optional["Solver"]  # ranks hints; created the first time one is asked for
+    _hint_thread: Optional["ThreadPoolExecutor"]  # works out hints off the Tk thread
+    _hint: Optional["Future"]  # the hint being worked out, if any
+
+    # how often the Tk thread checks whether a hint is ready
+    HINT_POLL_MS = 20
+
+    def __init__(self, view: "WordyView", model: WordyModel, settings: Settings) -> None:
         """ Initialize the controller. """
 
-        self.WORD_SIZE = settings['word_size']
-        self.NUM_GUESSES = settings['num_guesses']
+        self.WORD_SIZE = settings.word_size
+        self.NUM_GUESSES = settings.num_guesses
 
         self.model = model
 
         self.current_guess_num = 0
         self.current_guess = []
+        self.guess_history = []
+        self.knowledge = KnowledgeState(letter_index(model.lexicon, self.WORD_SIZE))
+        self.dawg = lexicon_dawg(model.lexicon)
+        self.prefix_alive = True
+        self.solver = None
+        self._hint_thread = None
+        self._hint = None
 
         # Create the view
         self.view = view
@@ -63,11 +93,58 @@ class WordyController:
         """ Clears the current guess. """
         for _ in range(len(self.current_guess)):
             self.current_guess.pop()
+        self.prefix_alive = True
+
+    def check_prefix(self) -> None:
+        """ Marks the current guess in the view when the letters typed so far
+        stop (or start again) being the start of a valid word. """
+        alive = self.dawg.can_complete("".join(self.current_guess), self.WORD_SIZE)
+        if alive != self.prefix_alive:
+            self.prefix_alive = alive
+            self.view.show_dead_prefix(self.current_guess_num, not alive)
+
+    def show_hint(self, e: "Event"):
+        """ Displays the guess that the solver expects to reveal the most
+        about the answer, given the guesses made so far.
+
+        The ranking runs on a background thread (the first one ranks the
+        opening over the whole word list) and the Tk thread only polls for
+        the result, so the window never freezes. """
+        if self._hint is not None:
+            return  # still working on the last one
+
+        if self._hint_thread is None:
+            from concurrent.futures import ThreadPoolExecutor
+            self._hint_thread = ThreadPoolExecutor(max_workers=1)
+
+        self._hint = self._hint_thread.submit(
+            self._rank_hint, list(self.guess_history), self.knowledge.indexes())
+        self.view.display_message('Hint: thinking...')
+        self._poll_hint()
+
+    def _rank_hint(self, history: list[tuple[str, list[LetterState]]],
+                   remaining: list[int]) -> tuple[str, float]:
+        """ Ranks the next guesses (on the hint thread), returning the best. """
+        if self.solver is None:
+            from feedback_table import open_table
+            from solver import INTERACTIVE_MAX_PAIRS, Solver
+            # one process: no pool started from inside the GUI, and later
+            # moves rank few enough guesses to stay interactive
+            table = open_table(self.model.lexicon, self.WORD_SIZE, processes=1)
+            self.solver = Solver(self.model.lexicon, self.WORD_SIZE, table=table,
+                                 processes=1, max_pairs=INTERACTIVE_MAX_PAIRS)
+        return self.solver.rank(history, k=1, remaining=remaining)[0]
+
+    def _poll_hint(self) -> None:
+        """ Displays the hint once the hint thread has it, checking again
+        every HINT_POLL_MS until then. """
+        if not self._hint.done():
+            self.view.after(self.HINT_POLL_MS, self._poll_hint)
+            return
 
-    def show_hint(self, e: Event):
-        """ Secret function to display the answer in the messages frame. """
-
-        self.view.display_message(f'Answer is:{self.model.word}')
+        hint, self._hint = self._hint, None
+        best_guess, bits = hint.result()
+        self.view.display_message(f'Hint: try {best_guess} ({bits:.1f} bits)')
 
     def create_letter_handler(self, letter: str) -> Callable[[], None]:
         """ Creates an event handler function that will.
@@ -91,10 +168,12 @@ class WordyController:
         """
         # Define am inner function to update the letter in the current guess
         def update_letter():
-            if len(self.current_guess) < self.WORD_SIZE:
-                self.current_guess.append(letter)
-                self.view.set_letter(
-                    letter, self.current_guess_num, len(self.current_guess)-1)
+            with metrics.timer('wordy_controller_letter_seconds'):
+                if len(self.current_guess) < self.WORD_SIZE:
+                    self.current_guess.append(letter)
+                    self.view.set_letter(
+                        letter, self.current_guess_num, len(self.current_guess)-1)
+                    self.check_prefix()
         # Return the inner function as the event handler
         return update_letter
 
@@ -112,6 +191,7 @@ class WordyController:
             self.view.set_letter('', self.current_guess_num,
                                  len(self.current_guess)-1)
             self.current_guess.pop()
+            self.check_prefix()
 
     def check_solution(self) -> None:
         """ Checks the current guess using the wordy model, then updates the
@@ -137,6 +217,12 @@ class WordyController:
         game_over method should be called to disable the user from further
         interacting with the keyboard.
         """
+        metrics.count('wordy_controller_submits_total')
+        with metrics.timer('wordy_controller_check_solution_seconds'):
+            self._check_solution()
+
+    def _check_solution(self) -> None:
+        """ Does the work of check_solution. """
         # COnstruct the guess from the current letters
         guess = "".join(self.current_guess)
 
@@ -147,22 +233,27 @@ class WordyController:
 
         try:
             # Check the guess using the wordy model and get the results
-            is_correct, guess_word_results, guess_letters_results = self.model.check_guess(
-                guess)
+            with metrics.timer('wordy_controller_check_guess_seconds'):
+                is_correct, guess_word_results, guess_letters_results = self.model.check_guess(
+                    guess)
 
         except NotAWordError:
             # Display a message if the guess is not a valid word
             self.view.display_message(f"{guess} is not a valid word.")
             return
 
+        self.guess_history.append((guess, guess_word_results))
+        self.knowledge.update(guess, guess_word_results)
+
         # Display the results of the guess in the view 
-        self.view.display_guess_result(
-            self.current_guess_num, guess_word_results, guess_letters_results)
+        with metrics.timer('wordy_controller_display_result_seconds'):
+            self.view.display_guess_result(
+                self.current_guess_num, guess_word_results, guess_letters_results)
 
         if is_correct:
             # Display a message for a correct guess and end the game
             self.view.display_message("Correct! Nice job. Game over.")
-            self.view.game_over
+            self.view.game_over()
 
         else:
             # Clear the current guess and move to the next guess
@@ -171,16 +262,84 @@ class WordyController:
 
             if self.current_guess_num == self.NUM_GUESSES:
                 # Display a message for running out of guesses and end the game
-                self.view.display_guess_result(
+                self.view.display_message(
                     f"Guesses used up. Word was {self.model.word}. Game over.")
-                self.view.game_over
+                self.view.game_over()
+
+
+class MultiWordyController(WordyController):
+    """ Controller for a multi-board game: every guess is played on each
+    board that is still unsolved (see multi_board). """
+
+    model: "MultiWordyModel"  # the hidden words of every board
+
+    def show_hint(self, e: "Event"):
+        """ The solver only knows about a single board. """
+        self.view.display_message("Hints are only available with one board.")
+
+    def _check_solution(self) -> None:
+        """ Does the work of check_solution, for every board at once. """
+        guess = "".join(self.current_guess)
+
+        if len(guess) < self.WORD_SIZE:
+            self.view.display_message("Word not finished!")
+            return
+
+        in_play = [board for board, solved in enumerate(self.model.solved) if not solved]
+        try:
+            with metrics.timer('wordy_controller_check_guess_seconds'):
+                correct, board_results, letter_states = self.model.check_guess(guess)
+        except NotAWordError:
+            self.view.display_message(f"{guess} is not a valid word.")
+            return
+
+        # Only the boards that were still in play show the guess
+        with metrics.timer('wordy_controller_display_result_seconds'):
+            self.view.display_board_results(
+                self.current_guess_num,
+                {board: board_results[board] for board in in_play}, letter_states)
+
+        for board in in_play:
+            if correct[board]:
+                self.view.mark_board_solved(board)
+
+        if self.model.all_solved:
+            self.view.display_message("Every board solved! Nice job. Game over.")
+            self.view.game_over()
+            return
+
+        self.clear_current_guess()
+        self.current_guess_num += 1
+
+        if self.current_guess_num == self.NUM_GUESSES:
+            missed = ", ".join(word for word, solved in zip(self.model.words, self.model.solved)
+                               if not solved)
+            self.view.display_message(f"Guesses used up. Unsolved: {missed}. Game over.")
+            self.view.game_over()
 
 
 if __name__ == "__main__":
-    with open("settings.json", 'r') as settings_file:
-        settings = json.load(settings_file)
+    settings = load_settings()
+
+    # record latencies and counts, saved to the export file on exit
+    if settings.metrics.enabled:
+        metrics.enable()
+        atexit.register(metrics.write, settings.metrics.export_file)
+
+    # start the guess log with the configured rotation before any model uses it
+    default_guess_log(settings.guess_log.max_bytes or None, settings.guess_log.backup_count)
+
+    from views import WordyView
 
     # create model, view, then controller
-    model = WordyModel(settings['word_size'], settings['word_list_file'])
-    view = WordyView(settings)
-    controller = WordyController(view, model, settings)
+    if settings.num_boards > 1:
+        from multi_board import MultiWordyModel # numpy, only for multi-board games
+        model = MultiWordyModel(settings.word_size, settings.word_list_file,
+                                settings.num_boards, difficulty=settings.difficulty)
+        view = WordyView(settings)
+        controller = MultiWordyController(view, model, settings)
+    else:
+        model = WordyModel(settings.word_size, settings.word_list_file,
+                           difficulty=settings.difficulty)
+        view = WordyView(settings)
+        controller = WordyController(view, model, settings)